@@ -0,0 +1,210 @@
+"""Замеры стоимости генераторов polyscaf во временной директории.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_generators.py
+    python benchmarks/bench_generators.py --repeat 10 --output bench.json
+
+Каждый замер выполняется в отдельном процессе с рабочей директорией во
+временной папке: BASE_DIR фиксируется при импорте polyscaf_python.settings.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MAIN = REPO_ROOT / "main.py"
+
+# Код, выполняемый в дочернем процессе: замер функций make_* без запуска CLI.
+# Печатает JSON со списком длительностей в секундах.
+IN_PROCESS_TEMPLATE = """
+import contextlib, inspect, io, json, sys, time
+sys.path.insert(0, {repo!r})
+from typer.models import ParameterInfo
+from polyscaf_python.commands import load_command
+
+function = load_command({command!r})
+# Значения по умолчанию typer.Option/Argument подставляем явно, как это делает CLI
+defaults = {{
+    name: parameter.default.default
+    for name, parameter in inspect.signature(function).parameters.items()
+    if isinstance(parameter.default, ParameterInfo) and parameter.default.default is not ...
+}}
+timings = []
+for index in range({repeat}):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*[argument.format(index=index) for argument in {arguments!r}], **defaults)
+    timings.append(time.perf_counter() - started)
+print(json.dumps(timings))
+"""
+
+# Генераторы, которые можно вызвать с одним именем ресурса
+SINGLE_COMMANDS = [
+    "make-model",
+    "make-schema",
+    "make-service",
+    "make-route",
+    "make-test",
+    "make-factory",
+    "make-util",
+    "make-script",
+]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Свести длительности в миллисекунды: медиана, минимум, максимум."""
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "runs": len(timings),
+    }
+
+
+def run_cli(arguments: list[str], cwd: Path) -> float:
+    """Запустить CLI отдельным процессом и вернуть время выполнения."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(MAIN), *arguments],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def run_in_process(command: str, arguments: list[str], repeat: int, cwd: Path) -> list[float]:
+    """Замерить вызовы функции команды внутри одного процесса."""
+    code = IN_PROCESS_TEMPLATE.format(
+        repo=str(REPO_ROOT), command=command, repeat=repeat, arguments=arguments
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_cold_start(repeat: int, workdir: Path) -> dict[str, Any]:
+    """Холодный старт CLI: вывод справки и справки одной команды."""
+    return {
+        "help": summarize([run_cli(["--help"], workdir) for _ in range(repeat)]),
+        "command_help": summarize([run_cli(["make-model", "--help"], workdir) for _ in range(repeat)]),
+    }
+
+
+def bench_make_project(repeat: int, workdir: Path) -> dict[str, Any]:
+    """Полный make_project (async и sync) в новых директориях."""
+    result = {}
+    for mode in ("--async", "--sync"):
+        timings = []
+        for index in range(repeat):
+            target = workdir / f"project{mode}{index}"
+            target.mkdir()
+            timings.append(run_cli(["make-project", "Shop", "-p", mode], target))
+        result[mode.lstrip("-")] = summarize(timings)
+    return result
+
+
+def bench_single_commands(repeat: int, workdir: Path) -> dict[str, Any]:
+    """Задержка одиночных make_*: через CLI и при вызове функции в процессе."""
+    project = workdir / "single"
+    project.mkdir()
+    run_cli(["make-project", "Shop", "-p"], project)
+
+    result: dict[str, Any] = {}
+    for command in SINGLE_COMMANDS:
+        cli_timings = [run_cli([command, f"Cli{index}Item"], project) for index in range(repeat)]
+        # Первый вызов включает ленивые импорты (например, inflect), поэтому он отдельно
+        first, *rest = run_in_process(command, ["Proc{index}Item"], repeat + 1, project)
+        result[command] = {
+            "cli": summarize(cli_timings),
+            "in_process_first_ms": round(first * 1000, 3),
+            "in_process": summarize(rest),
+        }
+    return result
+
+
+def bench_init_exports(sizes: list[int], workdir: Path) -> dict[str, Any]:
+    """Стоимость update_init_exports по мере роста пакета до сотен экспортов."""
+    sys.path.insert(0, str(REPO_ROOT))
+    from polyscaf_python.utils import create_folder_with_init, update_init_exports
+
+    result: dict[str, Any] = {}
+    for size in sizes:
+        package = workdir / f"exports{size}"
+        create_folder_with_init(package)
+        timings = []
+        for index in range(size):
+            started = time.perf_counter()
+            update_init_exports(package, f"item{index}_model", f"Item{index}")
+            timings.append(time.perf_counter() - started)
+        tail = timings[-min(len(timings), 20):]
+        result[str(size)] = {
+            "total_ms": round(sum(timings) * 1000, 3),
+            "last_calls": summarize(tail),
+        }
+    return result
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("Холодный старт CLI:")
+    for name, stats in report["cold_start"].items():
+        print(f"  {name:<14} {stats['median_ms']:>9.1f} мс")
+    print("make_project:")
+    for name, stats in report["make_project"].items():
+        print(f"  {name:<14} {stats['median_ms']:>9.1f} мс")
+    print("Одиночные make_* (CLI / первый вызов в процессе / последующие):")
+    for name, stats in report["single"].items():
+        print(
+            f"  {name:<14} {stats['cli']['median_ms']:>9.1f} мс / "
+            f"{stats['in_process_first_ms']:.1f} мс / {stats['in_process']['median_ms']:.3f} мс"
+        )
+    print("update_init_exports (всего / медиана последних вызовов):")
+    for size, stats in report["init_exports"].items():
+        print(f"  {size:>5} экспортов {stats['total_ms']:>9.1f} мс / {stats['last_calls']['median_ms']:.3f} мс")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Число повторов каждого замера")
+    parser.add_argument(
+        "--export-sizes",
+        default="50,200,500",
+        help="Размеры пакета для замера update_init_exports, через запятую",
+    )
+    parser.add_argument("--output", help="Сохранить отчёт в JSON-файл")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="polyscaf-bench-") as temp:
+        workdir = Path(temp)
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "cold_start": bench_cold_start(args.repeat, workdir),
+            "make_project": bench_make_project(args.repeat, workdir),
+            "single": bench_single_commands(args.repeat, workdir),
+            "init_exports": bench_init_exports(
+                [int(size) for size in args.export_sizes.split(",") if size], workdir
+            ),
+        }
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
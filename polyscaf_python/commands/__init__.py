@@ -1,27 +1,126 @@
+from importlib import import_module
+from typing import Any, Optional
+
 import typer
+from typer.core import TyperCommand, TyperGroup
+
+# Реестр команд: имя CLI -> (модуль, функция, краткая справка).
+# Модуль команды импортируется только тогда, когда команда действительно вызывается.
+COMMANDS: dict[str, tuple[str, str, str]] = {
+    "make-project": ("project", "make_project", "Создать структуру проекта и стартовые файлы."),
+    "make-model": ("model", "make_model", "Сгенерировать файл модели SQLAlchemy."),
+    "make-schema": ("schema", "make_schema", "Сгенерировать Pydantic-схему."),
+    "make-route": ("route", "make_route", "Сгенерировать модуль маршрутов FastAPI."),
+    "make-service": ("service", "make_service", "Сгенерировать файл сервиса."),
+    "make-util": ("util", "make_util", "Сгенерировать заглушку вспомогательного модуля."),
+    "make-factory": ("factory", "make_factory", "Сгенерировать фабрику для заполнения стартовыми данными."),
+    "make-script": ("script", "make_script", "Сгенерировать заготовку скрипта."),
+    "make-test": ("test", "make_test", "Сгенерировать заготовку API-теста на pytest."),
+    "make-bench": (
+        "bench",
+        "make_bench",
+        "Сгенерировать нагрузочный тест эндпоинта с перцентилями задержки и JSON-отчётом.",
+    ),
+    "make-resources": (
+        "resource",
+        "make_resources",
+        "Сгенерировать модель, схему, сервис, роут, фабрику и тест для нескольких ресурсов.",
+    ),
+    "make-seed": (
+        "seed",
+        "make_seed",
+        "Сгенерировать скрипт пакетного заполнения таблицы (COPY / многострочный INSERT).",
+    ),
+    "make-storage": (
+        "storage",
+        "make_storage",
+        "Сгенерировать потоковую загрузку и отдачу файлов с Range-запросами.",
+    ),
+    "make-worker": (
+        "worker",
+        "make_worker",
+        "Сгенерировать очередь фоновых задач и скрипт обработчика.",
+    ),
+    "make-migration": (
+        "migration",
+        "make_migration",
+        "Создать ревизию Alembic по изменениям моделей с неблокирующими индексами.",
+    ),
+    "make-cache": ("cache", "make_cache", "Сгенерировать модуль utils/cache.py с TTL/LRU-кэшем и декораторами."),
+    "apply": ("apply", "apply", "Сгенерировать проект и ресурсы по декларативному манифесту."),
+    "templates": (
+        "template",
+        "list_templates",
+        "Показать шаблоны генератора и их пользовательские переопределения.",
+    ),
+    "list": ("doctor", "list_project", "Показать модели, схемы, сервисы и роуты проекта."),
+    "doctor": (
+        "doctor",
+        "doctor",
+        "Проверить проект: неподключённые роутеры, модели без схем, сломанные экспорты.",
+    ),
+}
+
+
+def load_command(name: str) -> Any:
+    """Импортировать модуль команды и вернуть функцию-обработчик."""
+    module_name, function_name, _ = COMMANDS[name]
+    module = import_module(f"{__name__}.{module_name}")
+    return getattr(module, function_name)
+
+
+class LazyCommandGroup(TyperGroup):
+    """Группа Typer, которая импортирует модули команд только при вызове."""
+
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        self._loaded: dict[str, Any] = {}
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*self.commands, *(name for name in COMMANDS if name not in self.commands)]
 
-from .factory import make_factory
-from .model import make_model
-from .project import make_project
-from .route import make_route
-from .schema import make_schema
-from .script import make_script
-from .service import make_service
-from .test import make_test
-from .util import make_util
+    def get_command(self, ctx: Any, cmd_name: str) -> Optional[Any]:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        if cmd_name not in COMMANDS:
+            return None
+        # Для справки и автодополнения достаточно заглушки с описанием
+        return TyperCommand(name=cmd_name, help=COMMANDS[cmd_name][2])
+
+    def resolve_command(self, ctx: Any, args: list[str]) -> tuple[Optional[str], Optional[Any], list[str]]:
+        cmd_name, cmd, rest = super().resolve_command(ctx, args)
+        if cmd_name is not None and cmd_name not in self.commands:
+            cmd = self._load(cmd_name)
+        return cmd_name, cmd, rest
+
+    def invoke(self, ctx: Any) -> Any:
+        from polyscaf_python.lock import lock_batch
+        from polyscaf_python.templates import TemplateError
+
+        try:
+            # Один .polyscaf.lock на команду, сколько бы файлов она ни создала
+            with lock_batch():
+                return super().invoke(ctx)
+        except TemplateError as error:
+            # Ошибка пользовательского шаблона — не сбой генератора, трассировка не нужна
+            typer.echo(f"❌ {error}")
+            raise typer.Exit(code=1)
+
+    def _load(self, cmd_name: str) -> Any:
+        if cmd_name not in self._loaded:
+            single = typer.Typer(add_completion=False)
+            single.command(name=cmd_name)(load_command(cmd_name))
+            self._loaded[cmd_name] = typer.main.get_command(single)
+        return self._loaded[cmd_name]
+
+
+def _root() -> None:
+    pass
 
 
 def register(app: typer.Typer) -> None:
-    """Подключить все команды Typer к переданному приложению."""
-    app.command()(make_project)
-    app.command()(make_model)
-    app.command()(make_schema)
-    app.command()(make_route)
-    app.command()(make_service)
-    app.command()(make_util)
-    app.command()(make_factory)
-    app.command()(make_script)
-    app.command()(make_test)
-
-
-__all__ = ["register"]
+    """Подключить команды Typer к приложению с ленивой загрузкой модулей."""
+    app.callback(cls=LazyCommandGroup)(_root)
+
+
+__all__ = ["COMMANDS", "LazyCommandGroup", "load_command", "register"]
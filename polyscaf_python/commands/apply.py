@@ -0,0 +1,42 @@
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from polyscaf_python.lock import DRIFT, NEW, UNCHANGED, UNMANAGED, UPDATE
+from polyscaf_python.plan import apply_plan, build_plan, find_manifest, load_manifest
+from polyscaf_python.settings import BASE_DIR
+
+
+def apply(
+    manifest: Optional[Path] = typer.Argument(
+        None,
+        help="Путь к манифесту (по умолчанию polyscaf.toml/polyscaf.yaml в текущей папке).",
+    ),
+    workers: int = typer.Option(8, "--workers", "-w", help="Число потоков для записи файлов."),
+) -> None:
+    """Сгенерировать проект и ресурсы по декларативному манифесту."""
+    manifest_path = manifest or find_manifest(BASE_DIR)
+    if manifest_path is None or not manifest_path.exists():
+        typer.echo("❌ Манифест не найден: создайте polyscaf.toml или polyscaf.yaml")
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    try:
+        plan = build_plan(load_manifest(manifest_path), BASE_DIR)
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
+    result = apply_plan(plan, workers=workers)
+    elapsed = time.perf_counter() - started
+    for path in result.get(UNMANAGED, []):
+        typer.echo(f"⚠️ Файл уже существует и не отслеживается: {path.relative_to(BASE_DIR)}")
+    for path in result.get(DRIFT, []):
+        typer.echo(f"⚠️ Файл изменён вручную, пропущен: {path.relative_to(BASE_DIR)}")
+    typer.echo(
+        f"🎉 Манифест применён за {elapsed:.2f} с: создано {len(result.get(NEW, []))}, "
+        f"обновлено {len(result.get(UPDATE, []))}, без изменений {len(result.get(UNCHANGED, []))}, "
+        f"изменено вручную {len(result.get(DRIFT, []))}, пакетов {len(plan.exports)}"
+    )
@@ -0,0 +1,206 @@
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import (
+    camel_to_snake,
+    check_file_exists,
+    create_folder_with_init,
+    create_git_ignore,
+    write_generated_file,
+)
+
+
+@register_template("bench")
+def render_bench(name: str) -> str:
+    """Вернуть исходный код нагрузочного теста эндпоинта ресурса."""
+    snake_name = camel_to_snake(name)
+    return (
+        f"\"\"\"Нагрузочный тест эндпоинтов {name}: пропускная способность и перцентили задержки.\n\n"
+        "В процессе (ASGITransport, без сети):\n"
+        f"    python -m benchmarks.bench_{snake_name} --requests 2000 --concurrency 50\n"
+        "Против локального uvicorn (запускается в фоне) или уже работающего сервера:\n"
+        f"    python -m benchmarks.bench_{snake_name} --serve\n"
+        f"    python -m benchmarks.bench_{snake_name} --url http://127.0.0.1:8000\n"
+        "Сравнение с сохранённым прогоном в CI:\n"
+        f"    python -m benchmarks.bench_{snake_name} --output new.json --baseline base.json --max-regression 0.2\n"
+        "\"\"\"\n\n"
+        "import argparse\n"
+        "import asyncio\n"
+        "import json\n"
+        "import math\n"
+        "import platform\n"
+        "import socket\n"
+        "import sys\n"
+        "import threading\n"
+        "import time\n"
+        "from collections import Counter\n"
+        "from contextlib import contextmanager\n"
+        "from typing import Any, Iterator, Optional\n\n"
+        "from httpx import ASGITransport, AsyncClient, Limits\n\n"
+        "from main import app\n\n"
+        f"NAME = \"{snake_name}\"\n"
+        f"DEFAULT_PATH = \"/{snake_name}/1\"\n"
+        "# Сколько секунд ждать запуска локального сервера (--serve)\n"
+        "STARTUP_TIMEOUT = 10.0\n\n\n"
+        "def percentile(sorted_values: list[float], fraction: float) -> float:\n"
+        "    \"\"\"Перцентиль по методу ближайшего ранга.\"\"\"\n"
+        "    if not sorted_values:\n"
+        "        return 0.0\n"
+        "    rank = max(1, math.ceil(fraction * len(sorted_values)))\n"
+        "    return sorted_values[rank - 1]\n\n\n"
+        "@contextmanager\n"
+        "def local_server() -> Iterator[str]:\n"
+        "    \"\"\"Запустить uvicorn с приложением в фоновом потоке на свободном порту.\"\"\"\n"
+        "    import uvicorn\n\n"
+        "    with socket.socket() as probe:\n"
+        "        probe.bind((\"127.0.0.1\", 0))\n"
+        "        port = probe.getsockname()[1]\n"
+        "    server = uvicorn.Server(uvicorn.Config(app, host=\"127.0.0.1\", port=port, log_level=\"warning\"))\n"
+        "    thread = threading.Thread(target=server.run, daemon=True)\n"
+        "    thread.start()\n"
+        "    deadline = time.monotonic() + STARTUP_TIMEOUT\n"
+        "    while not server.started:\n"
+        "        # Если порт занят, uvicorn завершает поток, не выставляя started\n"
+        "        if not thread.is_alive():\n"
+        "            raise RuntimeError(f\"uvicorn не запустился на порту {port}\")\n"
+        "        if time.monotonic() > deadline:\n"
+        "            server.should_exit = True\n"
+        "            raise TimeoutError(f\"uvicorn не запустился за {STARTUP_TIMEOUT} с\")\n"
+        "        time.sleep(0.05)\n"
+        "    try:\n"
+        "        yield f\"http://127.0.0.1:{port}\"\n"
+        "    finally:\n"
+        "        server.should_exit = True\n"
+        "        thread.join()\n\n\n"
+        "async def run(\n"
+        "    path: str,\n"
+        "    *,\n"
+        "    method: str = \"GET\",\n"
+        "    requests: int = 1000,\n"
+        "    concurrency: int = 20,\n"
+        "    warmup: int = 20,\n"
+        "    url: Optional[str] = None,\n"
+        "    payload: Optional[Any] = None,\n"
+        ") -> dict[str, Any]:\n"
+        "    \"\"\"Выполнить requests запросов с заданной конкурентностью и вернуть отчёт.\"\"\"\n"
+        "    if url:\n"
+        "        client = AsyncClient(base_url=url, limits=Limits(max_connections=max(1, concurrency)))\n"
+        "    else:\n"
+        "        client = AsyncClient(transport=ASGITransport(app=app), base_url=\"http://bench\")\n"
+        "    latencies: list[float] = []\n"
+        "    statuses: Counter = Counter()\n"
+        "    errors = 0\n\n"
+        "    async with client:\n"
+        "        for _ in range(warmup):\n"
+        "            await client.request(method, path, json=payload)\n\n"
+        "        remaining = iter(range(requests))\n\n"
+        "        async def worker() -> None:\n"
+        "            nonlocal errors\n"
+        "            for _ in remaining:\n"
+        "                started = time.perf_counter()\n"
+        "                try:\n"
+        "                    response = await client.request(method, path, json=payload)\n"
+        "                except Exception:\n"
+        "                    errors += 1\n"
+        "                    continue\n"
+        "                latencies.append(time.perf_counter() - started)\n"
+        "                statuses[response.status_code] += 1\n\n"
+        "        started = time.perf_counter()\n"
+        "        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))\n"
+        "        duration = time.perf_counter() - started\n\n"
+        "    latencies.sort()\n"
+        "    to_ms = 1000.0\n"
+        "    return {\n"
+        "        \"name\": NAME,\n"
+        "        \"method\": method,\n"
+        "        \"path\": path,\n"
+        "        \"mode\": \"http\" if url else \"asgi\",\n"
+        "        \"requests\": requests,\n"
+        "        \"concurrency\": concurrency,\n"
+        "        \"errors\": errors,\n"
+        "        \"status_counts\": {str(status): count for status, count in sorted(statuses.items())},\n"
+        "        \"duration_s\": round(duration, 4),\n"
+        "        \"throughput_rps\": round(len(latencies) / duration, 2) if duration else 0.0,\n"
+        "        \"latency_ms\": {\n"
+        "            \"p50\": round(percentile(latencies, 0.50) * to_ms, 3),\n"
+        "            \"p95\": round(percentile(latencies, 0.95) * to_ms, 3),\n"
+        "            \"p99\": round(percentile(latencies, 0.99) * to_ms, 3),\n"
+        "            \"mean\": round(sum(latencies) / len(latencies) * to_ms, 3) if latencies else 0.0,\n"
+        "            \"max\": round(latencies[-1] * to_ms, 3) if latencies else 0.0,\n"
+        "        },\n"
+        "        \"python\": platform.python_version(),\n"
+        "        \"timestamp\": time.strftime(\"%Y-%m-%dT%H:%M:%SZ\", time.gmtime()),\n"
+        "    }\n\n\n"
+        "def compare(report: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:\n"
+        "    \"\"\"Вернуть метрики, ухудшившиеся относительно baseline больше чем на max_regression.\"\"\"\n"
+        "    problems = []\n"
+        "    for key in (\"p50\", \"p95\", \"p99\"):\n"
+        "        old, new = baseline[\"latency_ms\"][key], report[\"latency_ms\"][key]\n"
+        "        if old and new > old * (1 + max_regression):\n"
+        "            problems.append(f\"{key}: {old} -> {new} мс\")\n"
+        "    old_rps, new_rps = baseline[\"throughput_rps\"], report[\"throughput_rps\"]\n"
+        "    if old_rps and new_rps < old_rps * (1 - max_regression):\n"
+        "        problems.append(f\"throughput: {old_rps} -> {new_rps} rps\")\n"
+        "    return problems\n\n\n"
+        "def main() -> int:\n"
+        "    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)\n"
+        "    parser.add_argument(\"--path\", default=DEFAULT_PATH)\n"
+        "    parser.add_argument(\"--method\", default=\"GET\")\n"
+        "    parser.add_argument(\"--json\", dest=\"payload\", help=\"Тело запроса в JSON\")\n"
+        "    parser.add_argument(\"--requests\", type=int, default=1000)\n"
+        "    parser.add_argument(\"--concurrency\", type=int, default=20)\n"
+        "    parser.add_argument(\"--warmup\", type=int, default=20)\n"
+        "    target = parser.add_mutually_exclusive_group()\n"
+        "    target.add_argument(\"--url\", help=\"Адрес уже запущенного сервера\")\n"
+        "    target.add_argument(\"--serve\", action=\"store_true\", help=\"Запустить локальный uvicorn\")\n"
+        "    parser.add_argument(\"--output\", help=\"Сохранить отчёт в JSON-файл\")\n"
+        "    parser.add_argument(\"--baseline\", help=\"JSON-отчёт прошлого прогона для сравнения\")\n"
+        "    parser.add_argument(\"--max-regression\", type=float, default=0.2)\n"
+        "    args = parser.parse_args()\n\n"
+        "    options = dict(\n"
+        "        method=args.method.upper(),\n"
+        "        requests=args.requests,\n"
+        "        concurrency=args.concurrency,\n"
+        "        warmup=args.warmup,\n"
+        "        payload=json.loads(args.payload) if args.payload else None,\n"
+        "    )\n"
+        "    if args.serve:\n"
+        "        with local_server() as url:\n"
+        "            report = asyncio.run(run(args.path, url=url, **options))\n"
+        "    else:\n"
+        "        report = asyncio.run(run(args.path, url=args.url, **options))\n\n"
+        "    latency = report[\"latency_ms\"]\n"
+        "    print(\n"
+        "        f\"{report['method']} {report['path']} [{report['mode']}]: \"\n"
+        "        f\"{report['throughput_rps']} rps, p50 {latency['p50']} мс, \"\n"
+        "        f\"p95 {latency['p95']} мс, p99 {latency['p99']} мс, \"\n"
+        "        f\"статусы {report['status_counts']}, ошибки {report['errors']}\"\n"
+        "    )\n"
+        "    if args.output:\n"
+        "        with open(args.output, \"w\", encoding=\"utf-8\") as output:\n"
+        "            json.dump(report, output, indent=2, ensure_ascii=False)\n"
+        "    if args.baseline:\n"
+        "        with open(args.baseline, encoding=\"utf-8\") as baseline_file:\n"
+        "            problems = compare(report, json.load(baseline_file), args.max_regression)\n"
+        "        for problem in problems:\n"
+        "            print(f\"❌ Регрессия {problem}\")\n"
+        "        if problems:\n"
+        "            return 1\n"
+        "    return 0\n\n\n"
+        "if __name__ == \"__main__\":\n"
+        "    sys.exit(main())\n"
+    )
+
+
+def make_bench(name: str) -> None:
+    """Сгенерировать нагрузочный тест эндпоинта с перцентилями задержки и JSON-отчётом."""
+    path = BASE_DIR / "benchmarks"
+    create_folder_with_init(path)
+    snake_name = camel_to_snake(name)
+    file_path = path / f"bench_{snake_name}.py"
+    check_file_exists(file_path)
+    create_git_ignore(path)
+
+    write_generated_file(file_path, render_bench(name))
+    typer.echo(f"✅ Нагрузочный тест {name} создан")
@@ -0,0 +1,340 @@
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import (
+    check_file_exists,
+    create_folder_with_init,
+    create_git_ignore,
+    update_init_exports_many,
+    write_generated_file,
+)
+
+CACHE_TEMPLATE = '''"""Кэш для сервисов: TTL + LRU в памяти, single-flight и сменные бэкенды.
+
+Пример для сервиса из make_service:
+
+    from utils.cache import cached, invalidates
+
+    class UserService:
+        @cached("user:{user_id}", ttl=30)
+        async def get_user(self, user_id: int): ...
+
+        @invalidates("user:{user_id}", "user_list:*")
+        async def update_user(self, user_id: int, data): ...
+
+Ключ форматируется по аргументам вызова (без self). Ключи с "*" на конце
+удаляются по префиксу. Для Redis-совместимого хранилища:
+
+    cache.backend = RedisBackend(redis.asyncio.Redis.from_url(...))
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+MISSING = object()
+
+
+class CacheBackend(Protocol):
+    """Интерфейс хранилища кэша."""
+
+    async def get(self, key: str) -> Any:
+        """Вернуть значение или MISSING."""
+
+    async def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Сохранить значение на ttl секунд (None — без срока)."""
+
+    async def delete(self, *keys: str) -> None:
+        """Удалить ключи."""
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Удалить все ключи с префиксом."""
+
+
+class MemoryBackend:
+    """Ограниченный по размеру кэш в памяти процесса с TTL и вытеснением LRU."""
+
+    def __init__(self, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._data: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_sync(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return MISSING
+            expires_at, value = item
+            if expires_at is not None and expires_at <= self.clock():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set_sync(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = self.clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_sync(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_prefix_sync(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Any:
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        self.set_sync(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self.delete_sync(*keys)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        self.delete_prefix_sync(prefix)
+
+
+class RedisBackend:
+    """Бэкенд поверх Redis-совместимого асинхронного клиента (redis.asyncio)."""
+
+    def __init__(self, client: Any, namespace: str = "cache:") -> None:
+        self.client = client
+        self.namespace = namespace
+
+    async def get(self, key: str) -> Any:
+        raw = await self.client.get(self.namespace + key)
+        return MISSING if raw is None else pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expire = max(1, int(ttl)) if ttl is not None else None
+        await self.client.set(self.namespace + key, pickle.dumps(value), ex=expire)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.namespace + key for key in keys))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self.client.scan_iter(match=self.namespace + prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class FakeRedis:
+    """Минимальный асинхронный клиент в памяти для тестов RedisBackend без сервера."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self._data: dict[str, tuple[Optional[float], bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None or (item[0] is not None and item[0] <= self.clock()):
+            self._data.pop(key, None)
+            return None
+        return item[1]
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self._data[key] = (self.clock() + ex if ex is not None else None, value)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match: str = "*"):
+        prefix = match.rstrip("*")
+        for key in list(self._data):
+            if key.startswith(prefix):
+                yield key
+
+
+class Cache:
+    """Кэш с защитой от «штурма» (single-flight): один загрузчик на ключ."""
+
+    def __init__(self, backend: Any, default_ttl: Optional[float] = 60.0) -> None:
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Фиксированный набор блокировок: память не растёт с числом ключей
+        self._sync_locks = [threading.Lock() for _ in range(64)]
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_set(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> Any:
+        while True:
+            value = await self.backend.get(key)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Отменили вызывающего загрузчика, а не этот вызов: загружаем заново
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        self.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            await self.backend.set(key, value, self.default_ttl if ttl is None else ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # Ожидающие увидят отменённый future и повторят загрузку сами
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Исключение получат ожидающие; здесь отмечаем его как обработанное
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_or_set_sync(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Синхронный вариант get_or_set; требует бэкенд с *_sync-методами (MemoryBackend)."""
+        value = self.backend.get_sync(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        with self._sync_locks[hash(key) % len(self._sync_locks)]:
+            value = self.backend.get_sync(key)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = loader()
+            self.backend.set_sync(key, value, self.default_ttl if ttl is None else ttl)
+            return value
+
+    async def invalidate(self, *patterns: str) -> None:
+        """Удалить ключи; шаблоны с "*" на конце удаляются по префиксу."""
+        for pattern in patterns:
+            if pattern.endswith("*"):
+                await self.backend.delete_prefix(pattern[:-1])
+            else:
+                await self.backend.delete(pattern)
+
+    def invalidate_sync(self, *patterns: str) -> None:
+        for pattern in patterns:
+            if pattern.endswith("*"):
+                self.backend.delete_prefix_sync(pattern[:-1])
+            else:
+                self.backend.delete_sync(pattern)
+
+
+cache = Cache(
+    MemoryBackend(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000"))),
+    default_ttl=float(os.getenv("CACHE_DEFAULT_TTL", "60")),
+)
+
+
+def _format_keys(function: Callable, templates: tuple[str, ...], args: tuple, kwargs: dict) -> list[str]:
+    bound = inspect.signature(function).bind(*args, **kwargs)
+    bound.apply_defaults()
+    values = {name: value for name, value in bound.arguments.items() if name != "self"}
+    return [template.format(**values) for template in templates]
+
+
+def cached(key: Optional[str] = None, ttl: Optional[float] = None, *, store: Optional[Cache] = None):
+    """Кэшировать результат функции или метода по ключу, собранному из аргументов."""
+
+    def decorator(function: Callable) -> Callable:
+        template = key or f"{function.__module__}.{function.__qualname__}:" + ":".join(
+            "{" + name + "}" for name in inspect.signature(function).parameters if name != "self"
+        )
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                (cache_key,) = _format_keys(function, (template,), args, kwargs)
+                return await (store or cache).get_or_set(cache_key, lambda: function(*args, **kwargs), ttl)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            (cache_key,) = _format_keys(function, (template,), args, kwargs)
+            return (store or cache).get_or_set_sync(cache_key, lambda: function(*args, **kwargs), ttl)
+
+        return sync_wrapper
+
+    return decorator
+
+
+def invalidates(*patterns: str, store: Optional[Cache] = None):
+    """Сбросить ключи кэша после успешного вызова (хук для create/update/delete)."""
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                result = await function(*args, **kwargs)
+                await (store or cache).invalidate(*_format_keys(function, patterns, args, kwargs))
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = function(*args, **kwargs)
+            (store or cache).invalidate_sync(*_format_keys(function, patterns, args, kwargs))
+            return result
+
+        return sync_wrapper
+
+    return decorator
+'''
+
+# Экземпляр cache не экспортируем: он перекрыл бы подмодуль utils.cache
+CACHE_EXPORTS = [
+    ("cache", "Cache", None),
+    ("cache", "MemoryBackend", None),
+    ("cache", "RedisBackend", None),
+    ("cache", "cached", None),
+    ("cache", "invalidates", None),
+]
+
+
+@register_template("cache")
+def render_cache() -> str:
+    """Вернуть исходный код модуля кэша."""
+    return CACHE_TEMPLATE
+
+
+def make_cache() -> None:
+    """Сгенерировать модуль utils/cache.py с TTL/LRU-кэшем и декораторами."""
+    path = BASE_DIR / "utils"
+    create_folder_with_init(path)
+    file_path = path / "cache.py"
+    check_file_exists(file_path)
+    create_git_ignore(path)
+
+    write_generated_file(file_path, render_cache())
+    update_init_exports_many(path, CACHE_EXPORTS)
+    typer.echo("✅ Кэш utils/cache.py создан")
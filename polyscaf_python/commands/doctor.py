@@ -0,0 +1,171 @@
+import time
+from typing import Optional
+
+import typer
+
+from polyscaf_python.index import INDEXED_DIRS, ModuleInfo, ProjectIndex
+from polyscaf_python.lock import LockFile
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.utils import camel_to_snake
+
+ERROR = "❌"
+WARNING = "⚠️"
+INFO = "ℹ️"
+
+
+def _router_aliases(index: ProjectIndex) -> dict[str, set[str]]:
+    """Имена, под которыми routes/__init__.py экспортирует роутер каждого модуля."""
+    aliases: dict[str, set[str]] = {}
+    init = index.init("routes")
+    if init is not None:
+        for module, symbol, alias in init.imports:
+            if symbol == "router":
+                aliases.setdefault(module, set()).add(alias or symbol)
+    return aliases
+
+
+def _is_included(module: str, aliases: set[str], included: list[str]) -> bool:
+    """Подключён ли роутер модуля в main.py: по псевдониму или по пути модуля."""
+    for expression in included:
+        parts = expression.split(".")
+        if parts[0] in aliases or module in parts:
+            return True
+    return False
+
+
+def _is_model(bases: list[str]) -> bool:
+    return any(base.rsplit(".", 1)[-1] in ("Base", "DeclarativeBase") for base in bases)
+
+
+def check_parse_errors(index: ProjectIndex) -> list[tuple[str, str]]:
+    """Файлы, которые не удалось разобрать."""
+    return [
+        (ERROR, f"Синтаксическая ошибка в {info.path}: {info.error}")
+        for info in index.modules.values()
+        if info.error
+    ]
+
+
+def check_routers(index: ProjectIndex) -> list[tuple[str, str]]:
+    """Роутеры, не экспортированные из routes/__init__.py или не подключённые в main.py."""
+    problems: list[tuple[str, str]] = []
+    aliases = _router_aliases(index)
+    main = index.main()
+    # include_routers(app) из routing.py подключает все роутеры, экспортированные как <Name>Router
+    autowired = main is not None and main.autowired
+    for info in index.section("routes"):
+        if not info.router:
+            continue
+        module_aliases = aliases.get(info.module, set())
+        if autowired:
+            if not any(alias.endswith("Router") for alias in module_aliases):
+                message = f"Роутер {info.path} не экспортирован из routes/__init__.py как <Name>Router"
+                problems.append((ERROR, f"{message} и не будет подключён"))
+            continue
+        if not module_aliases:
+            problems.append((WARNING, f"Роутер {info.path} не экспортирован из routes/__init__.py"))
+        if main is None:
+            continue
+        if not _is_included(info.module, module_aliases, main.included):
+            problems.append((ERROR, f"Роутер {info.path} не подключён в main.py (app.include_router)"))
+    return problems
+
+
+def check_schemas(index: ProjectIndex) -> list[tuple[str, str]]:
+    """Модели без Pydantic-схемы."""
+    problems: list[tuple[str, str]] = []
+    schema_classes = index.classes("schemas")
+    for info in index.section("models"):
+        for name, bases in info.classes.items():
+            if not _is_model(bases):
+                continue
+            if f"{name}Schema" in schema_classes or index.get("schemas", f"{camel_to_snake(name)}_schema"):
+                continue
+            problems.append((WARNING, f"Для модели {name} ({info.path}) нет схемы: make-schema {name}"))
+    return problems
+
+
+def check_exports(index: ProjectIndex) -> list[tuple[str, str]]:
+    """Импорты и __all__ в __init__.py, ссылающиеся на несуществующие модули и имена."""
+    problems: list[tuple[str, str]] = []
+    for directory in INDEXED_DIRS:
+        init = index.init(directory)
+        if init is None:
+            continue
+        for module, symbol, alias in init.imports:
+            target = index.get(directory, module)
+            if target is None:
+                if not (index.root / directory / module).is_dir():
+                    problems.append((ERROR, f"{init.path}: модуль {module} не найден"))
+                continue
+            if not target.error and symbol not in target.symbols:
+                problems.append((ERROR, f"{init.path}: в {target.path} нет {symbol}"))
+        for name in init.exports or []:
+            if name not in init.symbols:
+                problems.append((ERROR, f"{init.path}: {name} указан в __all__, но не импортирован"))
+    return problems
+
+
+def check_lock(index: ProjectIndex) -> list[tuple[str, str]]:
+    """Сгенерированные файлы, изменённые вручную после генерации."""
+    return [
+        (INFO, f"Файл изменён после генерации: {path.relative_to(index.root)}")
+        for path in LockFile.load(index.root).drifted()
+    ]
+
+
+CHECKS = (check_parse_errors, check_exports, check_routers, check_schemas, check_lock)
+
+
+def doctor() -> None:
+    """Проверить проект: роутеры, схемы, экспорты __init__.py и ручные правки сгенерированных файлов."""
+    started = time.perf_counter()
+    index = ProjectIndex.load(BASE_DIR)
+    problems = [problem for check in CHECKS for problem in check(index)]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for level, message in problems:
+        typer.echo(f"{level} {message}")
+    errors = sum(1 for level, _ in problems if level == ERROR)
+    warnings = sum(1 for level, _ in problems if level == WARNING)
+    summary = (
+        f"проверено файлов: {len(index.modules)}, разобрано заново: {index.parsed}, "
+        f"{elapsed_ms:.1f} мс"
+    )
+    if errors:
+        typer.echo(f"❌ Ошибок: {errors}, предупреждений: {warnings} ({summary})")
+        raise typer.Exit(code=1)
+    if warnings:
+        typer.echo(f"⚠️ Предупреждений: {warnings} ({summary})")
+    else:
+        typer.echo(f"✅ Проблем не найдено ({summary})")
+
+
+def _describe(directory: str, info: ModuleInfo) -> str:
+    if info.error:
+        return f"❌ синтаксическая ошибка: {info.error}"
+    if directory == "routes":
+        return "router" if info.router else "без router"
+    return ", ".join(info.classes) or "—"
+
+
+def list_project(
+    section: Optional[str] = typer.Argument(
+        None,
+        help=f"Раздел проекта: {', '.join(INDEXED_DIRS)} (по умолчанию все).",
+    ),
+) -> None:
+    """Показать модели, схемы, сервисы и роуты проекта по индексу."""
+    if section is not None and section not in INDEXED_DIRS:
+        typer.echo(f"❌ Неизвестный раздел: {section}. Доступны: {', '.join(INDEXED_DIRS)}")
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    index = ProjectIndex.load(BASE_DIR)
+    for directory in [section] if section else INDEXED_DIRS:
+        modules = index.section(directory)
+        typer.echo(f"📁 {directory} ({len(modules)})")
+        for info in modules:
+            typer.echo(f"  {info.module}: {_describe(directory, info)}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    typer.echo(f"ℹ️ Файлов в индексе: {len(index.modules)}, разобрано заново: {index.parsed}, {elapsed_ms:.1f} мс")
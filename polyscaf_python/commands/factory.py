@@ -1,16 +1,110 @@
+from typing import Optional
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    is_async_project,
+    write_generated_file,
 )
 
+from .model import DEFAULT_FIELDS, FIELD_HELP, FieldSpec, model_fields, parse_field
+
+# Тип Python колонки -> (объявление factory-boy, нужный импорт)
+_DECLARATIONS: dict[str, tuple[str, Optional[str]]] = {
+    "int": ("factory.Sequence(lambda n: n)", None),
+    "float": ("factory.Sequence(lambda n: float(n))", None),
+    "Decimal": ("factory.Sequence(lambda n: Decimal(n))", "from decimal import Decimal"),
+    "bool": ("False", None),
+    "date": ("factory.LazyFunction(date.today)", "from datetime import date, datetime, timezone"),
+    "datetime": (
+        "factory.LazyFunction(lambda: datetime.now(timezone.utc))",
+        "from datetime import date, datetime, timezone",
+    ),
+    "dict": ("factory.LazyFunction(dict)", None),
+    "uuid.UUID": ("factory.LazyFunction(uuid.uuid4)", "import uuid"),
+}
+
+
+def _declaration(snake_name: str, spec: FieldSpec) -> tuple[Optional[str], Optional[str]]:
+    """Значение поля фабрики и нужный ему импорт; None — поле заполнит БД или модель."""
+    if spec.kind == "fk":
+        if spec.nullable:
+            return None, None
+        target = spec.target
+        return f"factory.SubFactory(\"database.factories.{camel_to_snake(target)}_factory.{target}Factory\")", None
+    if spec.kind != "column" or spec.nullable or spec.default is not None:
+        return None, None
+    if spec.py_type == "str":
+        prefix = snake_name if spec.name == "name" else spec.name
+        return f"factory.Sequence(lambda n: f\"{prefix}_{{n}}\")", None
+    return _DECLARATIONS[spec.py_type]
+
+
+@register_template("factory", variants=("use_async",))
+def render_factory(name: str, *, use_async: bool = True, fields: Optional[list[str]] = None) -> str:
+    """Вернуть исходный код фабрики factory-boy.
+
+    Фабрика заполняет обязательные поля модели: строки и числа — по
+    последовательности, внешние ключи — через SubFactory связанной модели.
+    """
+    snake_name = camel_to_snake(name)
+    class_name = f"{name}Factory"
+    # В асинхронных проектах factory-boy работает через синхронную сессию
+    session_import = (
+        "from database.database import SyncSessionLocal as SessionLocal\n"
+        if use_async
+        else "from database import SessionLocal\n"
+    )
+    specs = [parse_field(spec) for spec in (fields or DEFAULT_FIELDS)]
+    declarations = []
+    imports = []
+    for spec in specs:
+        declaration, import_line = _declaration(snake_name, spec)
+        if declaration is None:
+            continue
+        declarations.append(f"    {spec.name} = {declaration}\n")
+        if import_line and import_line not in imports:
+            imports.append(import_line)
 
-def make_factory(name: str) -> None:
+    return (
+        "".join(f"{line}\n" for line in sorted(imports))
+        + ("\n" if imports else "")
+        + "import factory\n"
+        "from factory.alchemy import SQLAlchemyModelFactory\n\n"
+        f"{session_import}"
+        f"from models.{snake_name}_model import {name}\n\n"
+        f"class {class_name}(SQLAlchemyModelFactory):\n"
+        "    class Meta:\n"
+        f"        model = {name}\n"
+        "        # Сессия создаётся при первом create(), а не при импорте модуля\n"
+        "        sqlalchemy_session_factory = SessionLocal\n"
+        "        sqlalchemy_session_persistence = 'commit'\n"
+        + ("\n" + "".join(declarations) if declarations else "")
+    )
+
+
+def make_factory(
+    name: str,
+    fields: Optional[list[str]] = typer.Option(
+        None,
+        "--field",
+        "-f",
+        help=FIELD_HELP,
+    ),
+) -> None:
     """Сгенерировать фабрику для заполнения стартовыми данными."""
+    try:
+        content = render_factory(name, use_async=is_async_project(), fields=fields or model_fields(name))
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
     database_path = BASE_DIR / "database"
     create_folder_with_init(database_path, is_database=True)
     create_git_ignore(database_path)
@@ -23,18 +117,5 @@ def make_factory(name: str) -> None:
     file_path = path / f"{snake_name}_factory.py"
     check_file_exists(file_path)
 
-    class_name = f"{name}Factory"
-
-    file_path.write_text(
-        "import factory\n"
-        "from factory.alchemy import SQLAlchemyModelFactory\n\n"
-        "from database import SessionLocal\n"
-        f"from models.{snake_name}_model import {name}\n\n"
-        f"class {class_name}(SQLAlchemyModelFactory):\n"
-        "    class Meta:\n"
-        f"        model = {name}\n"
-        "        sqlalchemy_session = SessionLocal()\n"
-        "        sqlalchemy_session_persistence = 'commit'\n\n"
-        f"    name = factory.Sequence(lambda n: f\"{snake_name}_{{n}}\")\n"
-    )
+    write_generated_file(file_path, content)
     typer.echo(f"✅ Фабрика {name} создана")
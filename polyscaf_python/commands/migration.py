@@ -0,0 +1,654 @@
+import re
+from typing import Optional
+
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import ensure_directory, write_generated_file
+
+ALEMBIC_INI_TEMPLATE = """# Конфигурация Alembic: python main.py make-migration "описание" создаёт ревизию,
+# alembic upgrade head применяет их. Подключение к БД берётся из database/database.py.
+
+[alembic]
+script_location = migrations
+prepend_sys_path = .
+file_template = %%(year)d%%(month).2d%%(day).2d_%%(hour).2d%%(minute).2d_%%(rev)s_%%(slug)s
+truncate_slug_length = 40
+version_path_separator = os
+
+[loggers]
+keys = root,sqlalchemy,alembic
+
+[handlers]
+keys = console
+
+[formatters]
+keys = generic
+
+[logger_root]
+level = WARNING
+handlers = console
+qualname =
+
+[logger_sqlalchemy]
+level = WARNING
+handlers =
+qualname = sqlalchemy.engine
+
+[logger_alembic]
+level = INFO
+handlers =
+qualname = alembic
+
+[handler_console]
+class = StreamHandler
+args = (sys.stderr,)
+level = NOTSET
+formatter = generic
+
+[formatter_generic]
+format = %(levelname)-5.5s [%(name)s] %(message)s
+datefmt = %H:%M:%S
+"""
+
+ENV_TEMPLATE = '''"""Окружение Alembic: метаданные database.Base и все модели пакета models."""
+
+from logging.config import fileConfig
+from typing import Any
+
+from alembic import context
+
+import models  # noqa: F401  импорт регистрирует все модели в Base.metadata
+from database.database import Base
+from migrations.operations import rewrite_revision
+
+try:
+    # В асинхронных проектах миграции выполняются через синхронный движок
+    from database.database import sync_engine as engine
+except ImportError:
+    from database.database import engine
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _options(dialect_name: str) -> dict[str, Any]:
+    return {
+        "target_metadata": target_metadata,
+        "compare_type": True,
+        # SQLite не умеет ALTER COLUMN: изменения выполняются пересозданием таблицы
+        "render_as_batch": dialect_name == "sqlite",
+        "process_revision_directives": rewrite_revision,
+    }
+
+
+def run_migrations_offline() -> None:
+    """Вывести SQL миграций без подключения к БД (alembic upgrade head --sql)."""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **_options(engine.dialect.name),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Применить миграции; каждая ревизия выполняется в своей транзакции."""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            transaction_per_migration=True,
+            **_options(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
+'''
+
+SCRIPT_MAKO_TEMPLATE = '''"""${message}
+
+Revision ID: ${up_revision}
+Revises: ${down_revision | comma,n}
+Create Date: ${create_date}
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+${imports if imports else ""}
+
+# revision identifiers, used by Alembic.
+revision: str = ${repr(up_revision)}
+down_revision: Union[str, Sequence[str], None] = ${repr(down_revision)}
+branch_labels: Union[str, Sequence[str], None] = ${repr(branch_labels)}
+depends_on: Union[str, Sequence[str], None] = ${repr(depends_on)}
+
+
+def upgrade() -> None:
+    ${upgrades if upgrades else "pass"}
+
+
+def downgrade() -> None:
+    ${downgrades if downgrades else "pass"}
+'''
+
+OPERATIONS_TEMPLATE = '''"""Операции миграций для больших таблиц.
+
+op.create_index_concurrently / op.drop_index_concurrently строят и удаляют
+индекс на PostgreSQL через CREATE/DROP INDEX CONCURRENTLY вне транзакции
+миграции: запись в таблицу не блокируется. На других СУБД это обычные
+CREATE/DROP INDEX.
+
+op.backfill заполняет столбец пачками по диапазонам первичного ключа,
+каждая пачка фиксируется отдельно: блокировки строк короткие, а прерванная
+миграция при повторном запуске продолжит с ещё не заполненных строк.
+
+rewrite_revision подключён в env.py: при автогенерации для PostgreSQL он
+заменяет create_index/drop_index существующих таблиц на неблокирующие версии,
+а для --backfill разбивает добавление NOT NULL-столбца на три шага:
+добавить nullable-столбец, заполнить пачками, затем SET NOT NULL. На
+PostgreSQL последний шаг — op.set_not_null: CHECK (... IS NOT NULL) NOT VALID,
+VALIDATE CONSTRAINT без блокировки записи, SET NOT NULL по уже проверенному
+ограничению (без повторного сканирования таблицы) и удаление CHECK.
+"""
+
+import time
+from typing import Any, Optional
+
+import sqlalchemy as sa
+from alembic.autogenerate import renderers
+from alembic.operations import MigrateOperation, Operations, ops
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def _column_names(columns: Any) -> Optional[list[str]]:
+    """Имена столбцов индекса или None для функциональных индексов."""
+    names: list[str] = []
+    for column in columns:
+        if isinstance(column, str):
+            names.append(column)
+        elif isinstance(column, sa.Column) and column.name:
+            names.append(column.name)
+        else:
+            return None
+    return names
+
+
+@Operations.register_operation("create_index_concurrently")
+class CreateIndexConcurrentlyOp(MigrateOperation):
+    """CREATE INDEX CONCURRENTLY на PostgreSQL, обычный CREATE INDEX на других СУБД."""
+
+    def __init__(
+        self,
+        index_name: str,
+        table_name: str,
+        columns: list[str],
+        *,
+        unique: bool = False,
+        schema: Optional[str] = None,
+    ) -> None:
+        self.index_name = index_name
+        self.table_name = table_name
+        self.columns = columns
+        self.unique = unique
+        self.schema = schema
+
+    @classmethod
+    def create_index_concurrently(
+        cls, operations: Operations, index_name: str, table_name: str, columns: list[str], **kw: Any
+    ) -> None:
+        return operations.invoke(cls(index_name, table_name, columns, **kw))
+
+    def reverse(self) -> "DropIndexConcurrentlyOp":
+        return DropIndexConcurrentlyOp(
+            self.index_name, self.table_name, self.columns, unique=self.unique, schema=self.schema
+        )
+
+
+@Operations.register_operation("drop_index_concurrently")
+class DropIndexConcurrentlyOp(MigrateOperation):
+    """DROP INDEX CONCURRENTLY на PostgreSQL, обычный DROP INDEX на других СУБД."""
+
+    def __init__(
+        self,
+        index_name: str,
+        table_name: str,
+        columns: Optional[list[str]] = None,
+        *,
+        unique: bool = False,
+        schema: Optional[str] = None,
+    ) -> None:
+        self.index_name = index_name
+        self.table_name = table_name
+        self.columns = columns
+        self.unique = unique
+        self.schema = schema
+
+    @classmethod
+    def drop_index_concurrently(cls, operations: Operations, index_name: str, table_name: str, **kw: Any) -> None:
+        return operations.invoke(cls(index_name, table_name, **kw))
+
+    def reverse(self) -> CreateIndexConcurrentlyOp:
+        if self.columns is None:
+            raise ValueError(f"Для обратной операции нужны столбцы индекса {self.index_name}")
+        return CreateIndexConcurrentlyOp(
+            self.index_name, self.table_name, self.columns, unique=self.unique, schema=self.schema
+        )
+
+
+@Operations.register_operation("backfill")
+class BackfillOp(MigrateOperation):
+    """UPDATE столбца пачками по диапазонам ключа, каждая пачка — отдельная транзакция."""
+
+    def __init__(
+        self,
+        table_name: str,
+        column_name: str,
+        expression: str,
+        *,
+        batch_size: int = BACKFILL_BATCH_SIZE,
+        key: str = "id",
+        only_null: bool = True,
+        schema: Optional[str] = None,
+    ) -> None:
+        self.table_name = table_name
+        self.column_name = column_name
+        self.expression = expression
+        self.batch_size = batch_size
+        self.key = key
+        self.only_null = only_null
+        self.schema = schema
+
+    @classmethod
+    def backfill(
+        cls, operations: Operations, table_name: str, column_name: str, expression: str, **kw: Any
+    ) -> None:
+        return operations.invoke(cls(table_name, column_name, expression, **kw))
+
+
+@Operations.register_operation("set_not_null")
+class SetNotNullOp(MigrateOperation):
+    """SET NOT NULL на PostgreSQL без долгой блокировки таблицы через проверенный CHECK."""
+
+    def __init__(self, table_name: str, column_name: str, *, schema: Optional[str] = None) -> None:
+        self.table_name = table_name
+        self.column_name = column_name
+        self.schema = schema
+
+    @classmethod
+    def set_not_null(cls, operations: Operations, table_name: str, column_name: str, **kw: Any) -> None:
+        return operations.invoke(cls(table_name, column_name, **kw))
+
+
+def _is_postgres(operations: Operations) -> bool:
+    return operations.get_context().dialect.name == "postgresql"
+
+
+def _index_state(operations: Operations, index_name: str, schema: Optional[str]) -> Optional[bool]:
+    """True — индекс готов, False — остался невалидным после сбоя, None — индекса нет."""
+    row = operations.get_bind().execute(
+        sa.text(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = :name AND n.nspname = coalesce(:schema, current_schema())"
+        ),
+        {"name": index_name, "schema": schema},
+    ).first()
+    return None if row is None else bool(row[0])
+
+
+@Operations.implementation_for(CreateIndexConcurrentlyOp)
+def create_index_concurrently(operations: Operations, operation: CreateIndexConcurrentlyOp) -> None:
+    if not _is_postgres(operations):
+        operations.create_index(
+            operation.index_name, operation.table_name, operation.columns,
+            unique=operation.unique, schema=operation.schema,
+        )
+        return
+    context = operations.get_context()
+    # CONCURRENTLY нельзя выполнять внутри транзакции
+    with context.autocommit_block():
+        if not context.as_sql:
+            state = _index_state(operations, operation.index_name, operation.schema)
+            if state:
+                return
+            if state is False:
+                # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс
+                operations.drop_index(
+                    operation.index_name, table_name=operation.table_name,
+                    schema=operation.schema, postgresql_concurrently=True,
+                )
+        operations.create_index(
+            operation.index_name, operation.table_name, operation.columns,
+            unique=operation.unique, schema=operation.schema,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+@Operations.implementation_for(DropIndexConcurrentlyOp)
+def drop_index_concurrently(operations: Operations, operation: DropIndexConcurrentlyOp) -> None:
+    if not _is_postgres(operations):
+        operations.drop_index(operation.index_name, table_name=operation.table_name, schema=operation.schema)
+        return
+    with operations.get_context().autocommit_block():
+        operations.drop_index(
+            operation.index_name, table_name=operation.table_name, schema=operation.schema,
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+@Operations.implementation_for(BackfillOp)
+def backfill(operations: Operations, operation: BackfillOp) -> None:
+    table = sa.table(
+        operation.table_name,
+        sa.column(operation.key),
+        sa.column(operation.column_name),
+        schema=operation.schema,
+    )
+    key = table.c[operation.key]
+    column = table.c[operation.column_name]
+    statement = sa.update(table).values({operation.column_name: sa.text(operation.expression)})
+    if operation.only_null:
+        statement = statement.where(column.is_(None))
+
+    context = operations.get_context()
+    if context.as_sql:
+        # В режиме --sql пачки по ключу неизвестны: выводим один UPDATE
+        operations.execute(statement)
+        return
+
+    with context.autocommit_block():
+        bind = operations.get_bind()
+        low, high = bind.execute(sa.select(sa.func.min(key), sa.func.max(key)).select_from(table)).one()
+        if low is None:
+            return
+        started = time.perf_counter()
+        updated = 0
+        for start in range(low, high + 1, operation.batch_size):
+            # Вне транзакции миграции каждый UPDATE фиксируется сразу
+            result = bind.execute(statement.where(key >= start, key < start + operation.batch_size))
+            updated += max(result.rowcount, 0)
+        elapsed = time.perf_counter() - started
+        print(f"backfill {operation.table_name}.{operation.column_name}: {updated} строк за {elapsed:.1f} с")
+
+
+@Operations.implementation_for(SetNotNullOp)
+def set_not_null(operations: Operations, operation: SetNotNullOp) -> None:
+    if not _is_postgres(operations):
+        with operations.batch_alter_table(operation.table_name, schema=operation.schema) as batch:
+            batch.alter_column(operation.column_name, nullable=False)
+        return
+    preparer = operations.get_context().dialect.identifier_preparer
+    table = preparer.quote(operation.table_name)
+    if operation.schema:
+        table = f"{preparer.quote_schema(operation.schema)}.{table}"
+    column = preparer.quote(operation.column_name)
+    constraint = preparer.quote(f"{operation.table_name}_{operation.column_name}_not_null"[:63])
+    # Каждый шаг фиксируется отдельно: ACCESS EXCLUSIVE берётся ненадолго и без сканирования,
+    # а VALIDATE проверяет строки под SHARE UPDATE EXCLUSIVE, не блокируя запись
+    with operations.get_context().autocommit_block():
+        operations.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+        operations.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+        # С проверенным CHECK PostgreSQL 12+ не сканирует таблицу повторно
+        operations.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+        operations.execute(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}")
+
+
+@renderers.dispatch_for(CreateIndexConcurrentlyOp)
+def _render_create_index(autogen_context: Any, operation: CreateIndexConcurrentlyOp) -> str:
+    args = [repr(operation.index_name), repr(operation.table_name), repr(operation.columns)]
+    if operation.unique:
+        args.append("unique=True")
+    if operation.schema:
+        args.append(f"schema={operation.schema!r}")
+    return f"op.create_index_concurrently({', '.join(args)})"
+
+
+@renderers.dispatch_for(DropIndexConcurrentlyOp)
+def _render_drop_index(autogen_context: Any, operation: DropIndexConcurrentlyOp) -> str:
+    args = [repr(operation.index_name), repr(operation.table_name)]
+    if operation.schema:
+        args.append(f"schema={operation.schema!r}")
+    return f"op.drop_index_concurrently({', '.join(args)})"
+
+
+@renderers.dispatch_for(BackfillOp)
+def _render_backfill(autogen_context: Any, operation: BackfillOp) -> str:
+    args = [repr(operation.table_name), repr(operation.column_name), repr(operation.expression)]
+    args.append(f"batch_size={operation.batch_size}")
+    if operation.key != "id":
+        args.append(f"key={operation.key!r}")
+    if operation.schema:
+        args.append(f"schema={operation.schema!r}")
+    return f"op.backfill({', '.join(args)})"
+
+
+@renderers.dispatch_for(SetNotNullOp)
+def _render_set_not_null(autogen_context: Any, operation: SetNotNullOp) -> str:
+    args = [repr(operation.table_name), repr(operation.column_name)]
+    if operation.schema:
+        args.append(f"schema={operation.schema!r}")
+    return f"op.set_not_null({', '.join(args)})"
+
+
+def _concurrent_indexes(operations: list[Any], skip_tables: set[str]) -> list[Any]:
+    """Заменить операции с индексами существующих таблиц на неблокирующие."""
+    result: list[Any] = []
+    for operation in operations:
+        if isinstance(operation, ops.ModifyTableOps):
+            operation.ops = _concurrent_indexes(operation.ops, skip_tables)
+        elif (
+            isinstance(operation, ops.CreateIndexOp)
+            and operation.table_name not in skip_tables
+            and not operation.kw
+        ):
+            columns = _column_names(operation.columns)
+            if columns is not None:
+                operation = CreateIndexConcurrentlyOp(
+                    operation.index_name, operation.table_name, columns,
+                    unique=bool(operation.unique), schema=operation.schema,
+                )
+        elif isinstance(operation, ops.DropIndexOp) and operation.table_name not in skip_tables and not operation.kw:
+            operation = DropIndexConcurrentlyOp(operation.index_name, operation.table_name, schema=operation.schema)
+        result.append(operation)
+    return result
+
+
+def _tables(operations: list[Any], kind: type) -> set[str]:
+    return {operation.table_name for operation in operations if isinstance(operation, kind)}
+
+
+def _insert_backfill(
+    upgrade_ops: ops.UpgradeOps,
+    table_name: str,
+    column_name: str,
+    expression: str,
+    batch_size: int,
+    postgres: bool,
+) -> None:
+    """Вставить BackfillOp после добавления столбца; NOT NULL устанавливается после заполнения."""
+    backfill_ops: list[Any] = [BackfillOp(table_name, column_name, expression, batch_size=batch_size)]
+    for position, operation in enumerate(upgrade_ops.ops):
+        nested = operation.ops if isinstance(operation, ops.ModifyTableOps) else [operation]
+        added = next(
+            (
+                item for item in nested
+                if isinstance(item, ops.AddColumnOp)
+                and item.table_name == table_name
+                and item.column.name == column_name
+            ),
+            None,
+        )
+        if added is None:
+            continue
+        # Индексы по столбцу строим после заполнения: один проход вместо обновления на каждой пачке
+        indexes = [
+            item for item in nested
+            if isinstance(item, (ops.CreateIndexOp, CreateIndexConcurrentlyOp))
+            and item.table_name == table_name
+            and column_name in (_column_names(item.columns) or ())
+        ]
+        for index in indexes:
+            nested.remove(index)
+        if added.column.nullable is False and postgres:
+            added.column.nullable = True
+            backfill_ops.append(SetNotNullOp(table_name, column_name, schema=added.schema))
+        elif added.column.nullable is False:
+            added.column.nullable = True
+            alter = ops.AlterColumnOp(
+                table_name, column_name, modify_nullable=False,
+                existing_type=added.column.type, schema=added.schema,
+            )
+            # В ModifyTableOps, чтобы на SQLite изменение попало в batch_alter_table
+            backfill_ops.append(ops.ModifyTableOps(table_name, [alter], schema=added.schema))
+        backfill_ops.extend(indexes)
+        upgrade_ops.ops[position + 1 : position + 1] = backfill_ops
+        return
+    upgrade_ops.ops.extend(backfill_ops)
+
+
+def rewrite_revision(context: Any, revision: Any, directives: list[Any]) -> None:
+    """Хук process_revision_directives для env.py."""
+    script = directives[0]
+    attributes = context.config.attributes
+    postgres = context.dialect is not None and context.dialect.name == "postgresql"
+    for upgrade_ops in script.upgrade_ops_list:
+        if postgres:
+            created = _tables(upgrade_ops.ops, ops.CreateTableOp)
+            upgrade_ops.ops = _concurrent_indexes(upgrade_ops.ops, created)
+        for table_name, column_name, expression in attributes.get("backfills", []):
+            _insert_backfill(
+                upgrade_ops, table_name, column_name, expression,
+                attributes.get("backfill_batch_size", BACKFILL_BATCH_SIZE),
+                postgres,
+            )
+    if postgres:
+        for downgrade_ops in script.downgrade_ops_list:
+            dropped = _tables(downgrade_ops.ops, ops.DropTableOp)
+            downgrade_ops.ops = _concurrent_indexes(downgrade_ops.ops, dropped)
+'''
+
+_BACKFILL_SPEC = re.compile(r"^(\w+)\.(\w+)=(.+)$")
+
+
+@register_template("migration/alembic.ini")
+def render_alembic_ini() -> str:
+    """Вернуть конфигурацию Alembic."""
+    return ALEMBIC_INI_TEMPLATE
+
+
+@register_template("migration/env.py")
+def render_migration_env() -> str:
+    """Вернуть окружение Alembic, подключённое к database.Base."""
+    return ENV_TEMPLATE
+
+
+@register_template("migration/script.py.mako")
+def render_migration_script() -> str:
+    """Вернуть шаблон файла ревизии."""
+    return SCRIPT_MAKO_TEMPLATE
+
+
+@register_template("migration/operations.py")
+def render_migration_operations() -> str:
+    """Вернуть неблокирующие операции миграций."""
+    return OPERATIONS_TEMPLATE
+
+
+# Файлы каркаса миграций: путь относительно проекта -> функция шаблона
+SCAFFOLD_FILES = {
+    "alembic.ini": render_alembic_ini,
+    "migrations/env.py": render_migration_env,
+    "migrations/script.py.mako": render_migration_script,
+    "migrations/operations.py": render_migration_operations,
+}
+
+
+def parse_backfill(spec: str) -> tuple[str, str, str]:
+    """Разобрать --backfill "table.column=SQL-выражение"."""
+    match = _BACKFILL_SPEC.match(spec.strip())
+    if match is None:
+        raise ValueError(f"Некорректный --backfill: {spec}. Формат: таблица.столбец=SQL-выражение")
+    table_name, column_name, expression = match.groups()
+    return table_name, column_name, expression.strip()
+
+
+def scaffold_migrations() -> bool:
+    """Создать каркас Alembic, если его ещё нет; вернуть True, если что-то создано."""
+    created = False
+    ensure_directory(BASE_DIR / "migrations" / "versions")
+    for relative_path, render in SCAFFOLD_FILES.items():
+        file_path = BASE_DIR / relative_path
+        if file_path.exists():
+            continue
+        write_generated_file(file_path, render())
+        typer.echo(f"✅ Файл {relative_path} создан")
+        created = True
+    return created
+
+
+def make_migration(
+    message: str = typer.Argument(..., help="Описание ревизии, например \"add user email\"."),
+    empty: bool = typer.Option(
+        False,
+        "--empty",
+        help="Создать пустую ревизию без автогенерации.",
+        is_flag=True,
+    ),
+    backfill: Optional[list[str]] = typer.Option(
+        None,
+        "--backfill",
+        "-b",
+        help="Заполнить столбец пачками: \"таблица.столбец=SQL-выражение\". Можно указать несколько раз.",
+    ),
+    batch_size: int = typer.Option(10_000, "--batch-size", help="Размер пачки для --backfill."),
+) -> None:
+    """Создать ревизию Alembic по изменениям моделей (каркас migrations/ создаётся при первом запуске)."""
+    try:
+        backfills = [parse_backfill(spec) for spec in backfill or []]
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
+    try:
+        from alembic import command
+        from alembic.config import Config
+        from alembic.util import CommandError
+    except ImportError:
+        typer.echo("❌ Alembic не установлен: pip install alembic")
+        raise typer.Exit(code=1)
+
+    if scaffold_migrations():
+        typer.echo("ℹ️ Каркас миграций создан: alembic.ini и migrations/")
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.attributes["backfills"] = backfills
+    config.attributes["backfill_batch_size"] = batch_size
+    if backfills:
+        # Без автогенерации Alembic не запускает env.py, а шаги backfill добавляет именно он
+        config.set_main_option("revision_environment", "true")
+    try:
+        scripts = command.revision(config, message=message, autogenerate=not empty)
+    except CommandError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
+    for script in scripts if isinstance(scripts, list) else [scripts]:
+        if script is not None:
+            typer.echo(f"✅ Ревизия {script.revision} создана: {script.path}")
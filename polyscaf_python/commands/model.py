@@ -1,18 +1,446 @@
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    is_async_project,
     pluralize,
     update_init_exports,
+    write_generated_file,
+)
+
+# Тип поля -> (выражение типа SQLAlchemy, тип Python, параметры по умолчанию)
+COLUMN_TYPES: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    "str": ("String({0})", "str", ("255",)),
+    "text": ("Text", "str", ()),
+    "int": ("Integer", "int", ()),
+    "bigint": ("BigInteger", "int", ()),
+    "float": ("Float", "float", ()),
+    "bool": ("Boolean", "bool", ()),
+    "decimal": ("Numeric({0}, {1})", "Decimal", ("12", "2")),
+    "date": ("Date", "date", ()),
+    "datetime": ("DateTime(timezone=True)", "datetime", ()),
+    "json": ("JSON", "dict", ()),
+    "uuid": ("Uuid", "uuid.UUID", ()),
+}
+
+LAZY_STRATEGIES = (
+    "select",
+    "selectin",
+    "joined",
+    "subquery",
+    "immediate",
+    "raise",
+    "raise_on_sql",
+    "noload",
+    "write_only",
+)
+
+ON_DELETE_ACTIONS = ("CASCADE", "SET NULL", "RESTRICT", "NO ACTION")
+
+# Поле модели по умолчанию, если --field не задан
+DEFAULT_FIELDS = ["name:str(255) index"]
+
+# Справка --field для команд, которые генерируют код по полям модели
+FIELD_HELP = (
+    "Поле в формате make-model: \"имя:тип [модификаторы]\", например \"title:str(120)\". "
+    "По умолчанию поля читаются из models/<name>_model.py."
 )
 
+_TYPE_PATTERN = re.compile(r"^(\w+)(?:\((.*)\))?$")
+_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+@dataclass
+class FieldSpec:
+    """Разобранное описание поля модели из --field."""
+
+    name: str
+    kind: str  # column, fk или many
+    sa_type: str = ""
+    py_type: str = ""
+    target: str = ""
+    nullable: bool = False
+    unique: bool = False
+    index: bool = False
+    default: Optional[str] = None
+    lazy: Optional[str] = None
+    ondelete: Optional[str] = None
+    back: Optional[str] = None
+
+    @property
+    def column_name(self) -> Optional[str]:
+        """Имя колонки в таблице (None для коллекций many)."""
+        if self.kind == "fk":
+            return f"{self.name}_id"
+        if self.kind == "many":
+            return None
+        return self.name
+
+
+def table_name(name: str) -> str:
+    """Вернуть имя таблицы модели: snake_case во множественном числе."""
+    return pluralize(camel_to_snake(name).lower())
+
+
+def parse_field(spec: str) -> FieldSpec:
+    """Разобрать описание поля вида "имя:тип[(параметры)] [модификаторы]".
+
+    Типы: str(N), text, int, bigint, float, bool, decimal(P,S), date,
+    datetime, json, uuid, fk(Model) — внешний ключ со связью, many(Model) —
+    коллекция. Модификаторы: null, unique, index, default=<литерал>,
+    lazy=<стратегия загрузки>, ondelete=<действие>, back=<поле> — обратная
+    связь на другой стороне (back_populates).
+    """
+    head, *modifiers = spec.split()
+    name, separator, type_spec = head.partition(":")
+    if not separator or not _NAME_PATTERN.match(name):
+        raise ValueError(f"Неверное описание поля «{spec}»: ожидается имя:тип в snake_case")
+    match = _TYPE_PATTERN.match(type_spec)
+    if not match:
+        raise ValueError(f"Неверный тип поля {name}: {type_spec}")
+    type_name, raw_args = match.group(1).lower(), match.group(2)
+    args = [arg.strip() for arg in raw_args.split(",")] if raw_args else []
+
+    if type_name in ("fk", "many"):
+        if len(args) != 1 or not args[0][:1].isupper():
+            raise ValueError(f"Поле {name}: укажите модель в CamelCase, например {type_name}(User)")
+        field = FieldSpec(name=name, kind=type_name, target=args[0])
+    elif type_name in COLUMN_TYPES:
+        expression, py_type, defaults = COLUMN_TYPES[type_name]
+        if len(args) > len(defaults) or not all(arg.isdigit() for arg in args):
+            raise ValueError(f"Поле {name}: неверные параметры типа {type_name}({raw_args})")
+        values = args + list(defaults[len(args):])
+        field = FieldSpec(name=name, kind="column", sa_type=expression.format(*values), py_type=py_type)
+    else:
+        raise ValueError(
+            f"Поле {name}: неизвестный тип {type_name}. "
+            f"Доступны: {', '.join([*COLUMN_TYPES, 'fk', 'many'])}"
+        )
+
+    for modifier in modifiers:
+        key, _, value = modifier.partition("=")
+        if key in ("null", "nullable") and not value:
+            field.nullable = True
+        elif key in ("unique", "index") and not value:
+            setattr(field, key, True)
+        elif key == "default" and value:
+            try:
+                field.default = repr(ast.literal_eval(value))
+            except (ValueError, SyntaxError):
+                raise ValueError(f"Поле {name}: default должен быть литералом Python, получено {value}")
+        elif key == "lazy" and value:
+            if value not in LAZY_STRATEGIES:
+                raise ValueError(
+                    f"Поле {name}: неизвестная стратегия загрузки {value}. "
+                    f"Доступны: {', '.join(LAZY_STRATEGIES)}"
+                )
+            field.lazy = value
+        elif key == "back" and _NAME_PATTERN.match(value):
+            field.back = value
+        elif key == "ondelete" and value:
+            action = value.replace("_", " ").upper()
+            if action not in ON_DELETE_ACTIONS:
+                raise ValueError(f"Поле {name}: ondelete должен быть одним из {', '.join(ON_DELETE_ACTIONS)}")
+            field.ondelete = action
+        else:
+            raise ValueError(f"Поле {name}: неизвестный модификатор {modifier}")
+
+    if field.kind != "fk" and field.ondelete:
+        raise ValueError(f"Поле {name}: ondelete допустим только для fk")
+    if field.kind == "column" and (field.lazy or field.back):
+        raise ValueError(f"Поле {name}: lazy и back допустимы только для fk и many")
+    if field.kind == "many" and (field.nullable or field.unique or field.index or field.default):
+        raise ValueError(f"Поле {name}: у коллекции many допустим только модификатор lazy")
+    return field
+
+
+def parse_index(spec: str, columns: list[str]) -> list[str]:
+    """Разобрать составной индекс "колонка1,колонка2" и проверить колонки."""
+    index_columns = [column.strip() for column in spec.split(",") if column.strip()]
+    if not index_columns:
+        raise ValueError("Пустое описание индекса")
+    unknown = [column for column in index_columns if column not in columns]
+    if unknown:
+        raise ValueError(f"Индекс {spec}: нет колонок {', '.join(unknown)}. Доступны: {', '.join(columns)}")
+    return index_columns
+
+
+def _render_field(field: FieldSpec, default_lazy: str, indexed: frozenset[str] = frozenset()) -> list[str]:
+    """Вернуть строки объявления поля в теле класса модели.
+
+    indexed — первые колонки составных индексов: внешнему ключу из их числа
+    отдельный индекс не нужен.
+    """
+    def typed(py_type: str) -> str:
+        return f"Optional[{py_type}]" if field.nullable else py_type
+
+    options = []
+    if field.nullable:
+        options.append("nullable=True")
+    if field.unique:
+        options.append("unique=True")
+    if field.default is not None:
+        options.append(f"default={field.default}")
+
+    if field.kind == "column":
+        if field.index:
+            options.append("index=True")
+        arguments = ", ".join([field.sa_type, *options])
+        return [f"    {field.name}: Mapped[{typed(field.py_type)}] = mapped_column({arguments})"]
+
+    relationship_options = [f"lazy=\"{field.lazy or default_lazy}\""]
+    if field.back:
+        relationship_options.append(f"back_populates=\"{field.back}\"")
+    if field.kind == "many":
+        return [
+            f"    {field.name}: Mapped[list[\"{field.target}\"]] = relationship({', '.join(relationship_options)})"
+        ]
+
+    foreign_key = f"\"{table_name(field.target)}.id\""
+    if field.ondelete:
+        foreign_key += f", ondelete=\"{field.ondelete}\""
+    column_name = field.column_name
+    # PostgreSQL и SQLite не индексируют внешние ключи автоматически; составной
+    # индекс, начинающийся с колонки ключа, уже покрывает поиск по ней
+    if column_name not in indexed:
+        options.append("index=True")
+    arguments = ", ".join([f"ForeignKey({foreign_key})", *options])
+    target_type = typed(f"\"{field.target}\"")
+    return [
+        f"    {column_name}: Mapped[{typed('int')}] = mapped_column({arguments})",
+        f"    {field.name}: Mapped[{target_type}] = relationship("
+        f"foreign_keys=[{column_name}], {', '.join(relationship_options)})",
+    ]
 
-def make_model(name: str) -> None:
+
+def _column_type(expression: str) -> Optional[str]:
+    """Тип поля --field по выражению типа SQLAlchemy, например String(120) -> str(120)."""
+    for type_name, (pattern, _, _) in COLUMN_TYPES.items():
+        regex = re.escape(pattern).replace(r"\{0\}", r"(\d+)").replace(r"\{1\}", r"(\d+)")
+        match = re.fullmatch(regex, expression)
+        if match:
+            return f"{type_name}({','.join(match.groups())})" if match.groups() else type_name
+    return None
+
+
+def _keywords(call: ast.Call) -> dict[str, ast.expr]:
+    return {keyword.arg: keyword.value for keyword in call.keywords if keyword.arg}
+
+
+def _is_true(node: Optional[ast.expr]) -> bool:
+    return isinstance(node, ast.Constant) and node.value is True
+
+
+def _string(node: Optional[ast.expr]) -> Optional[str]:
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def _column_modifiers(keywords: dict[str, ast.expr], *, with_index: bool) -> list[str]:
+    modifiers = []
+    if _is_true(keywords.get("nullable")):
+        modifiers.append("null")
+    if _is_true(keywords.get("unique")):
+        modifiers.append("unique")
+    if with_index and _is_true(keywords.get("index")):
+        modifiers.append("index")
+    if "default" in keywords:
+        modifiers.append(f"default={ast.unparse(keywords['default'])}")
+    return modifiers
+
+
+def _relationship_target(annotation: ast.expr) -> tuple[Optional[str], bool]:
+    """Модель связи из аннотации Mapped[...] и признак коллекции list[...]."""
+    text = ast.unparse(annotation).replace("'", "\"")
+    match = re.fullmatch(r'Mapped\[(list\[|Optional\[)?"(\w+)"\]?\]', text)
+    if not match:
+        return None, False
+    return match.group(2), match.group(1) == "list["
+
+
+def model_fields(name: str, base_dir: Optional[Path] = None) -> Optional[list[str]]:
+    """Прочитать поля модели из models/<name>_model.py обратно в формат --field.
+
+    Так make-schema, make-factory, make-seed и make-service без --field
+    видят те же поля, что и make-model. Колонки, которые не описываются
+    через --field (ручные правки), пропускаются. None — модели нет.
+    """
+    model_file = (base_dir or BASE_DIR) / "models" / f"{camel_to_snake(name)}_model.py"
+    if not model_file.exists():
+        return None
+    try:
+        tree = ast.parse(model_file.read_text())
+    except SyntaxError:
+        return None
+    body = next(
+        (node.body for node in tree.body if isinstance(node, ast.ClassDef) and node.name == name),
+        None,
+    )
+    if body is None:
+        return None
+
+    # Имя колонки или связи -> [описание поля, модификаторы]; порядок — как в модели
+    fields: dict[str, list] = {}
+    foreign_keys: dict[str, tuple[str, list[str]]] = {}
+    for node in body:
+        if not (
+            isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+        ):
+            continue
+        attribute, call, keywords = node.target.id, node.value, _keywords(node.value)
+        if attribute in ("id", "created_at", "updated_at"):
+            continue
+        if call.func.id == "mapped_column" and call.args:
+            first = call.args[0]
+            if isinstance(first, ast.Call) and ast.unparse(first.func) == "ForeignKey":
+                modifiers = _column_modifiers(keywords, with_index=False)
+                ondelete = _string(_keywords(first).get("ondelete"))
+                if ondelete:
+                    modifiers.append(f"ondelete={ondelete.lower().replace(' ', '_')}")
+                foreign_keys[attribute] = (attribute, modifiers)
+                fields[attribute] = []
+                continue
+            type_spec = _column_type(ast.unparse(first))
+            if type_spec:
+                fields[attribute] = [f"{attribute}:{type_spec}", *_column_modifiers(keywords, with_index=True)]
+        elif call.func.id == "relationship":
+            target, many = _relationship_target(node.annotation)
+            if target is None:
+                continue
+            modifiers = []
+            lazy = _string(keywords.get("lazy"))
+            if lazy:
+                modifiers.append(f"lazy={lazy}")
+            back = _string(keywords.get("back_populates"))
+            if back:
+                modifiers.append(f"back={back}")
+            if many:
+                fields[attribute] = [f"{attribute}:many({target})", *modifiers]
+                continue
+            foreign_key = keywords.get("foreign_keys")
+            if isinstance(foreign_key, ast.List) and len(foreign_key.elts) == 1:
+                column_name = ast.unparse(foreign_key.elts[0])
+            else:
+                column_name = f"{attribute}_id"
+            if column_name in foreign_keys:
+                column_modifiers = foreign_keys.pop(column_name)[1]
+                fields[column_name] = [f"{attribute}:fk({target})", *column_modifiers, *modifiers]
+    return [" ".join(spec) for spec in fields.values() if spec]
+
+
+@register_template("model", variants=("use_async",))
+def render_model(
+    name: str,
+    fields: Optional[list[str]] = None,
+    indexes: Optional[list[str]] = None,
+    *,
+    use_async: bool = True,
+) -> str:
+    """Вернуть исходный код модели SQLAlchemy.
+
+    Связи без явного lazy в асинхронных проектах получают lazy="raise":
+    неявная ленивая загрузка там всё равно невозможна, а явная ошибка
+    заставляет выбрать selectinload/joinedload в запросе.
+    """
+    specs = [parse_field(spec) for spec in (fields or DEFAULT_FIELDS)]
+    names = [spec.name for spec in specs]
+    duplicates = sorted({field_name for field_name in names if names.count(field_name) > 1})
+    reserved = sorted(set(names) & {"id", "created_at", "updated_at"})
+    if duplicates or reserved:
+        raise ValueError(f"Поля повторяются или зарезервированы: {', '.join(duplicates + reserved)}")
+
+    table = table_name(name)
+    columns = ["id", *(spec.column_name for spec in specs if spec.column_name), "created_at", "updated_at"]
+    composite_indexes = [parse_index(spec, columns) for spec in indexes or []]
+    default_lazy = "raise" if use_async else "select"
+    indexed = frozenset(index_columns[0] for index_columns in composite_indexes)
+
+    sqlalchemy_names = {"DateTime", "func"}
+    for spec in specs:
+        if spec.kind == "column":
+            sqlalchemy_names.add(spec.sa_type.split("(")[0])
+        elif spec.kind == "fk":
+            sqlalchemy_names.add("ForeignKey")
+    if composite_indexes:
+        sqlalchemy_names.add("Index")
+    py_types = {spec.py_type for spec in specs}
+    targets = sorted({spec.target for spec in specs if spec.target and spec.target != name})
+
+    header = ["from datetime import date, datetime" if "date" in py_types else "from datetime import datetime"]
+    if "Decimal" in py_types:
+        header.append("from decimal import Decimal")
+    header.append("from typing import TYPE_CHECKING, Optional" if targets else "from typing import Optional")
+    if "uuid.UUID" in py_types:
+        header.append("import uuid")
+    lines = [
+        *header,
+        "",
+        "from database import Base",
+        f"from sqlalchemy import {', '.join(sorted(sqlalchemy_names))}",
+        "from sqlalchemy.orm import Mapped, mapped_column, relationship",
+        "",
+    ]
+    if targets:
+        lines.append("if TYPE_CHECKING:")
+        lines.extend(f"    from models.{camel_to_snake(target)}_model import {target}" for target in targets)
+        lines.append("")
+
+    lines.append(f"class {name}(Base):")
+    lines.append(f"    __tablename__ = '{table}'")
+    if composite_indexes:
+        lines.append("    __table_args__ = (")
+        for index_columns in composite_indexes:
+            quoted = ", ".join(f"\"{column}\"" for column in index_columns)
+            lines.append(f"        Index(\"ix_{table}_{'_'.join(index_columns)}\", {quoted}),")
+        lines.append("    )")
+    lines.append("")
+    lines.append("    id: Mapped[int] = mapped_column(primary_key=True)")
+    for spec in specs:
+        lines.extend(_render_field(spec, default_lazy, indexed))
+    lines.append(
+        "    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())"
+    )
+    lines.append(
+        "    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), nullable=True)"
+    )
+    return "\n".join(lines) + "\n"
+
+
+def make_model(
+    name: str,
+    fields: Optional[list[str]] = typer.Option(
+        None,
+        "--field",
+        "-f",
+        help="Поле: \"имя:тип [модификаторы]\", например \"user:fk(User) lazy=selectin\" или \"title:str(120) index\".",
+    ),
+    indexes: Optional[list[str]] = typer.Option(
+        None,
+        "--index",
+        "-i",
+        help="Составной индекс по колонкам через запятую, например \"user_id,created_at\".",
+    ),
+) -> None:
     """Сгенерировать файл модели SQLAlchemy."""
+    try:
+        content = render_model(name, fields, indexes, use_async=is_async_project())
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
     path = BASE_DIR / "models"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -20,20 +448,6 @@ def make_model(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    table_name = camel_to_snake(name)
-
-    file_path.write_text(
-        "from datetime import datetime\n"
-        "from typing import Optional\n\n"
-        "from database import Base\n"
-        "from sqlalchemy import DateTime, String, func\n"
-        "from sqlalchemy.orm import Mapped, mapped_column, relationship\n\n"
-        f"class {name}(Base):\n"
-        f"    __tablename__ = '{pluralize(table_name.lower())}'\n\n"
-        f"    id: Mapped[int] = mapped_column(primary_key=True, index=True)\n"
-        f"    name: Mapped[str] = mapped_column(String, index=True)\n"
-        f"    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())\n"
-        f"    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now(), nullable=True)\n"
-    )
+    write_generated_file(file_path, content)
     update_init_exports(path, f"{snake_name}_model", name)
     typer.echo(f"✅ Модель {name} создана")
@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.utils import (
+    camel_to_snake,
+    create_folder_with_init,
+    create_git_ignore,
+    has_read_replicas,
+    is_async_project,
+    update_init_exports_many,
+    write_generated_file,
+)
+
+from .bench import render_bench
+from .factory import render_factory
+from .model import FIELD_HELP, render_model
+from .route import ROUTE_TEMPLATES, render_route
+from .schema import SCHEMA_EXPORTS, render_schema
+from .service import SERVICE_TEMPLATES, render_service
+from .test import CONFTEST, render_conftest, render_test
+
+Export = tuple[str, str, Optional[str]]
+
+# Части ресурса: папка, шаблон имени файла, функция шаблона и экспорты в __init__.py
+# (модуль, символ, алиас); пустой кортеж, если файл не экспортируется.
+RESOURCE_PARTS: dict[str, tuple[str, str, Callable[..., str], tuple[Export, ...]]] = {
+    "model": ("models", "{snake}_model.py", render_model, (("{snake}_model", "{name}", None),)),
+    "schema": (
+        "schemas",
+        "{snake}_schema.py",
+        render_schema,
+        tuple(("{snake}_schema", symbol, None) for symbol in SCHEMA_EXPORTS),
+    ),
+    "service": ("service", "{snake}_service.py", render_service, (("{snake}_service", "{name}Service", None),)),
+    "route": ("routes", "{snake}_route.py", render_route, (("{snake}_route", "router", "{name}Router"),)),
+    "factory": ("database/factories", "{snake}_factory.py", render_factory, ()),
+    "test": ("tests", "test_{snake}.py", render_test, ()),
+    "bench": ("benchmarks", "bench_{snake}.py", render_bench, ()),
+}
+
+# Части по умолчанию; нагрузочный тест добавляется явно (--bench или artifacts манифеста)
+DEFAULT_PARTS = tuple(part for part in RESOURCE_PARTS if part != "bench")
+
+ResourcePlan = tuple[dict[Path, str], dict[Path, list[Export]]]
+
+
+def resource_options(
+    *,
+    use_async: bool,
+    read_replicas: bool = False,
+    service_template: str = "basic",
+    route_template: str = "basic",
+    fields: Optional[list[str]] = None,
+    indexes: Optional[list[str]] = None,
+) -> dict[str, dict[str, Any]]:
+    """Вернуть параметры шаблонов частей ресурса для режима проекта."""
+    if service_template not in SERVICE_TEMPLATES:
+        raise ValueError(
+            f"Неизвестный шаблон сервиса: {service_template}. Доступны: {', '.join(SERVICE_TEMPLATES)}"
+        )
+    if route_template not in ROUTE_TEMPLATES:
+        raise ValueError(
+            f"Неизвестный шаблон роутов: {route_template}. Доступны: {', '.join(ROUTE_TEMPLATES)}"
+        )
+    if route_template == "stream" and service_template != "bulk":
+        raise ValueError("Шаблон роутов stream требует шаблон сервиса bulk")
+    return {
+        "model": {"fields": fields, "indexes": indexes, "use_async": use_async},
+        "schema": {"fields": fields},
+        "service": {
+            "use_async": use_async,
+            "template": service_template,
+            "read_replicas": read_replicas,
+            "fields": fields,
+        },
+        "route": {"use_async": use_async, "template": route_template, "read_replicas": read_replicas},
+        "factory": {"use_async": use_async, "fields": fields},
+        # У синхронного шаблона basic нет эндпоинтов: тест проверяет только фабрику
+        "test": {"api": use_async or route_template == "stream"},
+        "conftest": {"use_async": use_async},
+    }
+
+
+def plan_resources(
+    names: list[str],
+    parts: Optional[list[str]] = None,
+    *,
+    base_dir: Optional[Path] = None,
+    options: Optional[dict[str, dict[str, Any]]] = None,
+) -> ResourcePlan:
+    """Спланировать файлы и экспорты ресурсов без записи на диск.
+
+    options задаёт именованные параметры шаблона для каждой части ресурса;
+    по умолчанию режим (sync/async) и наличие реплик определяются по
+    database/database.py. Вместе с тестами планируется общий tests/conftest.py.
+    """
+    root = base_dir or BASE_DIR
+    if options is None:
+        options = resource_options(use_async=is_async_project(root), read_replicas=has_read_replicas(root))
+    files: dict[Path, str] = {}
+    exports: dict[Path, list[Export]] = {}
+    for name in names:
+        snake_name = camel_to_snake(name)
+        for part in parts or DEFAULT_PARTS:
+            folder, file_template, render, part_exports = RESOURCE_PARTS[part]
+            directory = root / folder
+            files[directory / file_template.format(snake=snake_name)] = render(name, **options.get(part, {}))
+            exports.setdefault(directory, [])
+            for module, symbol, alias in part_exports:
+                exports[directory].append(
+                    (
+                        module.format(snake=snake_name),
+                        symbol.format(name=name, snake=snake_name),
+                        alias.format(name=name) if alias else None,
+                    )
+                )
+    if parts is None or "test" in parts:
+        conftest_options = options.get("conftest", {"use_async": is_async_project(root)})
+        files[root / RESOURCE_PARTS["test"][0] / CONFTEST] = render_conftest(**conftest_options)
+    return files, exports
+
+
+def make_resources(
+    names: list[str] = typer.Argument(..., help="Имена ресурсов в CamelCase."),
+    service_template: str = typer.Option(
+        "basic",
+        "--service-template",
+        help="Шаблон сервисов: basic или bulk.",
+    ),
+    route_template: str = typer.Option(
+        "basic",
+        "--route-template",
+        help="Шаблон роутов: basic или stream (требует --service-template bulk).",
+    ),
+    fields: Optional[list[str]] = typer.Option(None, "--field", "-f", help=FIELD_HELP),
+    bench: bool = typer.Option(False, "--bench", help="Добавить нагрузочный тест benchmarks/bench_<name>.py."),
+) -> None:
+    """Сгенерировать модель, схему, сервис, роут, фабрику и тест для нескольких ресурсов."""
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        typer.echo(f"❌ Имена повторяются: {', '.join(duplicates)}")
+        raise typer.Exit(code=1)
+
+    try:
+        options = resource_options(
+            use_async=is_async_project(),
+            read_replicas=has_read_replicas(),
+            service_template=service_template,
+            route_template=route_template,
+            fields=fields,
+        )
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
+    parts = [*DEFAULT_PARTS, "bench"] if bench else None
+    files, exports = plan_resources(names, parts, options=options)
+    # Общие фикстуры создаются один раз и не мешают добавлять новые ресурсы
+    conftest = BASE_DIR / RESOURCE_PARTS["test"][0] / CONFTEST
+    if conftest.exists():
+        del files[conftest]
+    existing = [file_path for file_path in files if file_path.exists()]
+    if existing:
+        for file_path in existing:
+            typer.echo(f"❌ Файл уже существует: {file_path}")
+        raise typer.Exit()
+
+    for directory in exports:
+        create_folder_with_init(directory)
+        create_git_ignore(directory)
+    for file_path, content in files.items():
+        write_generated_file(file_path, content)
+    for directory, directory_exports in exports.items():
+        if directory_exports:
+            update_init_exports_many(directory, directory_exports)
+
+    typer.echo(f"✅ Ресурсы созданы: {', '.join(names)} ({len(files)} файлов)")
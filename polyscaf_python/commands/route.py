@@ -1,17 +1,185 @@
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    has_read_replicas,
+    is_async_project,
     update_init_exports,
+    write_generated_file,
 )
 
 
-def make_route(name: str) -> None:
+ROUTE_TEMPLATES = ("basic", "stream")
+
+
+def _render_service_dependency(name: str, snake_name: str, adef: str, session_class: str, read_replicas: bool) -> str:
+    """Зависимость, создающая сервис; с репликами сервис получает ещё сессию для чтения."""
+    if not read_replicas:
+        return (
+            f"{adef} get_{snake_name}_service(db: {session_class} = Depends(get_db)):\n"
+            f"    return {name}Service(db)\n\n"
+        )
+    return (
+        f"{adef} get_{snake_name}_service(\n"
+        f"    db: {session_class} = Depends(get_db), read_db: {session_class} = Depends(get_read_db)\n"
+        "):\n"
+        f"    return {name}Service(db, read_db)\n\n"
+    )
+
+
+def _render_stream_route(name: str, snake_name: str, use_async: bool, read_replicas: bool) -> str:
+    """Роуты с keyset-пагинацией списка и NDJSON-экспортом через StreamingResponse.
+
+    Опирается на методы list_after_id и stream_all сервиса из шаблона bulk.
+    """
+    adef = "async def" if use_async else "def"
+    aw = "await " if use_async else ""
+    # Экспорт только читает: с репликами его сессия открывается на реплике
+    session_factory = "read_session" if read_replicas else "SessionLocal"
+    if use_async:
+        session_import = "from sqlalchemy.ext.asyncio import AsyncSession\n\n"
+        session_class = "AsyncSession"
+        export_body = (
+            "    async def lines():\n"
+            "        # Отдельная сессия: зависимость get_db может закрыться раньше окончания стрима\n"
+            f"        async with {session_factory}() as db:\n"
+            f"            async for item in {name}Service(db).stream_all():\n"
+            "                yield _dump_line(item)\n\n"
+        )
+    else:
+        session_import = "from sqlalchemy.orm import Session\n\n"
+        session_class = "Session"
+        export_body = (
+            "    def lines():\n"
+            "        # Отдельная сессия: зависимость get_db может закрыться раньше окончания стрима\n"
+            f"        with {session_factory}() as db:\n"
+            f"            for item in {name}Service(db).stream_all():\n"
+            "                yield _dump_line(item)\n\n"
+        )
+    return (
+        "from typing import Optional\n\n"
+        "from fastapi import APIRouter, Depends, HTTPException, Query\n"
+        "from fastapi.responses import JSONResponse, Response, StreamingResponse\n"
+        "from pydantic import BaseModel\n"
+        + session_import
+        + (
+            "from database import get_db, get_read_db, read_session\n"
+            if read_replicas
+            else "from database import SessionLocal, get_db\n"
+        )
+        + f"from schemas.{snake_name}_schema import {name}Read\n"
+        f"from service.{snake_name}_service import {name}Service\n\n"
+        "try:\n"
+        "    import orjson  # noqa: F401 — нужен ORJSONResponse\n"
+        "    from fastapi.responses import ORJSONResponse\n"
+        "except ImportError:  # orjson не установлен — стандартный json\n"
+        "    ORJSONResponse = None\n\n"
+        "# Новые версии FastAPI сами сериализуют response_model через Pydantic сразу в байты\n"
+        "# и помечают ORJSONResponse устаревшим; на старых версиях ORJSONResponse быстрее\n"
+        "if ORJSONResponse is not None and not hasattr(ORJSONResponse, \"__deprecated__\"):\n"
+        "    DefaultResponse = ORJSONResponse\n"
+        "else:\n"
+        "    DefaultResponse = JSONResponse\n\n"
+        "router = APIRouter(default_response_class=DefaultResponse)\n\n"
+        f"class {name}Page(BaseModel):\n"
+        f"    items: list[{name}Read]\n"
+        "    next_after_id: Optional[int] = None\n\n"
+        "def _dump_line(item) -> bytes:\n"
+        "    # Проверка и сериализация в pydantic-core, без промежуточного dict\n"
+        f"    return {name}Read.model_validate(item).model_dump_json().encode() + b\"\\n\"\n\n"
+        + _render_service_dependency(name, snake_name, adef, session_class, read_replicas)
+        + f"@router.get('/', response_model={name}Page)\n"
+        f"{adef} list_{snake_name}(\n"
+        "    after_id: Optional[int] = Query(None, description='id последней строки предыдущей страницы'),\n"
+        "    limit: int = Query(100, ge=1, le=1000),\n"
+        f"    service: {name}Service = Depends(get_{snake_name}_service),\n"
+        "):\n"
+        f"    items = {aw}service.list_after_id(after_id, limit)\n"
+        f"    page = {name}Page(items=items, next_after_id=items[-1].id if len(items) == limit else None)\n"
+        "    # Готовый JSON: FastAPI не проверяет ответ повторно, response_model остаётся для OpenAPI\n"
+        "    return Response(page.model_dump_json(), media_type='application/json')\n\n"
+        "@router.get('/export.ndjson')\n"
+        f"{adef} export_{snake_name}():\n"
+        + export_body
+        + "    return StreamingResponse(lines(), media_type='application/x-ndjson')\n\n"
+        f"@router.get('/{{{snake_name}_id}}', response_model={name}Read)\n"
+        f"{adef} get_{snake_name}({snake_name}_id: int, service: {name}Service = Depends(get_{snake_name}_service)):\n"
+        f"    {snake_name} = {aw}service.get_{snake_name}({snake_name}_id)\n"
+        f"    if {snake_name} is None:\n"
+        f"        raise HTTPException(status_code=404, detail='{name} не найден')\n"
+        f"    return {snake_name}\n"
+    )
+
+
+@register_template("route", variants=("template", "use_async"))
+def render_route(
+    name: str, *, use_async: bool = True, template: str = "basic", read_replicas: bool = False
+) -> str:
+    """Вернуть исходный код модуля маршрутов FastAPI."""
+    snake_name = camel_to_snake(name)
+    if template == "stream":
+        return _render_stream_route(name, snake_name, use_async, read_replicas)
+    database_import = (
+        "from database import get_db, get_read_db\n" if read_replicas else "from database import get_db\n"
+    )
+    if use_async:
+        return (
+            "from fastapi import APIRouter, Depends, HTTPException, Query\n"
+            "from fastapi.responses import Response\n"
+            "from sqlalchemy.ext.asyncio import AsyncSession\n\n"
+            + database_import
+            + f"from schemas.{snake_name}_schema import {name}Read, dump_{snake_name}_list\n"
+            f"from service.{snake_name}_service import {name}Service\n\n"
+            "router = APIRouter()\n\n"
+            + _render_service_dependency(name, snake_name, "async def", "AsyncSession", read_replicas)
+            + f"@router.get('/', response_model=list[{name}Read])\n"
+            f"async def list_{snake_name}(\n"
+            "    limit: int = Query(100, ge=1, le=1000),\n"
+            f"    service: {name}Service = Depends(get_{snake_name}_service),\n"
+            "):\n"
+            "    # Список сериализуется одним вызовом pydantic-core; response_model остаётся для OpenAPI\n"
+            f"    items = await service.list_{snake_name}(limit)\n"
+            f"    return Response(dump_{snake_name}_list(items), media_type='application/json')\n\n"
+            f"@router.get('/{{{snake_name}_id}}', response_model={name}Read)\n"
+            f"async def get_{snake_name}({snake_name}_id: int, service: {name}Service = Depends(get_{snake_name}_service)):\n"
+            f"    {snake_name} = await service.get_{snake_name}({snake_name}_id)\n"
+            f"    if {snake_name} is None:\n"
+            f"        raise HTTPException(status_code=404, detail='{name} не найден')\n"
+            f"    return {snake_name}\n"
+        )
+    return (
+        "from fastapi import APIRouter, Depends\n"
+        "from sqlalchemy.orm import Session\n\n"
+        + database_import
+        + f"from schemas.{snake_name}_schema import {name}Create\n"
+        f"from service.{snake_name}_service import {name}Service\n\n"
+        "router = APIRouter()\n\n"
+        + _render_service_dependency(name, snake_name, "def", "Session", read_replicas)
+        + f"# @router.get('/{snake_name}')\n"
+        f"# async def create_{snake_name}(data: {name}Create, service: {name}Service = Depends(get_{snake_name}_service)):\n"
+        f"#     return await service.create_{snake_name}(data)\n"
+    )
+
+
+def make_route(
+    name: str,
+    template: str = typer.Option(
+        "basic",
+        "--template",
+        "-t",
+        help="Шаблон роутов: basic или stream (курсорная пагинация и NDJSON-экспорт).",
+    ),
+) -> None:
     """Сгенерировать модуль маршрутов FastAPI."""
+    if template not in ROUTE_TEMPLATES:
+        typer.echo(f"❌ Неизвестный шаблон роутов: {template}. Доступны: {', '.join(ROUTE_TEMPLATES)}")
+        raise typer.Exit(code=1)
+
     path = BASE_DIR / "routes"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -19,18 +187,18 @@ def make_route(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        "from fastapi import APIRouter, Depends\n"
-        "from sqlalchemy.orm import Session\n\n"
-        "from database import get_db\n"
-        f"from schemas.{snake_name}_schema import {name}Schema\n"
-        f"from service.{snake_name}_service import {name}Service\n\n"
-        "router = APIRouter()\n\n"
-        f"def get_{snake_name}_service(db: Session = Depends(get_db)):\n"
-        f"    return {name}Service(db)\n\n"
-        f"# @router.get('/{snake_name}')\n"
-        f"# async def create_{snake_name}(data: {name}Schema, service: {name}Service = Depends(get_{snake_name}_service)):\n"
-        f"#     return await service.create_{snake_name}(data)\n"
+    service_file = BASE_DIR / "service" / f"{snake_name}_service.py"
+    if template == "stream" and service_file.exists() and "def stream_all" not in service_file.read_text():
+        typer.echo(f"⚠️ Сервис {name} не содержит stream_all: пересоздайте его с --template bulk")
+    schema_file = BASE_DIR / "schemas" / f"{snake_name}_schema.py"
+    if schema_file.exists() and f"class {name}Read(" not in schema_file.read_text():
+        typer.echo(f"⚠️ Схема {name} без {name}Read и dump_{snake_name}_list: пересоздайте её командой make-schema")
+
+    write_generated_file(
+        file_path,
+        render_route(
+            name, use_async=is_async_project(), template=template, read_replicas=has_read_replicas()
+        ),
     )
     update_init_exports(
         path,
@@ -1,17 +1,186 @@
+import re
+from typing import Optional
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
-    update_init_exports,
+    update_init_exports_many,
+    write_generated_file,
+)
+
+from .model import DEFAULT_FIELDS, FIELD_HELP, FieldSpec, model_fields, parse_field
+
+# Ограничения Pydantic, выводимые из типа колонки SQLAlchemy
+_CONSTRAINTS = (
+    (re.compile(r"^String\((\d+)\)$"), ("max_length",)),
+    (re.compile(r"^Numeric\((\d+), (\d+)\)$"), ("max_digits", "decimal_places")),
 )
 
+# Классы и функции модуля схемы, которые экспортируются из schemas/__init__.py
+SCHEMA_EXPORTS = ("{name}Schema", "{name}Create", "{name}Update", "{name}Read", "dump_{snake}_list")
+
+
+def schema_exports(name: str) -> list[tuple[str, str, Optional[str]]]:
+    """Экспорты schemas/__init__.py для схемы name."""
+    snake_name = camel_to_snake(name)
+    return [
+        (f"{snake_name}_schema", symbol.format(name=name, snake=snake_name), None)
+        for symbol in SCHEMA_EXPORTS
+    ]
+
+
+def _constraints(spec: FieldSpec) -> list[str]:
+    for pattern, keys in _CONSTRAINTS:
+        match = pattern.match(spec.sa_type)
+        if match:
+            return [f"{key}={value}" for key, value in zip(keys, match.groups())]
+    return []
+
+
+def _schema_fields(specs: list[FieldSpec]) -> list[tuple[str, str, list[str], FieldSpec]]:
+    """Поля схемы: имя, тип Python, ограничения и исходное описание.
+
+    Внешний ключ попадает в схему как <имя>_id, коллекции many не попадают:
+    их загрузка — забота запроса, а не сериализатора.
+    """
+    fields = []
+    for spec in specs:
+        if spec.kind == "column":
+            fields.append((spec.name, spec.py_type, _constraints(spec), spec))
+        elif spec.kind == "fk":
+            fields.append((f"{spec.name}_id", "int", [], spec))
+    return fields
+
+
+def _annotation(py_type: str, optional: bool) -> str:
+    return f"Optional[{py_type}]" if optional else py_type
+
+
+def _assignment(default: Optional[str], constraints: list[str]) -> str:
+    """Правая часть объявления поля: значение по умолчанию и/или Field(...)."""
+    if constraints:
+        return " = Field(" + ", ".join(([default] if default is not None else []) + constraints) + ")"
+    return f" = {default}" if default is not None else ""
+
+
+@register_template("schema")
+def render_schema(name: str, fields: Optional[list[str]] = None) -> str:
+    """Вернуть исходный код Pydantic-схем модели.
+
+    Create и Update описывают входные данные, Read — ответ API и читается
+    прямо из ORM-объекта (from_attributes). Для списков генерируются
+    TypeAdapter, собранные один раз при импорте: dump_<name>_list проверяет
+    и сериализует список ORM-объектов в JSON одним вызовом pydantic-core,
+    а dump_<name>_rows сериализует строки select(...) без проверки.
+    """
+    snake_name = camel_to_snake(name)
+    specs = [parse_field(spec) for spec in (fields or DEFAULT_FIELDS)]
+    schema_fields = _schema_fields(specs)
+    py_types = {py_type for _, py_type, _, _ in schema_fields}
+    upper_name = snake_name.upper()
+
+    lines = ["from datetime import date, datetime" if "date" in py_types else "from datetime import datetime"]
+    if "Decimal" in py_types:
+        lines.append("from decimal import Decimal")
+    lines.append("from typing import Any, Iterable, Optional, Sequence")
+    if "uuid.UUID" in py_types:
+        lines.append("import uuid")
+    lines += [
+        "",
+        "from pydantic import BaseModel, ConfigDict, Field, TypeAdapter",
+        "from typing_extensions import TypedDict",
+        "",
+        f"class {name}Base(BaseModel):",
+    ]
+    for field_name, py_type, constraints, spec in schema_fields:
+        default = spec.default if spec.default is not None else ("None" if spec.nullable else None)
+        lines.append(
+            f"    {field_name}: {_annotation(py_type, spec.nullable)}{_assignment(default, constraints)}"
+        )
+    if not schema_fields:
+        lines.append("    pass")
+    lines += [
+        "",
+        f"class {name}Create({name}Base):",
+        "    pass",
+        "",
+        f"class {name}Update(BaseModel):",
+        "    \"\"\"Частичное обновление: применяйте model_dump(exclude_unset=True).\"\"\"",
+        "",
+    ]
+    for field_name, py_type, constraints, _ in schema_fields:
+        lines.append(f"    {field_name}: {_annotation(py_type, True)}{_assignment('None', constraints)}")
+    if not schema_fields:
+        lines.append("    pass")
+    lines += [
+        "",
+        f"class {name}Read({name}Base):",
+        "    model_config = ConfigDict(from_attributes=True)",
+        "",
+        "    id: int",
+        "    created_at: datetime",
+        "    updated_at: Optional[datetime] = None",
+        "",
+        "# Прежнее имя схемы ответа",
+        f"{name}Schema = {name}Read",
+        "",
+        "# Адаптеры собираются один раз при импорте, а не на каждый запрос",
+        f"{name}ReadList = TypeAdapter(list[{name}Read])",
+        "",
+        f"def dump_{snake_name}_list(items: Iterable[Any]) -> bytes:",
+        f"    \"\"\"JSON списка ORM-объектов {name}: проверка и сериализация без промежуточных dict.\"\"\"",
+        f"    return {name}ReadList.dump_json({name}ReadList.validate_python(items, from_attributes=True))",
+        "",
+        f"class {name}Row(TypedDict):",
+        f"    \"\"\"Строка {name} из select(*columns) по {upper_name}_READ_FIELDS (порядок полей как в {name}Read).\"\"\"",
+        "",
+    ]
+    for field_name, py_type, _, spec in schema_fields:
+        lines.append(f"    {field_name}: {_annotation(py_type, spec.nullable)}")
+    read_fields = [*(field_name for field_name, _, _, _ in schema_fields), "id", "created_at", "updated_at"]
+    quoted_fields = ", ".join(f"\"{field}\"" for field in read_fields)
+    lines += [
+        "    id: int",
+        "    created_at: datetime",
+        "    updated_at: Optional[datetime]",
+        "",
+        f"{upper_name}_READ_FIELDS = ({quoted_fields})",
+        f"{name}RowList = TypeAdapter(list[{name}Row])",
+        "",
+        f"def dump_{snake_name}_rows(rows: Iterable[Sequence[Any]]) -> bytes:",
+        "    \"\"\"JSON строк собственной БД без проверки — быстрый путь для больших списков.",
+        "",
+        "    Строки должны быть выбраны как",
+        f"    select(*(getattr({name}, field) for field in {upper_name}_READ_FIELDS)):",
+        "    ORM-объекты не создаются, а типы значений уже гарантирует схема таблицы.",
+        "    \"\"\"",
+        f"    return {name}RowList.dump_json([dict(zip({upper_name}_READ_FIELDS, row)) for row in rows])",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def make_schema(
+    name: str,
+    fields: Optional[list[str]] = typer.Option(
+        None,
+        "--field",
+        "-f",
+        help=FIELD_HELP,
+    ),
+) -> None:
+    """Сгенерировать Pydantic-схемы Create/Update/Read."""
+    try:
+        content = render_schema(name, fields or model_fields(name))
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
 
-def make_schema(name: str) -> None:
-    """Сгенерировать Pydantic-схему."""
     path = BASE_DIR / "schemas"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -19,10 +188,6 @@ def make_schema(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        "from pydantic import BaseModel\n\n"
-        f"class {name}Schema(BaseModel):\n"
-        f"    name: str\n"
-    )
-    update_init_exports(path, f"{snake_name}_schema", f"{name}Schema")
+    write_generated_file(file_path, content)
+    update_init_exports_many(path, schema_exports(name))
     typer.echo(f"✅ Схема {name} создана")
@@ -1,16 +1,225 @@
+from typing import Optional
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    is_async_project,
+    write_generated_file,
 )
 
+SCRIPT_TEMPLATES = ("basic", "batch")
+
+
+def _render_batch_script(name: str, snake_name: str, model: str, use_async: bool) -> str:
+    """Скрипт пакетной обработки таблицы модели с чекпоинтами и разбиением по id."""
+    model_snake = camel_to_snake(model)
+    session_import = (
+        "from database.database import SyncSessionLocal as SessionLocal, sync_engine as engine\n"
+        if use_async
+        else "from database.database import SessionLocal, engine\n"
+    )
+    return (
+        f"\"\"\"Пакетная обработка {model}: {name}.\n\n"
+        f"Запуск: python -m scripts.{snake_name}_script --chunk-size 1000 --workers 4\n\n"
+        "Строки читаются потоково (yield_per) по возрастанию id, каждая пачка\n"
+        "обрабатывается и фиксируется в отдельной сессии, после чего id последней\n"
+        "строки сохраняется в чекпоинт. После сбоя повторный запуск продолжит с\n"
+        "места остановки; --reset начинает заново. С --workers > 1 диапазон id\n"
+        "делится на части, которые обрабатываются в отдельных процессах.\n"
+        "Границы частей хранятся в чекпоинтах: продолжение использует их, а не\n"
+        "пересчитывает по текущей таблице.\n"
+        "\"\"\"\n\n"
+        "import argparse\n"
+        "import json\n"
+        "import os\n"
+        "import time\n"
+        "from concurrent.futures import ProcessPoolExecutor\n"
+        "from pathlib import Path\n"
+        "from typing import Optional\n\n"
+        "from sqlalchemy import func, select\n"
+        "from sqlalchemy.orm import Session\n\n"
+        + session_import
+        + f"from models.{model_snake}_model import {model}\n\n"
+        f"SCRIPT_NAME = \"{snake_name}\"\n"
+        "CHECKPOINT_DIR = Path(os.getenv(\"CHECKPOINT_DIR\", \"storage/checkpoints\"))\n\n\n"
+        f"def process_chunk(session: Session, rows: list[{model}]) -> None:\n"
+        "    \"\"\"Обработайте пачку строк. Изменения фиксируются после возврата из функции.\n\n"
+        "    rows получены отдельной читающей сессией: для изменений используйте\n"
+        "    session.merge(row) или массовые update(...).where(Model.id.in_(...)).\n"
+        "    \"\"\"\n"
+        "    for row in rows:\n"
+        "        pass\n\n\n"
+        "class Checkpoint:\n"
+        "    \"\"\"Прогресс одной части: её диапазон id, число частей, id последней строки и счётчик.\"\"\"\n\n"
+        "    def __init__(self, partition: int) -> None:\n"
+        "        self.path = CHECKPOINT_DIR / f\"{SCRIPT_NAME}.{partition}.json\"\n"
+        "        self.start_id = self.stop_id = self.workers = 0\n"
+        "        self.last_id: Optional[int] = None\n"
+        "        self.processed = 0\n"
+        "        if self.path.exists():\n"
+        "            data = json.loads(self.path.read_text())\n"
+        "            self.start_id, self.stop_id, self.workers = data[\"start\"], data[\"stop\"], data[\"workers\"]\n"
+        "            self.last_id, self.processed = data[\"last_id\"], data[\"processed\"]\n\n"
+        "    def begin(self, start_id: int, stop_id: int, workers: int) -> None:\n"
+        "        \"\"\"Записать границы части до начала обработки.\"\"\"\n"
+        "        self.start_id, self.stop_id, self.workers = start_id, stop_id, workers\n"
+        "        self._write()\n\n"
+        "    def save(self, last_id: int, processed: int) -> None:\n"
+        "        self.last_id, self.processed = last_id, processed\n"
+        "        self._write()\n\n"
+        "    def _write(self) -> None:\n"
+        "        data = {\n"
+        "            \"start\": self.start_id,\n"
+        "            \"stop\": self.stop_id,\n"
+        "            \"workers\": self.workers,\n"
+        "            \"last_id\": self.last_id,\n"
+        "            \"processed\": self.processed,\n"
+        "        }\n"
+        "        CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)\n"
+        "        temp_path = self.path.with_suffix(\".tmp\")\n"
+        "        temp_path.write_text(json.dumps(data))\n"
+        "        # Атомарная замена: чекпоинт не повредится при падении во время записи\n"
+        "        os.replace(temp_path, self.path)\n\n\n"
+        "def checkpoint_paths() -> list[Path]:\n"
+        "    return sorted(CHECKPOINT_DIR.glob(f\"{SCRIPT_NAME}.*.json\"))\n\n\n"
+        "def id_ranges(workers: int) -> list[tuple[int, int]]:\n"
+        "    \"\"\"Разбить диапазон id таблицы на workers частей [start, stop].\"\"\"\n"
+        "    with SessionLocal() as session:\n"
+        f"        low, high = session.execute(select(func.min({model}.id), func.max({model}.id))).one()\n"
+        "    if low is None:\n"
+        "        return []\n"
+        "    step = -(-(high - low + 1) // workers)\n"
+        "    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]\n\n\n"
+        "def plan_ranges(workers: int) -> list[tuple[int, int]]:\n"
+        "    \"\"\"Границы частей из чекпоинтов прерванного запуска либо новое разбиение id.\n\n"
+        "    Пересчёт по текущей таблице сдвинул бы границы, и сохранённые last_id\n"
+        "    относились бы к чужим частям, поэтому при продолжении границы не меняются.\n"
+        "    \"\"\"\n"
+        "    checkpoints = [Checkpoint(partition) for partition in range(len(checkpoint_paths()))]\n"
+        "    if checkpoints:\n"
+        "        stored_workers = {checkpoint.workers for checkpoint in checkpoints}\n"
+        "        if stored_workers != {workers}:\n"
+        "            raise SystemExit(\n"
+        "                f\"❌ Чекпоинты сохранены для --workers {', '.join(map(str, sorted(stored_workers)))}: \"\n"
+        "                \"запустите с тем же числом частей или с --reset\"\n"
+        "            )\n"
+        "        return [(checkpoint.start_id, checkpoint.stop_id) for checkpoint in checkpoints]\n"
+        "    ranges = id_ranges(workers)\n"
+        "    for partition, (start, stop) in enumerate(ranges):\n"
+        "        Checkpoint(partition).begin(start, stop, workers)\n"
+        "    return ranges\n\n\n"
+        "def run_partition(partition: int, start_id: int, stop_id: int, chunk_size: int, report_every: float) -> int:\n"
+        "    \"\"\"Обработать строки с id в [start_id, stop_id] и вернуть их число.\"\"\"\n"
+        "    # В дочернем процессе не используем соединения, унаследованные от родителя\n"
+        "    engine.dispose(close=False)\n"
+        "    checkpoint = Checkpoint(partition)\n"
+        "    last_id = checkpoint.last_id if checkpoint.last_id is not None else start_id - 1\n"
+        "    processed = checkpoint.processed\n"
+        f"    condition = ({model}.id > last_id) & ({model}.id <= stop_id)\n\n"
+        "    with SessionLocal() as reader, SessionLocal() as writer:\n"
+        f"        total = processed + reader.scalar(select(func.count()).select_from({model}).where(condition))\n"
+        "        statement = (\n"
+        f"            select({model})\n"
+        "            .where(condition)\n"
+        f"            .order_by({model}.id)\n"
+        "            .execution_options(yield_per=chunk_size)\n"
+        "        )\n"
+        "        started = time.perf_counter()\n"
+        "        resumed_from = processed\n"
+        "        last_report = started\n"
+        "        for rows in reader.scalars(statement).partitions():\n"
+        "            process_chunk(writer, rows)\n"
+        "            writer.commit()\n"
+        "            processed += len(rows)\n"
+        "            checkpoint.save(rows[-1].id, processed)\n"
+        "            now = time.perf_counter()\n"
+        "            if now - last_report >= report_every:\n"
+        "                last_report = now\n"
+        "                rate = (processed - resumed_from) / (now - started)\n"
+        "                eta = (total - processed) / rate if rate else 0.0\n"
+        "                print(\n"
+        "                    f\"[часть {partition}] {processed}/{total} строк, \"\n"
+        "                    f\"{rate:,.0f} строк/с, осталось ~{eta:,.0f} с\",\n"
+        "                    flush=True,\n"
+        "                )\n"
+        "    return processed\n\n\n"
+        f"def run_{snake_name}_script(chunk_size: int = 1000, workers: int = 1, reset: bool = False, report_every: float = 5.0) -> None:\n"
+        f"    \"\"\"Обработать все строки {model} пачками по chunk_size.\"\"\"\n"
+        "    if reset:\n"
+        "        for path in checkpoint_paths():\n"
+        "            path.unlink()\n"
+        "    ranges = plan_ranges(workers)\n"
+        "    started = time.perf_counter()\n"
+        "    if workers <= 1 or len(ranges) <= 1:\n"
+        "        total = sum(\n"
+        "            run_partition(partition, start, stop, chunk_size, report_every)\n"
+        "            for partition, (start, stop) in enumerate(ranges)\n"
+        "        )\n"
+        "    else:\n"
+        "        with ProcessPoolExecutor(max_workers=workers) as executor:\n"
+        "            futures = [\n"
+        "                executor.submit(run_partition, partition, start, stop, chunk_size, report_every)\n"
+        "                for partition, (start, stop) in enumerate(ranges)\n"
+        "            ]\n"
+        "            total = sum(future.result() for future in futures)\n"
+        "    elapsed = time.perf_counter() - started\n"
+        "    print(f\"✅ Обработано {total} строк за {elapsed:.1f} с\")\n\n\n"
+        "if __name__ == \"__main__\":\n"
+        "    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)\n"
+        "    parser.add_argument(\"--chunk-size\", type=int, default=1000)\n"
+        "    parser.add_argument(\"--workers\", type=int, default=1, help=\"Число процессов-частей по диапазону id\")\n"
+        "    parser.add_argument(\"--reset\", action=\"store_true\", help=\"Удалить чекпоинты и начать заново\")\n"
+        "    parser.add_argument(\"--report-every\", type=float, default=5.0, help=\"Интервал отчёта о скорости, с\")\n"
+        "    args = parser.parse_args()\n"
+        f"    run_{snake_name}_script(args.chunk_size, args.workers, args.reset, args.report_every)\n"
+    )
+
+
+@register_template("script", variants=("template", "use_async"))
+def render_script(
+    name: str,
+    *,
+    template: str = "basic",
+    model: Optional[str] = None,
+    use_async: bool = True,
+) -> str:
+    """Вернуть исходный код скрипта."""
+    snake_name = camel_to_snake(name)
+    if template == "batch":
+        return _render_batch_script(name, snake_name, model or name, use_async)
+    return (
+        f"def run_{snake_name}_script() -> None:\n"
+        f"    \"\"\"Реализуйте здесь логику скрипта {name}.\"\"\"\n"
+        "    pass\n\n"
+    )
+
 
-def make_script(name: str) -> None:
+def make_script(
+    name: str,
+    template: str = typer.Option(
+        "basic",
+        "--template",
+        "-t",
+        help="Шаблон скрипта: basic или batch (пакетная обработка таблицы с чекпоинтами).",
+    ),
+    model: Optional[str] = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Модель для шаблона batch (по умолчанию совпадает с именем скрипта).",
+    ),
+) -> None:
     """Сгенерировать заготовку скрипта."""
+    if template not in SCRIPT_TEMPLATES:
+        typer.echo(f"❌ Неизвестный шаблон скрипта: {template}. Доступны: {', '.join(SCRIPT_TEMPLATES)}")
+        raise typer.Exit(code=1)
+
     path = BASE_DIR / "scripts"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -18,9 +227,13 @@ def make_script(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        f"def run_{snake_name}_script() -> None:\n"
-        f"    \"\"\"Реализуйте здесь логику скрипта {name}.\"\"\"\n"
-        "    pass\n\n"
+    if template == "batch":
+        model_file = BASE_DIR / "models" / f"{camel_to_snake(model or name)}_model.py"
+        if not model_file.exists():
+            typer.echo(f"⚠️ Модель {model or name} не найдена: создайте её командой make-model")
+
+    write_generated_file(
+        file_path,
+        render_script(name, template=template, model=model, use_async=is_async_project()),
     )
     typer.echo(f"✅ Скрипт {name} создан")
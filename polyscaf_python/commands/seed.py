@@ -0,0 +1,222 @@
+from typing import Optional
+
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import (
+    camel_to_snake,
+    check_file_exists,
+    create_folder_with_init,
+    create_git_ignore,
+    is_async_project,
+    write_generated_file,
+)
+
+from .model import DEFAULT_FIELDS, FIELD_HELP, FieldSpec, model_fields, parse_field
+
+# Тип Python колонки -> выражение значения строки с номером index
+_VALUES = {
+    "int": "index",
+    "float": "float(index)",
+    "Decimal": "Decimal(index)",
+    "bool": "False",
+    "date": "date.today()",
+    "datetime": "datetime.now(timezone.utc)",
+    "dict": "{}",
+    "uuid.UUID": "uuid.uuid4()",
+}
+
+# Импорты, нужные выражениям _VALUES
+_VALUE_IMPORTS = {
+    "Decimal": "from decimal import Decimal",
+    "date": "from datetime import date, datetime, timezone",
+    "datetime": "from datetime import date, datetime, timezone",
+    "uuid.UUID": "import uuid",
+}
+
+
+def _row_values(snake_name: str, specs: list[FieldSpec]) -> tuple[list[str], list[str], list[str]]:
+    """Элементы словаря строки, нужные импорты и модели родителей внешних ключей.
+
+    Заполняются только обязательные поля: у nullable и полей с default значение
+    подставит модель или БД. Внешние ключи ссылаются на уже существующие строки.
+    """
+    items: list[str] = []
+    imports: list[str] = []
+    parents: list[str] = []
+    for spec in specs:
+        if spec.kind == "fk" and not spec.nullable:
+            items.append(f"\"{spec.column_name}\": parent_id({spec.target}, index)")
+            if spec.target not in parents:
+                parents.append(spec.target)
+        elif spec.kind == "column" and not spec.nullable and spec.default is None:
+            if spec.py_type == "str":
+                prefix = snake_name if spec.name == "name" else spec.name
+                items.append(f"\"{spec.name}\": f\"{prefix}_{{index}}\"")
+            else:
+                items.append(f"\"{spec.name}\": {_VALUES[spec.py_type]}")
+                import_line = _VALUE_IMPORTS.get(spec.py_type)
+                if import_line and import_line not in imports:
+                    imports.append(import_line)
+    return items, imports, parents
+
+
+@register_template("seed", variants=("use_async",))
+def render_seed(name: str, *, use_async: bool = True, fields: Optional[list[str]] = None) -> str:
+    """Вернуть исходный код скрипта пакетного заполнения таблицы."""
+    snake_name = camel_to_snake(name)
+    specs = [parse_field(spec) for spec in (fields or DEFAULT_FIELDS)]
+    items, value_imports, parents = _row_values(snake_name, specs)
+    has_json = any(spec.kind == "column" and spec.py_type == "dict" for spec in specs)
+    # COPY принимает текст: JSON-колонки сериализуются явно
+    copy_value = "_copy_value(row[column])" if has_json else "row[column]"
+    copy_helper = (
+        "def _copy_value(value: Any) -> Any:\n"
+        "    return json.dumps(value) if isinstance(value, (dict, list)) else value\n\n\n"
+        if has_json
+        else ""
+    )
+    parent_imports = "".join(
+        f"from models.{camel_to_snake(parent)}_model import {parent}\n" for parent in parents if parent != name
+    )
+    parent_helper = (
+        "@functools.lru_cache(maxsize=None)\n"
+        "def _parent_ids(model) -> tuple[int, ...]:\n"
+        "    with engine.connect() as connection:\n"
+        "        ids = tuple(connection.scalars(select(model.id).order_by(model.id).limit(PARENT_LIMIT)))\n"
+        "    if not ids:\n"
+        "        raise SystemExit(f\"❌ Таблица {model.__tablename__} пуста: сначала заполните её\")\n"
+        "    return ids\n\n\n"
+        "def parent_id(model, index: int) -> int:\n"
+        "    \"\"\"id существующей строки родителя для внешнего ключа (по кругу).\"\"\"\n"
+        "    ids = _parent_ids(model)\n"
+        "    return ids[index % len(ids)]\n\n\n"
+        if parents
+        else ""
+    )
+    engine_import = (
+        "from database.database import sync_engine as engine\n"
+        if use_async
+        else "from database.database import engine\n"
+    )
+    row = "{" + ", ".join(items) + "}"
+    rows_body = f"    return [{row} for index in range(start, start + count)]\n\n\n"
+    if len(rows_body) > 100:
+        # Длинную строку словаря разбиваем по ключам
+        row = "{\n" + "".join(f"            {item},\n" for item in items) + "        }"
+        rows_body = f"    return [\n        {row}\n        for index in range(start, start + count)\n    ]\n\n\n"
+    return (
+        f"\"\"\"Пакетное заполнение таблицы модели {name}.\n\n"
+        f"Запуск: python -m scripts.seed_{snake_name} --rows 1000000 --batch-size 10000 --workers 4\n\n"
+        "Строки собираются пачками и вставляются одной командой на пачку:\n"
+        "COPY на PostgreSQL и многострочный INSERT на MySQL, с коммитом на пачку.\n"
+        "\"\"\"\n\n"
+        "import argparse\n"
+        "import csv\n"
+        + ("import functools\n" if parents else "")
+        + "import io\n"
+        + ("import json\n" if has_json else "")
+        + "import time\n"
+        "from concurrent.futures import ProcessPoolExecutor\n"
+        "from typing import Any\n"
+        + "".join(f"{line}\n" for line in sorted(value_imports))
+        + "\n"
+        + ("from sqlalchemy import insert, select\n\n" if parents else "from sqlalchemy import insert\n\n")
+        + engine_import
+        + f"from models.{snake_name}_model import {name}\n"
+        + parent_imports
+        + "\n"
+        f"TABLE = {name}.__table__\n"
+        + ("# Сколько id родителей брать для внешних ключей\nPARENT_LIMIT = 10_000\n" if parents else "")
+        + "\n\n"
+        + parent_helper
+        + "def build_rows(start: int, count: int) -> list[dict[str, Any]]:\n"
+        "    \"\"\"Собрать строки с номерами [start, start + count). Измените под свою модель.\"\"\"\n"
+        + rows_body
+        + copy_helper
+        + "def _copy_rows(connection, rows: list[dict[str, Any]]) -> None:\n"
+        "    columns = list(rows[0])\n"
+        "    column_list = \", \".join(columns)\n"
+        "    cursor = connection.connection.dbapi_connection.cursor()\n"
+        "    try:\n"
+        "        if hasattr(cursor, \"copy\"):  # psycopg 3\n"
+        "            with cursor.copy(f\"COPY {TABLE.name} ({column_list}) FROM STDIN\") as copy:\n"
+        "                for row in rows:\n"
+        f"                    copy.write_row([{copy_value} for column in columns])\n"
+        "        else:  # psycopg2\n"
+        "            buffer = io.StringIO()\n"
+        "            writer = csv.writer(buffer)\n"
+        f"            writer.writerows([{copy_value} for column in columns] for row in rows)\n"
+        "            buffer.seek(0)\n"
+        "            cursor.copy_expert(f\"COPY {TABLE.name} ({column_list}) FROM STDIN WITH CSV\", buffer)\n"
+        "    finally:\n"
+        "        cursor.close()\n\n\n"
+        "def insert_batch(rows: list[dict[str, Any]]) -> None:\n"
+        "    \"\"\"Вставить пачку строк в одной транзакции.\"\"\"\n"
+        "    with engine.begin() as connection:\n"
+        "        if connection.dialect.name == \"postgresql\":\n"
+        "            _copy_rows(connection, rows)\n"
+        "        else:\n"
+        "            # executemany: MySQL-драйвер склеивает пачку в многострочный INSERT\n"
+        "            connection.execute(insert(TABLE), rows)\n\n\n"
+        "def seed_range(start: int, stop: int, batch_size: int) -> int:\n"
+        "    \"\"\"Заполнить диапазон номеров строк пачками и вернуть число вставленных строк.\"\"\"\n"
+        "    # В дочернем процессе не используем соединения, унаследованные от родителя\n"
+        "    engine.dispose(close=False)\n"
+        "    inserted = 0\n"
+        "    started = time.perf_counter()\n"
+        "    for batch_start in range(start, stop, batch_size):\n"
+        "        rows = build_rows(batch_start, min(batch_size, stop - batch_start))\n"
+        "        insert_batch(rows)\n"
+        "        inserted += len(rows)\n"
+        "        elapsed = time.perf_counter() - started\n"
+        "        print(f\"[{start}-{stop}) {inserted} строк, {inserted / elapsed:,.0f} строк/с\", flush=True)\n"
+        "    return inserted\n\n\n"
+        "def seed(rows: int, batch_size: int, workers: int) -> None:\n"
+        "    if rows <= 0:\n"
+        "        print(\"ℹ️ Нечего вставлять: --rows должен быть больше 0\")\n"
+        "        return\n"
+        "    started = time.perf_counter()\n"
+        "    workers = min(workers, rows)\n"
+        "    batch_size = max(1, batch_size)\n"
+        "    if workers <= 1:\n"
+        "        total = seed_range(0, rows, batch_size)\n"
+        "    else:\n"
+        "        step = -(-rows // workers)\n"
+        "        partitions = [(start, min(start + step, rows)) for start in range(0, rows, step)]\n"
+        "        with ProcessPoolExecutor(max_workers=workers) as executor:\n"
+        "            futures = [executor.submit(seed_range, start, stop, batch_size) for start, stop in partitions]\n"
+        "            total = sum(future.result() for future in futures)\n"
+        "    elapsed = time.perf_counter() - started\n"
+        "    print(f\"✅ Вставлено {total} строк за {elapsed:.1f} с ({total / elapsed:,.0f} строк/с)\")\n\n\n"
+        "if __name__ == \"__main__\":\n"
+        "    parser = argparse.ArgumentParser(description=__doc__)\n"
+        "    parser.add_argument(\"--rows\", type=int, default=10_000)\n"
+        "    parser.add_argument(\"--batch-size\", type=int, default=5_000)\n"
+        "    parser.add_argument(\"--workers\", type=int, default=1, help=\"Число процессов-разделов\")\n"
+        "    args = parser.parse_args()\n"
+        "    seed(args.rows, args.batch_size, args.workers)\n"
+    )
+
+
+def make_seed(
+    name: str,
+    fields: Optional[list[str]] = typer.Option(None, "--field", "-f", help=FIELD_HELP),
+) -> None:
+    """Сгенерировать скрипт пакетного заполнения таблицы (COPY / многострочный INSERT)."""
+    try:
+        content = render_seed(name, use_async=is_async_project(), fields=fields or model_fields(name))
+    except ValueError as error:
+        typer.echo(f"❌ {error}")
+        raise typer.Exit(code=1)
+
+    path = BASE_DIR / "scripts"
+    create_folder_with_init(path)
+    snake_name = camel_to_snake(name)
+    file_path = path / f"seed_{snake_name}.py"
+    check_file_exists(file_path)
+    create_git_ignore(path)
+
+    write_generated_file(file_path, content)
+    typer.echo(f"✅ Скрипт заполнения {name} создан")
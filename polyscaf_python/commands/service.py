@@ -1,17 +1,221 @@
+from typing import Optional
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    has_read_replicas,
+    is_async_project,
     update_init_exports,
+    write_generated_file,
 )
 
+from .model import DEFAULT_FIELDS, model_fields, parse_field
+
+
+SERVICE_TEMPLATES = ("basic", "bulk")
+
+
+def _render_init(session_class: str, read_replicas: bool) -> str:
+    """Конструктор сервиса; с репликами — ещё сессия для чтения и выбор сессии по намерению."""
+    if not read_replicas:
+        return (
+            f"    def __init__(self, db: {session_class}):\n"
+            "        self.db = db\n\n"
+        )
+    return (
+        f"    def __init__(self, db: {session_class}, read_db: Optional[{session_class}] = None):\n"
+        "        self.db = db\n"
+        "        # Без реплик get_read_db отдаёт ту же сессию, что и get_db\n"
+        "        self.read_db = db if read_db is None else read_db\n"
+        "        # Выставляется методами записи и не сбрасывается после commit\n"
+        "        self._wrote = False\n\n"
+        f"    def _reader(self, primary: bool = False) -> {session_class}:\n"
+        "        \"\"\"Сессия для чтения: реплика либо основная БД, если нужны свежие данные.\n\n"
+        "        primary=True, начатая транзакция в self.db или запись этим сервисом\n"
+        "        (self._wrote, в том числе уже зафиксированная) отправляют запрос на\n"
+        "        основную БД, чтобы прочитать только что записанное (реплика отстаёт).\n"
+        "        Свои методы записи тоже должны выставлять self._wrote = True.\n"
+        "        \"\"\"\n"
+        "        if primary or self._wrote or self.db.in_transaction():\n"
+        "            return self.db\n"
+        "        return self.read_db\n\n"
+    )
+
+
+def _upsert_columns(fields: Optional[list[str]]) -> str:
+    """Кортеж колонок, которые обновляет upsert: все колонки полей модели."""
+    columns = [spec.column_name for spec in map(parse_field, fields or DEFAULT_FIELDS) if spec.column_name]
+    quoted = ", ".join(f"\"{column}\"" for column in columns)
+    return f"({quoted},)" if len(columns) == 1 else f"({quoted})"
+
+
+def _render_bulk_service(
+    name: str, snake_name: str, use_async: bool, read_replicas: bool, fields: Optional[list[str]]
+) -> str:
+    """Сервис с пакетной вставкой, upsert, keyset-пагинацией и потоковым чтением."""
+    adef = "async def" if use_async else "def"
+    aw = "await " if use_async else ""
+    session_class = "AsyncSession" if use_async else "Session"
+    # С репликами чтение идёт через _reader(), запись — через self.db
+    reader = "self._reader(primary)" if read_replicas else "self.db"
+    primary = ", *, primary: bool = False" if read_replicas else ""
+    mark_write = "        self._wrote = True\n" if read_replicas else ""
+    if use_async:
+        session_import = "from sqlalchemy.ext.asyncio import AsyncSession\n\n"
+        typing_import = "from typing import Any, AsyncIterator, Optional, Sequence\n\n"
+        stream_method = (
+            f"    async def stream_all(self, chunk_size: int = 1000{primary}) -> AsyncIterator[{name}]:\n"
+            "        \"\"\"Потоково отдать все строки, держа в памяти не больше chunk_size объектов.\"\"\"\n"
+            f"        result = await {reader}.stream_scalars(\n"
+            f"            select({name}).order_by({name}.id).execution_options(yield_per=chunk_size)\n"
+            "        )\n"
+            "        async for item in result:\n"
+            "            yield item\n"
+        )
+    else:
+        session_import = "from sqlalchemy.orm import Session\n\n"
+        typing_import = "from typing import Any, Iterator, Optional, Sequence\n\n"
+        stream_method = (
+            f"    def stream_all(self, chunk_size: int = 1000{primary}) -> Iterator[{name}]:\n"
+            "        \"\"\"Потоково отдать все строки, держа в памяти не больше chunk_size объектов.\"\"\"\n"
+            f"        yield from {reader}.scalars(\n"
+            f"            select({name}).order_by({name}.id).execution_options(yield_per=chunk_size)\n"
+            "        )\n"
+        )
+    return (
+        "from datetime import datetime\n"
+        + typing_import
+        + "from sqlalchemy import insert, select, tuple_\n"
+        + session_import
+        + f"from models.{snake_name}_model import {name}\n\n"
+        f"class {name}Service:\n"
+        "    # Ключ конфликта и колонки, которые обновляет upsert\n"
+        "    UPSERT_KEYS = (\"id\",)\n"
+        f"    UPSERT_COLUMNS = {_upsert_columns(fields)}\n"
+        "    BATCH_SIZE = 1000\n\n"
+        + _render_init(session_class, read_replicas)
+        + f"    {adef} get_{snake_name}(self, {snake_name}_id: int{primary}) -> Optional[{name}]:\n"
+        f"        return {aw}{reader}.get({name}, {snake_name}_id)\n\n"
+        f"    {adef} bulk_create(self, rows: Sequence[dict[str, Any]]) -> int:\n"
+        "        \"\"\"Вставить строки пачками через executemany с одним коммитом.\"\"\"\n"
+        + mark_write
+        + "        for start in range(0, len(rows), self.BATCH_SIZE):\n"
+        f"            {aw}self.db.execute(insert({name}), list(rows[start : start + self.BATCH_SIZE]))\n"
+        f"        {aw}self.db.commit()\n"
+        "        return len(rows)\n\n"
+        "    def _upsert_statement(self, rows: Sequence[dict[str, Any]]):\n"
+        "        dialect = self.db.get_bind().dialect.name\n"
+        "        if dialect == \"postgresql\":\n"
+        "            from sqlalchemy.dialects.postgresql import insert as pg_insert\n\n"
+        f"            statement = pg_insert({name}).values(list(rows))\n"
+        "            return statement.on_conflict_do_update(\n"
+        "                index_elements=list(self.UPSERT_KEYS),\n"
+        "                set_={column: statement.excluded[column] for column in self.UPSERT_COLUMNS},\n"
+        "            )\n"
+        "        if dialect == \"sqlite\":\n"
+        "            from sqlalchemy.dialects.sqlite import insert as sqlite_insert\n\n"
+        f"            statement = sqlite_insert({name}).values(list(rows))\n"
+        "            return statement.on_conflict_do_update(\n"
+        "                index_elements=list(self.UPSERT_KEYS),\n"
+        "                set_={column: statement.excluded[column] for column in self.UPSERT_COLUMNS},\n"
+        "            )\n"
+        "        if dialect in (\"mysql\", \"mariadb\"):\n"
+        "            from sqlalchemy.dialects.mysql import insert as mysql_insert\n\n"
+        f"            statement = mysql_insert({name}).values(list(rows))\n"
+        "            return statement.on_duplicate_key_update(\n"
+        "                {column: statement.inserted[column] for column in self.UPSERT_COLUMNS}\n"
+        "            )\n"
+        "        raise NotImplementedError(f\"Upsert не поддерживается для диалекта {dialect}\")\n\n"
+        f"    {adef} bulk_upsert(self, rows: Sequence[dict[str, Any]]) -> int:\n"
+        "        \"\"\"Вставить или обновить строки (ON CONFLICT / ON DUPLICATE KEY) пачками.\"\"\"\n"
+        + mark_write
+        + "        for start in range(0, len(rows), self.BATCH_SIZE):\n"
+        f"            {aw}self.db.execute(self._upsert_statement(rows[start : start + self.BATCH_SIZE]))\n"
+        f"        {aw}self.db.commit()\n"
+        "        return len(rows)\n\n"
+        f"    {adef} list_after_id(self, after_id: Optional[int] = None, limit: int = 100{primary}) -> list[{name}]:\n"
+        "        \"\"\"Keyset-пагинация по id: передайте id последней строки предыдущей страницы.\"\"\"\n"
+        f"        statement = select({name}).order_by({name}.id).limit(limit)\n"
+        "        if after_id is not None:\n"
+        f"            statement = statement.where({name}.id > after_id)\n"
+        f"        return list({aw}{reader}.scalars(statement))\n\n"
+        f"    {adef} list_after_created(\n"
+        f"        self, after: Optional[tuple[datetime, int]] = None, limit: int = 100{primary}\n"
+        f"    ) -> list[{name}]:\n"
+        "        \"\"\"Keyset-пагинация по (created_at, id) от новых к старым.\"\"\"\n"
+        f"        statement = select({name}).order_by({name}.created_at.desc(), {name}.id.desc()).limit(limit)\n"
+        "        if after is not None:\n"
+        f"            statement = statement.where(tuple_({name}.created_at, {name}.id) < tuple_(*after))\n"
+        f"        return list({aw}{reader}.scalars(statement))\n\n"
+        + stream_method
+    )
+
 
-def make_service(name: str) -> None:
+@register_template("service", variants=("template", "use_async"))
+def render_service(
+    name: str,
+    *,
+    use_async: bool = True,
+    template: str = "basic",
+    read_replicas: bool = False,
+    fields: Optional[list[str]] = None,
+) -> str:
+    """Вернуть исходный код сервиса.
+
+    read_replicas добавляет сессию для чтения: методы чтения идут на реплику,
+    запись — на основную БД. fields (формат --field) задают колонки upsert
+    в шаблоне bulk.
+    """
+    snake_name = camel_to_snake(name)
+    if template == "bulk":
+        return _render_bulk_service(name, snake_name, use_async, read_replicas, fields)
+    reader = "self._reader(primary)" if read_replicas else "self.db"
+    primary = ", *, primary: bool = False" if read_replicas else ""
+    if use_async:
+        return (
+            "from typing import Optional\n\n"
+            "from sqlalchemy import select\n"
+            "from sqlalchemy.ext.asyncio import AsyncSession\n\n"
+            f"from models.{snake_name}_model import {name}\n\n"
+            f"class {name}Service:\n"
+            + _render_init("AsyncSession", read_replicas)
+            + f"    async def get_{snake_name}(self, {snake_name}_id: int{primary}) -> Optional[{name}]:\n"
+            f"        return await {reader}.get({name}, {snake_name}_id)\n\n"
+            f"    async def list_{snake_name}(self, limit: int = 100{primary}) -> list[{name}]:\n"
+            f"        result = await {reader}.scalars(select({name}).order_by({name}.id).limit(limit))\n"
+            f"        return list(result)\n"
+        )
+    return (
+        ("from typing import Optional\n\n" if read_replicas else "")
+        + "from sqlalchemy.orm import Session\n\n"
+        f"from models.{snake_name}_model import {name}\n\n"
+        f"class {name}Service:\n"
+        + _render_init("Session", read_replicas)
+        + f"    def example_method(self) -> str:\n"
+        f"        return 'Hello from {name}'\n"
+    )
+
+
+def make_service(
+    name: str,
+    template: str = typer.Option(
+        "basic",
+        "--template",
+        "-t",
+        help="Шаблон сервиса: basic или bulk (пакетная вставка, upsert, keyset-пагинация, стриминг).",
+    ),
+) -> None:
     """Сгенерировать файл сервиса."""
+    if template not in SERVICE_TEMPLATES:
+        typer.echo(f"❌ Неизвестный шаблон сервиса: {template}. Доступны: {', '.join(SERVICE_TEMPLATES)}")
+        raise typer.Exit(code=1)
+
     path = BASE_DIR / "service"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -19,14 +223,15 @@ def make_service(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        "from sqlalchemy.orm import Session\n\n"
-        f"from models.{snake_name}_model import {name}\n\n"
-        f"class {name}Service:\n"
-        f"    def __init__(self, db: Session):\n"
-        f"        self.db = db\n\n"
-        f"    def example_method(self) -> str:\n"
-        f"        return 'Hello from {name}'\n"
+    write_generated_file(
+        file_path,
+        render_service(
+            name,
+            use_async=is_async_project(),
+            template=template,
+            read_replicas=has_read_replicas(),
+            fields=model_fields(name) if template == "bulk" else None,
+        ),
     )
     update_init_exports(path, f"{snake_name}_service", f"{name}Service")
     typer.echo(f"✅ Сервис {name} создан")
@@ -0,0 +1,233 @@
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import (
+    check_file_exists,
+    create_folder_with_init,
+    create_git_ignore,
+    ensure_directory,
+    update_init_exports,
+    update_init_exports_many,
+    write_generated_file,
+)
+
+STORAGE_TEMPLATE = '''"""Потоковое сохранение и отдача файлов из storage/files.
+
+Файлы пишутся по частям (CHUNK_SIZE) во временный файл с подсчётом
+sha256 на лету и только после проверки размера и хэша переименовываются
+в итоговое имя. Файл целиком в память не загружается.
+
+Настройки в .env:
+    STORAGE_DIR=storage/files
+    STORAGE_MAX_UPLOAD_MB=1024
+    STORAGE_ACCEL_REDIRECT=/protected/  # отдавать файлы через nginx (X-Accel-Redirect)
+"""
+
+import hashlib
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, Response
+
+STORAGE_DIR = Path(os.getenv("STORAGE_DIR", "storage/files"))
+MAX_UPLOAD_BYTES = int(os.getenv("STORAGE_MAX_UPLOAD_MB", "1024")) * 1024 * 1024
+ACCEL_REDIRECT = os.getenv("STORAGE_ACCEL_REDIRECT", "")
+CHUNK_SIZE = 1024 * 1024
+
+_FILE_ID = re.compile(r"^[0-9a-f]{32}(\\.[A-Za-z0-9]{1,16})?$")
+
+
+@dataclass
+class StoredFile:
+    """Результат сохранения файла."""
+
+    file_id: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+
+
+def _suffix(filename: Optional[str]) -> str:
+    suffix = Path(filename or "").suffix.lower()
+    return suffix if re.fullmatch(r"\\.[a-z0-9]{1,16}", suffix) else ""
+
+
+def file_path(file_id: str) -> Path:
+    """Путь к файлу по идентификатору; идентификатор проверяется, чтобы исключить обход каталогов."""
+    if not _FILE_ID.match(file_id):
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    return STORAGE_DIR / file_id
+
+
+def check_content_length(value: Optional[str], max_bytes: int = MAX_UPLOAD_BYTES) -> None:
+    """Отклонить запрос по заголовку Content-Length до чтения тела."""
+    if value and value.isdigit() and int(value) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Файл больше {max_bytes} байт")
+
+
+async def save_stream(
+    chunks: AsyncIterator[bytes],
+    *,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    expected_sha256: Optional[str] = None,
+) -> StoredFile:
+    """Сохранить поток байтов в хранилище с ограничением размера и подсчётом sha256."""
+    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+    file_id = uuid.uuid4().hex + _suffix(filename)
+    temp_path = STORAGE_DIR / f".{file_id}.part"
+    digest = hashlib.sha256()
+    size = 0
+    handle = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Файл больше {max_bytes} байт")
+            digest.update(chunk)
+            await run_in_threadpool(handle.write, chunk)
+        await run_in_threadpool(handle.close)
+        sha256 = digest.hexdigest()
+        if expected_sha256 and expected_sha256.lower() != sha256:
+            raise HTTPException(status_code=400, detail="Хэш sha256 не совпадает с переданным")
+        os.replace(temp_path, STORAGE_DIR / file_id)
+    except BaseException:
+        handle.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+    return StoredFile(file_id=file_id, size=size, sha256=sha256, content_type=content_type)
+
+
+async def iter_upload(upload, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Читать UploadFile частями, не загружая его целиком."""
+    while chunk := await upload.read(chunk_size):
+        yield chunk
+
+
+def file_response(file_id: str, *, download_name: Optional[str] = None) -> Response:
+    """Отдать файл с поддержкой Range-запросов.
+
+    При STORAGE_ACCEL_REDIRECT отдачу выполняет nginx (sendfile, без
+    копирования через Python); иначе FileResponse читает файл частями,
+    а на серверах с расширением http.response.pathsend отдаёт его без копирования.
+    """
+    path = file_path(file_id)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    if ACCEL_REDIRECT:
+        return Response(headers={"X-Accel-Redirect": ACCEL_REDIRECT.rstrip("/") + "/" + file_id})
+    return FileResponse(path, filename=download_name, headers={"Cache-Control": "private, max-age=3600"})
+
+
+def delete_file(file_id: str) -> bool:
+    """Удалить файл; вернуть False, если его не было."""
+    path = file_path(file_id)
+    if not path.is_file():
+        return False
+    path.unlink()
+    return True
+'''
+
+STORAGE_ROUTE_TEMPLATE = '''from typing import Optional
+
+from fastapi import APIRouter, File, Header, HTTPException, Request, UploadFile
+
+from utils.storage import check_content_length, delete_file, file_response, iter_upload, save_stream
+
+router = APIRouter()
+
+
+@router.post("/upload", status_code=201)
+async def upload_file(
+    file: UploadFile = File(...),
+    content_length: Optional[str] = Header(None),
+    x_content_sha256: Optional[str] = Header(None),
+):
+    """Загрузка через multipart/form-data (частями из временного файла Starlette)."""
+    check_content_length(content_length)
+    stored = await save_stream(
+        iter_upload(file),
+        filename=file.filename,
+        content_type=file.content_type,
+        expected_sha256=x_content_sha256,
+    )
+    return stored.__dict__
+
+
+@router.put("/upload/{filename}", status_code=201)
+async def upload_raw(
+    filename: str,
+    request: Request,
+    content_length: Optional[str] = Header(None),
+    x_content_sha256: Optional[str] = Header(None),
+):
+    """Загрузка сырым телом запроса: поток пишется на диск без промежуточных копий."""
+    check_content_length(content_length)
+    stored = await save_stream(
+        request.stream(),
+        filename=filename,
+        content_type=request.headers.get("content-type"),
+        expected_sha256=x_content_sha256,
+    )
+    return stored.__dict__
+
+
+@router.get("/{file_id}")
+async def download_file(file_id: str, name: Optional[str] = None):
+    """Скачивание с поддержкой Range (докачка, перемотка видео)."""
+    return file_response(file_id, download_name=name)
+
+
+@router.delete("/{file_id}", status_code=204)
+async def remove_file(file_id: str):
+    if not delete_file(file_id):
+        raise HTTPException(status_code=404, detail="Файл не найден")
+'''
+
+STORAGE_EXPORTS = [
+    ("storage", "StoredFile", None),
+    ("storage", "save_stream", None),
+    ("storage", "file_response", None),
+]
+
+
+@register_template("storage")
+def render_storage() -> str:
+    """Вернуть исходный код модуля хранилища."""
+    return STORAGE_TEMPLATE
+
+
+@register_template("storage_route")
+def render_storage_route() -> str:
+    """Вернуть исходный код роутов хранилища."""
+    return STORAGE_ROUTE_TEMPLATE
+
+
+def make_storage() -> None:
+    """Сгенерировать потоковую загрузку и отдачу файлов из storage/files."""
+    utils_path = BASE_DIR / "utils"
+    routes_path = BASE_DIR / "routes"
+    storage_file = utils_path / "storage.py"
+    route_file = routes_path / "storage_route.py"
+    check_file_exists(storage_file)
+    check_file_exists(route_file)
+
+    for path in (utils_path, routes_path):
+        create_folder_with_init(path)
+        create_git_ignore(path)
+    # Папка нужна и для StaticFiles в main.py
+    ensure_directory(BASE_DIR / "storage" / "files")
+
+    write_generated_file(storage_file, render_storage())
+    write_generated_file(route_file, render_storage_route())
+    update_init_exports_many(utils_path, STORAGE_EXPORTS)
+    update_init_exports(routes_path, "storage_route", "router", alias="StorageRouter")
+    typer.echo("✅ Хранилище создано: utils/storage.py и routes/storage_route.py")
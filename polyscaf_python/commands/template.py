@@ -0,0 +1,53 @@
+from importlib import import_module
+
+import typer
+
+from polyscaf_python.templates import TEMPLATE_SUFFIX, registry
+
+# Модули, в которых зарегистрированы встроенные шаблоны
+TEMPLATE_MODULES = (
+    "project",
+    "model",
+    "schema",
+    "service",
+    "route",
+    "test",
+    "bench",
+    "seed",
+    "script",
+    "util",
+    "factory",
+    "cache",
+    "storage",
+    "worker",
+    "migration",
+)
+
+
+def list_templates() -> None:
+    """Показать шаблоны генератора и их пользовательские переопределения."""
+    for module_name in TEMPLATE_MODULES:
+        import_module(f"polyscaf_python.commands.{module_name}")
+
+    overrides: dict[str, list[str]] = {}
+    # Длинные имена проверяем первыми: в именах project/<путь> тоже есть точки
+    builtins = sorted(registry.builtins, key=len, reverse=True)
+    for directory, names in registry.listing():
+        for file_name in sorted(names):
+            template_name = file_name[: -len(TEMPLATE_SUFFIX)]
+            base_name = next(
+                (name for name in builtins if template_name == name or template_name.startswith(f"{name}.")),
+                None,
+            )
+            if base_name is None:
+                typer.echo(f"⚠️ Шаблон {directory / file_name} не соответствует ни одному встроенному")
+                continue
+            overrides.setdefault(base_name, []).append(str(directory / file_name))
+
+    typer.echo("ℹ️ Папки переопределений: " + ", ".join(str(directory) for directory in registry.dirs))
+    for name in sorted(registry.builtins):
+        variants = registry.builtins[name]
+        suffix = f" [варианты: {', '.join(variants)}]" if variants else ""
+        typer.echo(f"  {name}{suffix}")
+        for path in overrides.get(name, []):
+            typer.echo(f"    ✅ {path}")
@@ -1,16 +1,253 @@
+from pathlib import Path
+
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    is_async_project,
+    write_generated_file,
+)
+
+CONFTEST = "conftest.py"
+
+CONFTEST_DOC = (
+    "\"\"\"Общие фикстуры тестов: изолированная БД на воркер и откат после каждого теста.\n\n"
+    "Запуск: pytest -n auto (pytest-xdist). Каждый воркер получает свою БД\n"
+    "<SQL_DATABASE>_test_<worker> на сервере из SQL_TEST_BASE; без SQL_TEST_BASE\n"
+    "тесты идут на файле SQLite во временной папке и не требуют сервера.\n"
+    "Таблицы создаются один раз на воркер. Тест выполняется внутри транзакции\n"
+    "соединения, которая откатывается после него: commit() приложения фиксирует\n"
+    "только SAVEPOINT, поэтому таблицы не пересоздаются и тесты не видят данных\n"
+    "друг друга.\n"
+    "\"\"\"\n\n"
+)
+
+CONFTEST_SETTINGS = (
+    "import os\n"
+    "import tempfile\n"
+    "from pathlib import Path\n\n"
+    "import pytest\n"
+    "from dotenv import load_dotenv\n"
+    "from fastapi.testclient import TestClient\n"
+    "from sqlalchemy import event\n"
+    "{session_import}\n"
+    "load_dotenv()\n\n"
+    "WORKER = os.getenv(\"PYTEST_XDIST_WORKER\", \"main\")\n"
+    "# Воркеры xdist наследуют окружение главного процесса, поэтому исходное имя БД сохраняется\n"
+    "DATABASE_NAME = os.environ.setdefault(\"SQL_TEST_DATABASE\", os.getenv(\"SQL_DATABASE\", \"app\"))\n"
+    "TEST_DATABASE = f\"{{DATABASE_NAME}}_test_{{WORKER}}\"\n\n"
+    "# database/database.py читает настройки при импорте, поэтому они задаются до импорта приложения\n"
+    "if os.getenv(\"SQL_TEST_BASE\"):\n"
+    "    os.environ[\"SQL_BASE\"] = os.environ[\"SQL_TEST_BASE\"]\n"
+    "    os.environ[\"SQL_DATABASE\"] = TEST_DATABASE\n"
+    "else:\n"
+    "    os.environ[\"SQL_BASE\"] = \"{sqlite_url}\"\n"
+    "{sqlite_sync_driver}"
+    "    os.environ[\"SQL_DATABASE\"] = str(Path(tempfile.gettempdir()) / f\"{{TEST_DATABASE}}.sqlite3\")\n"
+    "# Реплики в тестах не используются: чтение идёт из той же транзакции\n"
+    "os.environ[\"SQL_REPLICA_BASE\"] = \"\"\n\n"
+    "from database import database  # noqa: E402\n"
+    "from main import app  # noqa: E402\n\n"
+    "IS_SQLITE = database.engine.dialect.name == \"sqlite\"\n\n"
+    "def _sqlite_connect(dbapi_connection, connection_record):\n"
+    "    dbapi_connection.isolation_level = None\n\n"
+    "def _sqlite_begin(connection):\n"
+    "    connection.exec_driver_sql(\"BEGIN\")\n\n"
+    "if IS_SQLITE:\n"
+    "    # pysqlite сам управляет транзакциями и ломает SAVEPOINT: BEGIN выдаёт SQLAlchemy\n"
+    "    for _engine in ({sqlite_engines}):\n"
+    "        event.listen(_engine, \"connect\", _sqlite_connect)\n"
+    "        event.listen(_engine, \"begin\", _sqlite_begin)\n\n"
+    "def _override_db(session) -> dict:\n"
+    "    \"\"\"Подменить get_db (и get_read_db) на генератор, отдающий сессию теста.\"\"\"\n"
+    "{override_body}"
+    "    overrides = {{database.get_db: get_test_db}}\n"
+    "    if hasattr(database, \"get_read_db\"):\n"
+    "        overrides[database.get_read_db] = get_test_db\n"
+    "    return overrides\n\n"
+    "@pytest.fixture(scope=\"session\")\n"
+    "def client():\n"
+    "    \"\"\"Клиент приложения, один на воркер; таблицы создаются один раз перед первым тестом.\"\"\"\n"
+    "    import models  # noqa: F401 — регистрирует модели в Base.metadata\n\n"
+    "    if not IS_SQLITE:\n"
+    "        database.ensure_database()\n"
+    "    database.Base.metadata.drop_all(bind=database.{ddl_engine})\n"
+    "    database.Base.metadata.create_all(bind=database.{ddl_engine})\n"
+    "    with TestClient(app) as test_client:\n"
+    "        yield test_client\n"
+    "    database.Base.metadata.drop_all(bind=database.{ddl_engine})\n"
+    "    database.{ddl_engine}.dispose()\n"
+    "    if IS_SQLITE:\n"
+    "        # Файл временной БД воркера после тестов не нужен\n"
+    "        Path(os.environ[\"SQL_DATABASE\"]).unlink(missing_ok=True)\n\n"
+)
+
+SYNC_CONFTEST_FIXTURES = (
+    "@pytest.fixture(autouse=True)\n"
+    "def db_session(client):\n"
+    "    \"\"\"Сессия теста; всё, что запишут тест и приложение, откатывается после теста.\"\"\"\n"
+    "    connection = database.engine.connect()\n"
+    "    transaction = connection.begin()\n"
+    "    session = Session(bind=connection, join_transaction_mode=\"create_savepoint\", autoflush=False)\n"
+    "    overrides = _override_db(session)\n"
+    "    app.dependency_overrides.update(overrides)\n"
+    "    try:\n"
+    "        yield session\n"
+    "    finally:\n"
+    "        for dependency in overrides:\n"
+    "            app.dependency_overrides.pop(dependency, None)\n"
+    "        session.close()\n"
+    "        transaction.rollback()\n"
+    "        connection.close()\n\n"
+    "@pytest.fixture\n"
+    "def bulk(db_session):\n"
+    "    \"\"\"Создать пачку объектов фабрикой одним INSERT: bulk(ItemFactory, 1000, name=\"x\").\n\n"
+    "    Объекты собираются через build_batch без отдельных коммитов фабрики и\n"
+    "    записываются в транзакцию теста одним flush.\n"
+    "    \"\"\"\n\n"
+    "    def create(factory, size: int = 100, **kwargs):\n"
+    "        items = factory.build_batch(size, **kwargs)\n"
+    "        db_session.add_all(items)\n"
+    "        db_session.flush()\n"
+    "        return items\n\n"
+    "    return create\n"
+)
+
+ASYNC_CONFTEST_FIXTURES = (
+    "@pytest.fixture\n"
+    "def run(client):\n"
+    "    \"\"\"Выполнить корутину в цикле событий приложения: run(db_session.get, Item, 1).\n\n"
+    "    Асинхронные соединения привязаны к своему циклу, поэтому тест обращается\n"
+    "    к сессии через портал TestClient, а не через собственный цикл.\n"
+    "    \"\"\"\n"
+    "    return client.portal.call\n\n"
+    "@pytest.fixture(autouse=True)\n"
+    "def db_session(client):\n"
+    "    \"\"\"Сессия теста; всё, что запишут тест и приложение, откатывается после теста.\"\"\"\n\n"
+    "    async def begin():\n"
+    "        connection = await database.engine.connect()\n"
+    "        transaction = await connection.begin()\n"
+    "        session = AsyncSession(\n"
+    "            bind=connection,\n"
+    "            join_transaction_mode=\"create_savepoint\",\n"
+    "            autoflush=False,\n"
+    "            expire_on_commit=False,\n"
+    "        )\n"
+    "        return connection, transaction, session\n\n"
+    "    async def rollback():\n"
+    "        await session.close()\n"
+    "        await transaction.rollback()\n"
+    "        await connection.close()\n\n"
+    "    connection, transaction, session = client.portal.call(begin)\n"
+    "    overrides = _override_db(session)\n"
+    "    app.dependency_overrides.update(overrides)\n"
+    "    try:\n"
+    "        yield session\n"
+    "    finally:\n"
+    "        for dependency in overrides:\n"
+    "            app.dependency_overrides.pop(dependency, None)\n"
+    "        client.portal.call(rollback)\n\n"
+    "@pytest.fixture\n"
+    "def bulk(db_session, run):\n"
+    "    \"\"\"Создать пачку объектов фабрикой одним INSERT: bulk(ItemFactory, 1000, name=\"x\").\n\n"
+    "    Объекты собираются через build_batch без отдельных коммитов фабрики и\n"
+    "    записываются в транзакцию теста одним flush.\n"
+    "    \"\"\"\n\n"
+    "    def create(factory, size: int = 100, **kwargs):\n"
+    "        items = factory.build_batch(size, **kwargs)\n"
+    "        db_session.add_all(items)\n"
+    "        run(db_session.flush)\n"
+    "        return items\n\n"
+    "    return create\n"
 )
 
 
+@register_template("conftest", variants=("use_async",))
+def render_conftest(*, use_async: bool = True) -> str:
+    """Вернуть исходный код tests/conftest.py.
+
+    Фикстуры: client — TestClient на сессию воркера, db_session — откат
+    транзакции после каждого теста, bulk — пачка объектов из фабрик.
+    """
+    if use_async:
+        settings = CONFTEST_SETTINGS.format(
+            session_import="from sqlalchemy.ext.asyncio import AsyncSession\n",
+            sqlite_url="sqlite+aiosqlite://",
+            sqlite_sync_driver="    os.environ[\"SQL_SYNC_DRIVER\"] = \"sqlite\"\n",
+            # DDL идёт через sync_engine: ему нужен тот же обход pysqlite
+            sqlite_engines="database.engine.sync_engine, database.sync_engine",
+            override_body=(
+                "\n    async def get_test_db():\n"
+                "        yield session\n\n"
+            ),
+            ddl_engine="sync_engine",
+        )
+        return CONFTEST_DOC + settings + ASYNC_CONFTEST_FIXTURES
+    settings = CONFTEST_SETTINGS.format(
+        session_import="from sqlalchemy.orm import Session\n",
+        sqlite_url="sqlite://",
+        sqlite_sync_driver="",
+        sqlite_engines="database.engine,",
+        override_body=(
+            "\n    def get_test_db():\n"
+            "        yield session\n\n"
+        ),
+        ddl_engine="engine",
+    )
+    return CONFTEST_DOC + settings + SYNC_CONFTEST_FIXTURES
+
+
+@register_template("test")
+def render_test(name: str, *, api: bool = True) -> str:
+    """Вернуть исходный код теста на pytest с фикстурами из tests/conftest.py.
+
+    api=False — роут без эндпоинтов: тест проверяет только фабрику и БД.
+    """
+    snake_name = camel_to_snake(name)
+    header = f"from database.factories.{snake_name}_factory import {name}Factory\n\n"
+    if not api:
+        return (
+            header
+            + f"def test_bulk_{snake_name}(bulk):\n"
+            f"    items = bulk({name}Factory, 200)\n"
+            "    assert all(item.id is not None for item in items)\n\n"
+            f"# Добавьте проверки API через фикстуру client, когда в routes/{snake_name}_route.py\n"
+            "# появятся эндпоинты.\n"
+        )
+    return (
+        header
+        + f"def test_get_{snake_name}(client, bulk):\n"
+        f"    {snake_name} = bulk({name}Factory, 1)[0]\n"
+        f"    response = client.get(f\"/{snake_name}/{{{snake_name}.id}}\")\n"
+        "    assert response.status_code == 200\n"
+        f"    assert response.json()[\"id\"] == {snake_name}.id\n\n"
+        f"def test_get_{snake_name}_not_found(client):\n"
+        f"    response = client.get(\"/{snake_name}/0\")\n"
+        "    assert response.status_code == 404\n\n"
+        f"def test_list_{snake_name}(client, bulk):\n"
+        f"    bulk({name}Factory, 200)\n"
+        f"    response = client.get(\"/{snake_name}/\", params={{\"limit\": 50}})\n"
+        "    assert response.status_code == 200\n\n"
+        "# Добавляйте дополнительные тесты по мере развития приложения.\n"
+    )
+
+
+def ensure_conftest(path: Path, *, use_async: bool) -> bool:
+    """Создать tests/conftest.py, если его ещё нет. Вернуть True, если файл создан."""
+    file_path = path / CONFTEST
+    if file_path.exists():
+        return False
+    write_generated_file(file_path, render_conftest(use_async=use_async))
+    return True
+
+
 def make_test(name: str) -> None:
-    """Сгенерировать заготовку API-теста на pytest."""
+    """Сгенерировать API-тест на pytest и общие фикстуры tests/conftest.py."""
     path = BASE_DIR / "tests"
     create_folder_with_init(path)
     snake_name = camel_to_snake(name)
@@ -18,29 +255,14 @@ def make_test(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        "import pytest\n"
-        "from httpx import AsyncClient, ASGITransport\n\n"
-        "from main import app\n\n"
-        "transport = ASGITransport(app=app)\n"
-        "base_url = \"http://test\"\n\n"
-        "@pytest.mark.asyncio\n"
-        f"async def test_create_{snake_name}_success():\n"
-        "    async with AsyncClient(transport=transport, base_url=base_url) as ac:\n"
-        f"        response = await ac.post(\"/{snake_name}/create\", json={{\n"
-        "            \"name\": \"Тест\",\n"
-        "            \"email\": \"newuser@example.com\"\n"
-        "        })\n"
-        "    assert response.status_code == 200\n"
-        "    assert \"успешно\" in response.text\n\n"
-        "@pytest.mark.asyncio\n"
-        f"async def test_create_{snake_name}_invalid_email():\n"
-        "    async with AsyncClient(transport=transport, base_url=base_url) as ac:\n"
-        f"        response = await ac.post(\"/{snake_name}/create\", json={{\n"
-        "            \"name\": \"Тест\",\n"
-        "            \"email\": \"notanemail\"\n"
-        "        })\n"
-        "    assert response.status_code == 422\n\n"
-        "# Добавляйте дополнительные тесты по мере развития приложения.\n"
-    )
+    factory_file = BASE_DIR / "database" / "factories" / f"{snake_name}_factory.py"
+    if not factory_file.exists():
+        typer.echo(f"⚠️ Фабрика {name} не найдена: создайте её командой make-factory {name}")
+
+    route_file = BASE_DIR / "routes" / f"{snake_name}_route.py"
+    api = route_file.exists() and "@router.get(" in route_file.read_text()
+
+    if ensure_conftest(path, use_async=is_async_project()):
+        typer.echo("✅ Фикстуры tests/conftest.py созданы")
+    write_generated_file(file_path, render_test(name, api=api))
     typer.echo(f"✅ Тест {name} создан")
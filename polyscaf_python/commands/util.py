@@ -1,14 +1,28 @@
 import typer
 
 from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
 from polyscaf_python.utils import (
     camel_to_snake,
     check_file_exists,
     create_folder_with_init,
     create_git_ignore,
+    write_generated_file,
 )
 
 
+@register_template("util")
+def render_util(name: str) -> str:
+    """Вернуть исходный код вспомогательного модуля."""
+    return (
+        f"class {name}Util:\n"
+        f"    \"\"\"Вспомогательные методы для {name}.\"\"\"\n\n"
+        f"    @staticmethod\n"
+        f"    def example() -> str:\n"
+        f"        return '{name} util response'\n"
+    )
+
+
 def make_util(name: str) -> None:
     """Сгенерировать заглушку вспомогательного модуля."""
     path = BASE_DIR / "utils"
@@ -18,11 +32,5 @@ def make_util(name: str) -> None:
     check_file_exists(file_path)
     create_git_ignore(path)
 
-    file_path.write_text(
-        f"class {name}Util:\n"
-        f"    \"\"\"Вспомогательные методы для {name}.\"\"\"\n\n"
-        f"    @staticmethod\n"
-        f"    def example() -> str:\n"
-        f"        return '{name} util response'\n"
-    )
+    write_generated_file(file_path, render_util(name))
     typer.echo(f"✅ Утилита {name} создана")
@@ -0,0 +1,520 @@
+import typer
+
+from polyscaf_python.settings import BASE_DIR
+from polyscaf_python.templates import register_template
+from polyscaf_python.utils import (
+    check_file_exists,
+    create_folder_with_init,
+    create_git_ignore,
+    update_init_exports_many,
+    write_generated_file,
+)
+
+JOBS_TEMPLATE = '''"""Очередь фоновых задач: вынос тяжёлой работы из обработчиков запросов.
+
+Задача объявляется декоратором и ставится в очередь из сервиса:
+
+    from utils.jobs import job
+
+    @job(retries=5)
+    async def send_welcome_email(user_id: int) -> None: ...
+
+    @job(cpu=True)  # выполняется в пуле процессов
+    def build_report(report_id: int) -> None: ...
+
+    await send_welcome_email.delay(user.id)
+    build_report.delay_sync(42)  # из синхронного кода
+
+Аргументы задач должны сериализоваться в JSON. Обработчик задач —
+python -m scripts.worker. Настройки в .env:
+
+    JOBS_BROKER=sqlite              # sqlite (между процессами) или memory (в процессе)
+    JOBS_SQLITE_PATH=storage/jobs.sqlite3
+    JOBS_CONCURRENCY=8              # одновременно выполняемых задач на обработчик
+    JOBS_PROCESSES=0                # размер пула процессов для cpu=True (0 — по числу ядер)
+    JOBS_MAX_RETRIES=3
+    JOBS_RETRY_BACKOFF=2            # задержка повтора: backoff ** номер попытки, с
+    JOBS_POLL_INTERVAL=0.5
+    JOBS_METRICS_INTERVAL=30
+"""
+
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Protocol
+
+logger = logging.getLogger("jobs")
+
+BROKER = os.getenv("JOBS_BROKER", "sqlite")
+SQLITE_PATH = os.getenv("JOBS_SQLITE_PATH", "storage/jobs.sqlite3")
+CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "8"))
+PROCESSES = int(os.getenv("JOBS_PROCESSES", "0")) or (os.cpu_count() or 1)
+MAX_RETRIES = int(os.getenv("JOBS_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("JOBS_RETRY_BACKOFF", "2"))
+POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "0.5"))
+METRICS_INTERVAL = float(os.getenv("JOBS_METRICS_INTERVAL", "30"))
+
+
+@dataclass
+class Job:
+    """Задача в очереди."""
+
+    name: str
+    args: list = field(default_factory=list)
+    kwargs: dict = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    run_at: float = field(default_factory=time.time)
+    error: Optional[str] = None
+
+
+@dataclass
+class Task:
+    """Зарегистрированная функция задачи."""
+
+    name: str
+    function: Callable
+    retries: int
+    cpu: bool
+    timeout: Optional[float]
+
+
+registry: dict[str, Task] = {}
+
+
+class Broker(Protocol):
+    """Хранилище очереди задач."""
+
+    def enqueue_sync(self, job: Job) -> None:
+        """Поставить задачу в очередь (можно вызывать из любого потока)."""
+
+    async def reserve(self, timeout: float) -> Optional[Job]:
+        """Забрать готовую к выполнению задачу или вернуть None по таймауту."""
+
+    async def ack(self, job: Job) -> None:
+        """Отметить задачу выполненной."""
+
+    async def retry(self, job: Job, delay: float) -> None:
+        """Вернуть задачу в очередь через delay секунд."""
+
+    async def fail(self, job: Job) -> None:
+        """Отметить задачу окончательно упавшей."""
+
+
+class MemoryBroker:
+    """Очередь в памяти процесса: для запуска обработчика внутри приложения и тестов."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Job]] = []
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.failed: list[Job] = []
+
+    def enqueue_sync(self, job: Job) -> None:
+        with self._lock:
+            heapq.heappush(self._heap, (job.run_at, next(self._counter), job))
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def enqueue(self, job: Job) -> None:
+        self.enqueue_sync(job)
+
+    async def reserve(self, timeout: float) -> Optional[Job]:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+        deadline = time.monotonic() + timeout
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            with self._lock:
+                if self._heap and self._heap[0][0] <= now:
+                    return heapq.heappop(self._heap)[2]
+                wait = self._heap[0][0] - now if self._heap else timeout
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), min(wait, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def ack(self, job: Job) -> None:
+        pass
+
+    async def retry(self, job: Job, delay: float) -> None:
+        job.run_at = time.time() + delay
+        self.enqueue_sync(job)
+
+    async def fail(self, job: Job) -> None:
+        self.failed.append(job)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class SQLiteBroker:
+    """Очередь в файле SQLite: работает без сервера и между процессами приложения и обработчика."""
+
+    def __init__(self, path: str = SQLITE_PATH, visibility_timeout: float = 300.0) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, name TEXT NOT NULL, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'queued', attempts INTEGER NOT NULL DEFAULT 0, "
+            "run_at REAL NOT NULL, locked_at REAL, error TEXT)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_run_at ON jobs (status, run_at)")
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> None:
+        with self._lock:
+            self._connection.execute(sql, parameters)
+
+    def enqueue_sync(self, job: Job) -> None:
+        payload = json.dumps({"args": job.args, "kwargs": job.kwargs})
+        self._execute(
+            "INSERT INTO jobs (id, name, payload, attempts, run_at) VALUES (?, ?, ?, ?, ?)",
+            (job.id, job.name, payload, job.attempts, job.run_at),
+        )
+
+    async def enqueue(self, job: Job) -> None:
+        await asyncio.to_thread(self.enqueue_sync, job)
+
+    def _reserve_sync(self) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE: одну задачу не заберут два обработчика
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT id, name, payload, attempts, run_at FROM jobs "
+                    "WHERE status = 'queued' AND run_at <= ? ORDER BY run_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE jobs SET status = 'running', locked_at = ? WHERE id = ?", (now, row[0])
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        payload = json.loads(row[2])
+        return Job(name=row[1], args=payload["args"], kwargs=payload["kwargs"], id=row[0], attempts=row[3], run_at=row[4])
+
+    async def reserve(self, timeout: float) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await asyncio.to_thread(self._reserve_sync)
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    async def ack(self, job: Job) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM jobs WHERE id = ?", (job.id,))
+
+    async def retry(self, job: Job, delay: float) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = 'queued', attempts = ?, run_at = ?, locked_at = NULL, error = ? WHERE id = ?",
+            (job.attempts, time.time() + delay, job.error, job.id),
+        )
+
+    async def fail(self, job: Job) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+            (job.attempts, job.error, job.id),
+        )
+
+    def requeue_stale(self) -> None:
+        """Вернуть в очередь задачи, зависшие в running после падения обработчика."""
+        self._execute(
+            "UPDATE jobs SET status = 'queued', locked_at = NULL WHERE status = 'running' AND locked_at < ?",
+            (time.time() - self.visibility_timeout,),
+        )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+@functools.lru_cache(maxsize=None)
+def get_broker() -> Any:
+    """Брокер по настройке JOBS_BROKER (один на процесс)."""
+    if BROKER == "memory":
+        return MemoryBroker()
+    if BROKER == "sqlite":
+        return SQLiteBroker(SQLITE_PATH)
+    raise ValueError(f"Неизвестный JOBS_BROKER: {BROKER}")
+
+
+def _task_name(target: Any) -> str:
+    return target if isinstance(target, str) else f"{target.__module__}.{target.__qualname__}"
+
+
+def enqueue_sync(target: Any, *args: Any, delay: float = 0.0, broker: Any = None, **kwargs: Any) -> str:
+    """Поставить задачу в очередь из синхронного кода и вернуть её id."""
+    job = Job(name=_task_name(target), args=list(args), kwargs=kwargs, run_at=time.time() + delay)
+    (broker or get_broker()).enqueue_sync(job)
+    return job.id
+
+
+async def enqueue(target: Any, *args: Any, delay: float = 0.0, broker: Any = None, **kwargs: Any) -> str:
+    """Поставить задачу в очередь и вернуть её id."""
+    job = Job(name=_task_name(target), args=list(args), kwargs=kwargs, run_at=time.time() + delay)
+    await asyncio.to_thread((broker or get_broker()).enqueue_sync, job)
+    return job.id
+
+
+def job(
+    name: Optional[str] = None,
+    *,
+    retries: int = MAX_RETRIES,
+    cpu: bool = False,
+    timeout: Optional[float] = None,
+) -> Callable:
+    """Зарегистрировать функцию как задачу.
+
+    Функция возвращается без обёртки (иначе её нельзя передать в пул
+    процессов), к ней лишь добавляются методы delay и delay_sync.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if cpu and inspect.iscoroutinefunction(function):
+            raise TypeError("Задача cpu=True должна быть обычной функцией")
+        task_name = name or _task_name(function)
+        registry[task_name] = Task(task_name, function, retries, cpu, timeout)
+        function.delay = functools.partial(enqueue, task_name)
+        function.delay_sync = functools.partial(enqueue_sync, task_name)
+        return function
+
+    return decorator
+
+
+class JobMetrics:
+    """Счётчики обработчика: результаты, длительность и пропускная способность."""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.counts: Counter = Counter()
+        self.durations: dict[str, list[float]] = {}
+
+    def record(self, name: str, outcome: str, duration: float) -> None:
+        self.counts[outcome] += 1
+        total = self.durations.setdefault(name, [0, 0.0])
+        total[0] += 1
+        total[1] += duration
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "uptime_s": round(elapsed, 1),
+            **dict(self.counts),
+            "throughput_per_s": round(self.counts["succeeded"] / elapsed, 3),
+            "avg_ms": {name: round(total / count * 1000, 2) for name, (count, total) in self.durations.items()},
+        }
+
+
+class Worker:
+    """Обработчик: concurrency задач одновременно, cpu-задачи — в пуле процессов."""
+
+    def __init__(
+        self,
+        broker: Any = None,
+        *,
+        concurrency: int = CONCURRENCY,
+        processes: int = PROCESSES,
+        backoff: float = RETRY_BACKOFF,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        self.broker = broker or get_broker()
+        self.concurrency = concurrency
+        self.processes = processes
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.metrics = JobMetrics()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Остановить приём задач; выполняемые задачи завершатся."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        if hasattr(self.broker, "requeue_stale"):
+            self.broker.requeue_stale()
+        consumers = [asyncio.create_task(self._consume()) for _ in range(max(1, self.concurrency))]
+        reporter = asyncio.create_task(self._report())
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            reporter.cancel()
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            logger.info("Обработчик остановлен: %s", self.metrics.snapshot())
+
+    def start(self) -> "asyncio.Task":
+        """Запустить обработчик фоновой задачей (например, в lifespan приложения)."""
+        return asyncio.create_task(self.run())
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            logger.info("Задачи: %s", self.metrics.snapshot())
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            job = await self.broker.reserve(self.poll_interval)
+            if job is not None:
+                await self._execute(job)
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: дочерние процессы не наследуют соединения с БД и потоки родителя
+            self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def _call(self, task: Task, job: Job) -> Any:
+        call = functools.partial(task.function, *job.args, **job.kwargs)
+        if task.cpu:
+            return await asyncio.get_running_loop().run_in_executor(self._process_pool(), call)
+        if inspect.iscoroutinefunction(task.function):
+            return await call()
+        return await asyncio.to_thread(call)
+
+    async def _execute(self, job: Job) -> None:
+        task = registry.get(job.name)
+        if task is None:
+            job.error = f"Задача {job.name} не зарегистрирована"
+            await self.broker.fail(job)
+            self.metrics.record(job.name, "failed", 0.0)
+            logger.error(job.error)
+            return
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._call(task, job), task.timeout)
+        except Exception as error:
+            job.attempts += 1
+            job.error = f"{type(error).__name__}: {error}"
+            duration = time.perf_counter() - started
+            if job.attempts <= task.retries:
+                delay = self.backoff ** job.attempts
+                await self.broker.retry(job, delay)
+                self.metrics.record(job.name, "retried", duration)
+                logger.warning("Задача %s (%s) упала, повтор через %.1f с: %s", job.name, job.id, delay, job.error)
+            else:
+                await self.broker.fail(job)
+                self.metrics.record(job.name, "failed", duration)
+                logger.error("Задача %s (%s) исчерпала повторы: %s", job.name, job.id, job.error)
+            return
+        await self.broker.ack(job)
+        self.metrics.record(job.name, "succeeded", time.perf_counter() - started)
+'''
+
+WORKER_SCRIPT_TEMPLATE = '''"""Обработчик фоновых задач: python -m scripts.worker
+
+Модули с задачами (@job) перечисляются в JOBS_MODULES через запятую;
+по умолчанию импортируется пакет service.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from utils.jobs import Worker, registry  # noqa: E402 — настройки читаются из .env
+
+
+async def main() -> None:
+    for module in os.getenv("JOBS_MODULES", "service").split(","):
+        if module.strip():
+            importlib.import_module(module.strip())
+
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, worker.stop)
+        except (NotImplementedError, AttributeError):  # Windows
+            pass
+    logging.getLogger("jobs").info(
+        "Обработчик запущен: %d задач, concurrency=%d, processes=%d",
+        len(registry),
+        worker.concurrency,
+        worker.processes,
+    )
+    await worker.run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main())
+'''
+
+JOBS_EXPORTS = [
+    ("jobs", "Worker", None),
+    ("jobs", "enqueue", None),
+    ("jobs", "enqueue_sync", None),
+    ("jobs", "job", None),
+]
+
+
+@register_template("jobs")
+def render_jobs() -> str:
+    """Вернуть исходный код очереди задач."""
+    return JOBS_TEMPLATE
+
+
+@register_template("worker_script")
+def render_worker_script() -> str:
+    """Вернуть исходный код скрипта обработчика."""
+    return WORKER_SCRIPT_TEMPLATE
+
+
+def make_worker() -> None:
+    """Сгенерировать очередь фоновых задач и скрипт обработчика."""
+    utils_path = BASE_DIR / "utils"
+    scripts_path = BASE_DIR / "scripts"
+    jobs_file = utils_path / "jobs.py"
+    script_file = scripts_path / "worker.py"
+    check_file_exists(jobs_file)
+    check_file_exists(script_file)
+
+    for path in (utils_path, scripts_path):
+        create_folder_with_init(path)
+        create_git_ignore(path)
+
+    write_generated_file(jobs_file, render_jobs())
+    write_generated_file(script_file, render_worker_script())
+    update_init_exports_many(utils_path, JOBS_EXPORTS)
+    typer.echo("✅ Очередь задач создана: utils/jobs.py и scripts/worker.py")
@@ -0,0 +1,235 @@
+"""Индекс проекта: разобранные через ast модули models/, schemas/, service/ и routes/.
+
+Результат разбора кэшируется в __pycache__/polyscaf_index.json в корне
+проекта с ключом (mtime_ns, размер) для каждого файла. При обновлении
+заново разбираются только изменённые файлы, поэтому повторные запросы
+к индексу в большом проекте укладываются в миллисекунды.
+"""
+
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+INDEX_NAME = "polyscaf_index.json"
+INDEX_VERSION = 2
+
+# Разделы проекта, которые попадают в индекс
+INDEXED_DIRS = ("models", "schemas", "service", "routes")
+MAIN_FILE = "main.py"
+
+
+@dataclass
+class ModuleInfo:
+    """Сведения о модуле, извлечённые из его AST."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    classes: dict[str, list[str]] = field(default_factory=dict)
+    functions: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    router: bool = False
+    imports: list[tuple[str, str, Optional[str]]] = field(default_factory=list)
+    exports: Optional[list[str]] = None
+    included: list[str] = field(default_factory=list)
+    autowired: bool = False
+    error: Optional[str] = None
+
+    @property
+    def module(self) -> str:
+        """Имя модуля без расширения, например user_model."""
+        return Path(self.path).stem
+
+    @property
+    def symbols(self) -> set[str]:
+        """Имена, определённые или импортированные на уровне модуля."""
+        imported = {alias or symbol for _, symbol, alias in self.imports}
+        return {*self.classes, *self.functions, *self.names, *imported}
+
+
+def _dotted(node: ast.AST) -> str:
+    """Вернуть выражение вида a.b.c строкой или пустую строку."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted(node.value)
+        return f"{parent}.{node.attr}" if parent else ""
+    return ""
+
+
+def _is_router_call(node: Optional[ast.AST]) -> bool:
+    return isinstance(node, ast.Call) and _dotted(node.func).endswith("APIRouter")
+
+
+def _lazy_exports(node: ast.Dict) -> list[tuple[str, str, Optional[str]]]:
+    """Экспорты ленивого __init__.py: {"Alias": ("module", "symbol")}."""
+    exports: list[tuple[str, str, Optional[str]]] = []
+    for key, value in zip(node.keys, node.values):
+        if not (isinstance(key, ast.Constant) and isinstance(value, ast.Tuple) and len(value.elts) == 2):
+            continue
+        module, symbol = (element.value if isinstance(element, ast.Constant) else None for element in value.elts)
+        if isinstance(key.value, str) and isinstance(module, str) and isinstance(symbol, str):
+            exports.append((module, symbol, key.value if key.value != symbol else None))
+    return exports
+
+
+def parse_module(path: Path, rel_path: str, mtime_ns: int, size: int) -> ModuleInfo:
+    """Разобрать файл и собрать классы, функции, импорты, __all__ и роутеры."""
+    info = ModuleInfo(path=rel_path, mtime_ns=mtime_ns, size=size)
+    try:
+        tree = ast.parse(path.read_bytes(), filename=rel_path)
+    except (SyntaxError, ValueError) as error:
+        info.error = f"строка {getattr(error, 'lineno', '?')}: {getattr(error, 'msg', error)}"
+        return info
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            info.classes[node.name] = [_dotted(base) for base in node.bases]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            info.functions.append(node.name)
+        elif isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            for alias in node.names:
+                info.imports.append((node.module, alias.name, alias.asname))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id == "__all__" and isinstance(node.value, (ast.List, ast.Tuple)):
+                    info.exports = [
+                        element.value
+                        for element in node.value.elts
+                        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                    ]
+                    continue
+                info.names.append(target.id)
+                if target.id == "router" and _is_router_call(node.value):
+                    info.router = True
+                if target.id == "_EXPORTS" and isinstance(node.value, ast.Dict):
+                    info.imports.extend(_lazy_exports(node.value))
+
+    # Вызовы app.include_router(...) ищем по всему файлу: они бывают и внутри функций
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        function_name = _dotted(node.func).rsplit(".", 1)[-1]
+        if function_name == "include_router" and isinstance(node.func, ast.Attribute) and node.args:
+            info.included.append(_dotted(node.args[0]))
+        elif function_name == "include_routers":
+            info.autowired = True
+    return info
+
+
+class ProjectIndex:
+    """Кэшируемый индекс модулей проекта с инкрементальным обновлением."""
+
+    def __init__(self, root: Path, modules: Optional[dict[str, ModuleInfo]] = None) -> None:
+        self.root = root
+        self.path = root / "__pycache__" / INDEX_NAME
+        self.modules: dict[str, ModuleInfo] = dict(modules or {})
+        self.parsed = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path, *, refresh: bool = True) -> "ProjectIndex":
+        """Прочитать кэш индекса и, по умолчанию, обновить изменённые файлы."""
+        index_path = root / "__pycache__" / INDEX_NAME
+        modules: dict[str, ModuleInfo] = {}
+        if index_path.exists():
+            try:
+                data = json.loads(index_path.read_text())
+            except ValueError:
+                data = {}
+            if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+                for rel_path, raw in (data.get("files") or {}).items():
+                    raw["imports"] = [tuple(item) for item in raw.get("imports", [])]
+                    modules[rel_path] = ModuleInfo(**raw)
+        index = cls(root, modules)
+        if refresh:
+            index.refresh()
+        return index
+
+    def _scan(self) -> Iterator[tuple[str, str, os.stat_result]]:
+        for directory in INDEXED_DIRS:
+            try:
+                entries = list(os.scandir(self.root / directory))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                if entry.name.endswith(".py") and entry.is_file():
+                    yield f"{directory}/{entry.name}", entry.path, entry.stat()
+        main_path = self.root / MAIN_FILE
+        try:
+            yield MAIN_FILE, str(main_path), main_path.stat()
+        except FileNotFoundError:
+            return
+
+    def refresh(self) -> bool:
+        """Разобрать новые и изменённые файлы, удалить исчезнувшие; сохранить кэш при изменениях."""
+        seen: set[str] = set()
+        for rel_path, path, stat in self._scan():
+            seen.add(rel_path)
+            cached = self.modules.get(rel_path)
+            if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                continue
+            self.modules[rel_path] = parse_module(Path(path), rel_path, stat.st_mtime_ns, stat.st_size)
+            self.parsed += 1
+            self._dirty = True
+        for rel_path in set(self.modules) - seen:
+            del self.modules[rel_path]
+            self._dirty = True
+        if self._dirty:
+            self.save()
+        return self._dirty
+
+    def save(self) -> None:
+        """Записать кэш индекса; ошибки записи не мешают работе команды."""
+        payload: dict[str, Any] = {
+            "version": INDEX_VERSION,
+            "files": {rel_path: asdict(info) for rel_path, info in sorted(self.modules.items())},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(payload, ensure_ascii=False))
+            os.replace(temp_path, self.path)
+        except OSError:
+            return
+        self._dirty = False
+
+    def section(self, directory: str) -> list[ModuleInfo]:
+        """Модули раздела (без __init__.py), отсортированные по имени."""
+        prefix = f"{directory}/"
+        return [
+            info
+            for rel_path, info in sorted(self.modules.items())
+            if rel_path.startswith(prefix) and not rel_path.endswith("/__init__.py")
+        ]
+
+    def init(self, directory: str) -> Optional[ModuleInfo]:
+        """Сведения о __init__.py раздела, если он есть."""
+        return self.modules.get(f"{directory}/__init__.py")
+
+    def get(self, directory: str, module: str) -> Optional[ModuleInfo]:
+        """Сведения о модуле раздела по имени, например get("models", "user_model")."""
+        return self.modules.get(f"{directory}/{module}.py")
+
+    def main(self) -> Optional[ModuleInfo]:
+        """Сведения о main.py приложения."""
+        return self.modules.get(MAIN_FILE)
+
+    def classes(self, directory: str) -> dict[str, ModuleInfo]:
+        """Все классы раздела: имя класса -> модуль."""
+        return {name: info for info in self.section(directory) for name in info.classes}
+
+
+__all__ = [
+    "INDEXED_DIRS",
+    "INDEX_NAME",
+    "ModuleInfo",
+    "ProjectIndex",
+    "parse_module",
+]
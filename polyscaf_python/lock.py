@@ -0,0 +1,138 @@
+"""Lock-файл с хэшами сгенерированных файлов для инкрементальной регенерации."""
+
+import hashlib
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+LOCK_NAME = ".polyscaf.lock"
+LOCK_VERSION = 1
+
+# Статусы файла относительно lock-файла
+NEW = "new"
+UNCHANGED = "unchanged"
+UPDATE = "update"
+DRIFT = "drift"
+UNMANAGED = "unmanaged"
+
+
+def content_hash(content: str) -> str:
+    """Вернуть sha256 содержимого файла."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class LockFile:
+    """Хэши сгенерированных файлов проекта, хранящиеся в .polyscaf.lock."""
+
+    def __init__(self, root: Path, hashes: Optional[dict[str, str]] = None) -> None:
+        self.root = root
+        self.path = root / LOCK_NAME
+        self.hashes: dict[str, str] = dict(hashes or {})
+        self._saved = dict(self.hashes)
+
+    @classmethod
+    def load(cls, root: Path) -> "LockFile":
+        """Прочитать lock-файл; отсутствующий или повреждённый файл считается пустым."""
+        lock_path = root / LOCK_NAME
+        hashes: dict[str, str] = {}
+        if lock_path.exists():
+            try:
+                data = json.loads(lock_path.read_text())
+            except ValueError:
+                data = {}
+            if isinstance(data, dict) and data.get("version") == LOCK_VERSION:
+                hashes = dict(data.get("files") or {})
+        return cls(root, hashes)
+
+    def key(self, path: Path) -> str:
+        """Вернуть ключ файла в lock: путь относительно корня проекта."""
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def status(self, path: Path, content: str) -> str:
+        """Определить, что нужно сделать с файлом, чтобы он содержал content."""
+        if not path.exists():
+            return NEW
+        disk_hash = content_hash(path.read_text())
+        if disk_hash == content_hash(content):
+            return UNCHANGED
+        locked_hash = self.hashes.get(self.key(path))
+        if locked_hash is None:
+            return UNMANAGED
+        if locked_hash == disk_hash:
+            return UPDATE
+        return DRIFT
+
+    def record(self, path: Path, content: str) -> None:
+        """Запомнить хэш записанного сгенерированного файла."""
+        self.hashes[self.key(path)] = content_hash(content)
+
+    def drifted(self) -> list[Path]:
+        """Вернуть сгенерированные файлы, изменённые пользователем после генерации."""
+        result: list[Path] = []
+        for key, locked_hash in sorted(self.hashes.items()):
+            path = self.root / key
+            if path.exists() and content_hash(path.read_text()) != locked_hash:
+                result.append(path)
+        return result
+
+    def save(self) -> None:
+        """Записать lock-файл, только если набор хэшей изменился."""
+        if self.hashes == self._saved and self.path.exists():
+            return
+        payload = {"version": LOCK_VERSION, "files": dict(sorted(self.hashes.items()))}
+        self.path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+        self._saved = dict(self.hashes)
+
+
+# Lock-файлы, открытые в lock_batch(): корень проекта -> LockFile
+_batch: Optional[dict[Path, LockFile]] = None
+
+
+@contextmanager
+def lock_batch() -> Iterator[None]:
+    """Копить хэши record_generated_file и записать каждый lock-файл один раз в конце.
+
+    Команда, создающая N файлов, читает и пишет .polyscaf.lock один раз, а не N.
+    Lock-файл записывается и при ошибке: уже созданные файлы остаются учтёнными.
+    """
+    global _batch
+    if _batch is not None:
+        yield
+        return
+    _batch = {}
+    try:
+        yield
+    finally:
+        locks, _batch = _batch, None
+        for lock in locks.values():
+            lock.save()
+
+
+def record_generated_file(root: Path, path: Path, content: str) -> None:
+    """Добавить один сгенерированный файл в lock-файл проекта."""
+    if _batch is None:
+        lock = LockFile.load(root)
+        lock.record(path, content)
+        lock.save()
+        return
+    if root not in _batch:
+        _batch[root] = LockFile.load(root)
+    _batch[root].record(path, content)
+
+
+__all__ = [
+    "DRIFT",
+    "LOCK_NAME",
+    "LockFile",
+    "NEW",
+    "UNCHANGED",
+    "UNMANAGED",
+    "UPDATE",
+    "content_hash",
+    "lock_batch",
+    "record_generated_file",
+]
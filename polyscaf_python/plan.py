@@ -0,0 +1,186 @@
+"""Построение плана генерации по манифесту и его применение."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .lock import DRIFT, NEW, UNMANAGED, UPDATE, LockFile
+from .utils import (
+    camel_to_snake,
+    create_folder_with_init,
+    create_git_ignore,
+    has_read_replicas,
+    is_async_project,
+    update_init_exports_many,
+)
+
+MANIFEST_NAMES = ("polyscaf.toml", "polyscaf.yaml", "polyscaf.yml")
+
+Export = tuple[str, str, Optional[str]]
+
+
+@dataclass
+class Plan:
+    """Полный план генерации: папки, файлы и экспорты пакетов."""
+
+    root: Path
+    # Папка -> нужно ли создавать её как пакет database
+    folders: dict[Path, bool] = field(default_factory=dict)
+    files: dict[Path, str] = field(default_factory=dict)
+    exports: dict[Path, list[Export]] = field(default_factory=dict)
+    # Папки, которым нужен только .gitignore (например, корень проекта)
+    git_ignores: list[Path] = field(default_factory=list)
+    # Пакеты с ленивыми экспортами в __init__.py (routes при project.lazy_routes)
+    lazy_exports: list[Path] = field(default_factory=list)
+
+
+def find_manifest(base_dir: Path) -> Optional[Path]:
+    """Найти манифест polyscaf в директории проекта."""
+    for name in MANIFEST_NAMES:
+        candidate = base_dir / name
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    """Прочитать манифест в формате TOML или YAML."""
+    if path.suffix == ".toml":
+        import tomllib
+
+        with path.open("rb") as manifest_file:
+            return tomllib.load(manifest_file)
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as error:
+            raise ValueError("Для YAML-манифеста установите PyYAML: pip install pyyaml") from error
+        manifest = yaml.safe_load(path.read_text()) or {}
+        if not isinstance(manifest, dict):
+            raise ValueError(f"Манифест {path.name} должен быть таблицей с разделами project и entities")
+        return manifest
+    raise ValueError(f"Неизвестный формат манифеста: {path.name}")
+
+
+def _entity_specs(entities: Any) -> dict[str, tuple[list[str], dict[str, Any]]]:
+    """Нормализовать раздел entities в словарь имя -> (артефакты, настройки)."""
+    from .commands.resource import DEFAULT_PARTS, RESOURCE_PARTS
+
+    if isinstance(entities, list):
+        entities = {name: {} for name in entities}
+    if not isinstance(entities, dict):
+        raise ValueError("Раздел entities должен быть списком имён или таблицей")
+
+    result: dict[str, tuple[list[str], dict[str, Any]]] = {}
+    for name, spec in entities.items():
+        spec = spec or {}
+        if not isinstance(spec, dict):
+            raise ValueError(f"Настройки сущности {name} должны быть таблицей, получено: {spec!r}")
+        artifacts = spec.get("artifacts", list(DEFAULT_PARTS))
+        if not isinstance(artifacts, list):
+            raise ValueError(f"artifacts у {name} должен быть списком")
+        unknown = [artifact for artifact in artifacts if artifact not in RESOURCE_PARTS]
+        if unknown:
+            raise ValueError(f"Неизвестные артефакты у {name}: {', '.join(unknown)}")
+        result[name] = (list(artifacts), spec)
+    return result
+
+
+def build_plan(manifest: dict[str, Any], base_dir: Path) -> Plan:
+    """Собрать план генерации из манифеста, используя шаблоны команд make_*."""
+    from .commands.project import (
+        READ_REPLICA_EXPORTS,
+        project_folders,
+        render_project_files,
+        validate_project_name,
+    )
+    from .commands.resource import plan_resources, resource_options
+
+    plan = Plan(root=base_dir)
+    project = manifest.get("project") or {}
+    if not isinstance(project, dict):
+        raise ValueError("Раздел project должен быть таблицей")
+    use_async = bool(project.get("async", True)) if project else is_async_project(base_dir)
+    read_replicas = bool(project.get("read_replicas", False)) if project else has_read_replicas(base_dir)
+    if project:
+        project_name = validate_project_name(str(project.get("name", "")))
+        db_engine = project.get("database", "postgres")
+        if db_engine not in ("mysql", "postgres"):
+            raise ValueError("project.database должен быть mysql или postgres")
+        instrument = bool(project.get("instrument", False))
+        lazy_routes = bool(project.get("lazy_routes", False))
+        for folder in project_folders(instrument=instrument):
+            plan.folders[base_dir / folder] = folder == "database"
+        if lazy_routes:
+            plan.lazy_exports.append(base_dir / "routes")
+        if read_replicas:
+            plan.exports[base_dir / "database"] = list(READ_REPLICA_EXPORTS)
+        for relative_path, content in render_project_files(
+            camel_to_snake(project_name),
+            db_engine,
+            use_async=use_async,
+            instrument=instrument,
+            lazy_routes=lazy_routes,
+            read_replicas=read_replicas,
+        ).items():
+            plan.files[base_dir / relative_path] = content
+        plan.git_ignores.append(base_dir)
+
+    for name, (artifacts, spec) in _entity_specs(manifest.get("entities") or {}).items():
+        options = resource_options(
+            use_async=use_async,
+            read_replicas=read_replicas,
+            service_template=spec.get("service_template", project.get("service_template", "basic")),
+            route_template=spec.get("route_template", project.get("route_template", "basic")),
+            fields=spec.get("fields"),
+            indexes=spec.get("indexes"),
+        )
+        files, exports = plan_resources([name], artifacts, base_dir=base_dir, options=options)
+        plan.files.update(files)
+        for directory, directory_exports in exports.items():
+            plan.folders.setdefault(directory, False)
+            plan.exports.setdefault(directory, []).extend(directory_exports)
+    return plan
+
+
+def apply_plan(plan: Plan, *, workers: int = 8) -> dict[str, list[Path]]:
+    """Применить план: записать только изменившиеся файлы и обновить __init__.py.
+
+    Файлы сверяются с .polyscaf.lock: совпадающие с шаблоном пропускаются,
+    а изменённые пользователем (drift) не перезаписываются. Возвращает
+    пути файлов, сгруппированные по статусу из polyscaf_python.lock.
+    """
+    for folder, is_database in plan.folders.items():
+        create_folder_with_init(folder, is_database=is_database)
+        create_git_ignore(folder)
+    for folder in plan.git_ignores:
+        create_git_ignore(folder)
+
+    lock = LockFile.load(plan.root)
+
+    def sync(item: tuple[Path, str]) -> tuple[Path, str]:
+        path, content = item
+        status = lock.status(path, content)
+        if status in (NEW, UPDATE):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return path, status
+
+    result: dict[str, list[Path]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for path, status in executor.map(sync, plan.files.items()):
+            result.setdefault(status, []).append(path)
+            if status not in (DRIFT, UNMANAGED):
+                lock.record(path, plan.files[path])
+    lock.save()
+
+    for directory in plan.lazy_exports:
+        update_init_exports_many(directory, plan.exports.get(directory, []), lazy=True)
+    for directory, exports in plan.exports.items():
+        if exports and directory not in plan.lazy_exports:
+            update_init_exports_many(directory, exports)
+    return result
+
+
+__all__ = ["MANIFEST_NAMES", "Plan", "apply_plan", "build_plan", "find_manifest", "load_manifest"]
@@ -0,0 +1,304 @@
+"""Реестр шаблонов генерируемых файлов с пользовательскими переопределениями.
+
+Встроенные шаблоны — функции render_* в модулях команд, зарегистрированные
+декоратором register_template(). Любой из них можно заменить файлом
+<имя>[.<вариант>...].tmpl в одной из папок (по приоритету):
+
+    <проект>/.polyscaf/templates
+    пути из переменной POLYSCAF_TEMPLATES (через os.pathsep)
+    ~/.config/polyscaf/templates
+
+Файл шаблона использует синтаксис string.Template: $name, ${snake_name},
+$$ для знака доллара. Переменная $default подставляет результат встроенного
+шаблона, поэтому переопределение может дополнить его, а не копировать.
+Варианты уточняют шаблон: route.stream.async.tmpl важнее route.stream.tmpl,
+который важнее route.tmpl.
+
+Шаблон компилируется в функцию Python один раз: байткод кэшируется на диске
+(~/.cache/polyscaf/templates) под sha256 текста шаблона, а в пределах
+процесса — в памяти, поэтому пользовательские шаблоны не медленнее встроенных.
+"""
+
+import functools
+import hashlib
+import inspect
+import marshal
+import os
+import string
+import sys
+import types
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from .settings import BASE_DIR
+from .utils import camel_to_snake
+
+TEMPLATE_SUFFIX = ".tmpl"
+PROJECT_TEMPLATE_DIR = Path(".polyscaf") / "templates"
+# Меняется вместе с форматом скомпилированного кода, чтобы не читать старый кэш
+COMPILER_VERSION = "1"
+
+Renderer = Callable[[dict[str, Any], Callable[[], str]], str]
+F = TypeVar("F", bound=Callable[..., str])
+
+
+class TemplateError(ValueError):
+    """Ошибка в пользовательском шаблоне."""
+
+
+def _config_home() -> Path:
+    return Path(os.getenv("XDG_CONFIG_HOME") or Path.home() / ".config")
+
+
+def _cache_home() -> Path:
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+
+
+def template_dirs(base_dir: Optional[Path] = None) -> list[Path]:
+    """Папки с пользовательскими шаблонами в порядке приоритета."""
+    dirs = [(base_dir or BASE_DIR) / PROJECT_TEMPLATE_DIR]
+    dirs += [Path(item) for item in os.getenv("POLYSCAF_TEMPLATES", "").split(os.pathsep) if item]
+    dirs.append(_config_home() / "polyscaf" / "templates")
+    return dirs
+
+
+def cache_dir() -> Path:
+    """Папка с байткодом скомпилированных шаблонов."""
+    return Path(os.getenv("POLYSCAF_TEMPLATE_CACHE") or _cache_home() / "polyscaf" / "templates")
+
+
+def _template_source(source: str) -> str:
+    """Преобразовать шаблон в исходный код функции render(context, default)."""
+    parts: list[str] = []
+    position = 0
+    for match in string.Template.pattern.finditer(source):
+        if match.start() > position:
+            parts.append(repr(source[position : match.start()]))
+        position = match.end()
+        if match.group("escaped") is not None:
+            parts.append(repr("$"))
+            continue
+        key = match.group("named") or match.group("braced")
+        if key is None:
+            line = source.count("\n", 0, match.start()) + 1
+            raise TemplateError(f"некорректная подстановка в строке {line}")
+        parts.append("default()" if key == "default" else f"str(context[{key!r}])")
+    if position < len(source):
+        parts.append(repr(source[position:]))
+    return "def render(context, default):\n    return ''.join((" + ", ".join(parts) + (",))\n" if parts else "))\n")
+
+
+def template_hash(source: str) -> str:
+    """Ключ кэша: текст шаблона, версия компилятора и интерпретатора."""
+    key = f"{COMPILER_VERSION}\0{sys.implementation.cache_tag}\0{source}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+_compiled: dict[str, Renderer] = {}
+
+
+def compile_template(source: str, *, filename: str = "<template>") -> Renderer:
+    """Скомпилировать шаблон или взять готовую функцию из кэша в памяти и на диске."""
+    digest = template_hash(source)
+    renderer = _compiled.get(digest)
+    if renderer is not None:
+        return renderer
+
+    cache_path = cache_dir() / f"{digest}.bin"
+    code = None
+    try:
+        code = marshal.loads(cache_path.read_bytes())
+    except (OSError, ValueError, EOFError, TypeError):
+        code = None
+    # Повреждённый файл может разобраться в другой объект marshal: такой кэш пересобираем
+    if not isinstance(code, types.CodeType):
+        try:
+            code = compile(_template_source(source), filename, "exec")
+        except TemplateError as error:
+            raise TemplateError(f"Шаблон {filename}: {error}") from None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(marshal.dumps(code))
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # Кэш на диске — только ускорение: без прав на запись работаем без него
+            pass
+
+    namespace: dict[str, Any] = {}
+    exec(code, namespace)
+    renderer = namespace["render"]
+    _compiled[digest] = renderer
+    return renderer
+
+
+def _variant_names(name: str, variants: Iterable[str]) -> list[str]:
+    """Имена файлов-кандидатов от самого специфичного варианта к общему."""
+    variants = [variant for variant in variants if variant]
+    names: list[str] = []
+    for size in range(len(variants), -1, -1):
+        for chosen in combinations(variants, size):
+            names.append(".".join((name, *chosen)) + TEMPLATE_SUFFIX)
+    return names
+
+
+class TemplateRegistry:
+    """Встроенные шаблоны и поиск их переопределений в пользовательских папках."""
+
+    def __init__(self, dirs: Optional[list[Path]] = None) -> None:
+        self._dirs = dirs
+        self._listings: Optional[list[tuple[Path, set[str]]]] = None
+        self._overridden: dict[str, bool] = {}
+        self._renderers: dict[Path, Renderer] = {}
+        self.builtins: dict[str, tuple[str, ...]] = {}
+
+    @property
+    def dirs(self) -> list[Path]:
+        return self._dirs if self._dirs is not None else template_dirs()
+
+    def listing(self) -> list[tuple[Path, set[str]]]:
+        """Файлы шаблонов в каждой непустой папке переопределений.
+
+        Содержимое папок читается один раз за процесс, поэтому пакетная
+        генерация не делает лишних обращений к диску.
+        """
+        if self._listings is None:
+            self._listings = []
+            for directory in self.dirs:
+                names: set[str] = set()
+                for root, _, files in os.walk(directory):
+                    prefix = Path(root).relative_to(directory)
+                    names.update((prefix / file).as_posix() for file in files if file.endswith(TEMPLATE_SUFFIX))
+                if names:
+                    self._listings.append((directory, names))
+        return self._listings
+
+    def reset(self) -> None:
+        """Забыть прочитанное содержимое папок с шаблонами."""
+        self._listings = None
+        self._overridden.clear()
+        self._renderers.clear()
+
+    def register(self, name: str, variants: tuple[str, ...] = ()) -> None:
+        """Запомнить встроенный шаблон и параметры, задающие его варианты."""
+        self.builtins[name] = variants
+
+    def is_overridden(self, name: str) -> bool:
+        """Есть ли хотя бы один файл переопределения шаблона (с любым вариантом)."""
+        overridden = self._overridden.get(name)
+        if overridden is None:
+            prefix = f"{name}."
+            overridden = any(
+                file_name.startswith(prefix) for _, names in self.listing() for file_name in names
+            )
+            self._overridden[name] = overridden
+        return overridden
+
+    def find(self, name: str, variants: Iterable[str] = ()) -> Optional[Path]:
+        """Найти файл, переопределяющий шаблон, или вернуть None."""
+        listings = self.listing()
+        if not listings:
+            return None
+        for candidate in _variant_names(name, variants):
+            for directory, names in listings:
+                if candidate in names:
+                    return directory / candidate
+        return None
+
+    def render(
+        self,
+        name: str,
+        default: Callable[[], str],
+        context: dict[str, Any],
+        variants: Iterable[str] = (),
+    ) -> str:
+        """Отрисовать переопределение шаблона, а если его нет — встроенный шаблон."""
+        path = self.find(name, variants) if self.is_overridden(name) else None
+        if path is None:
+            return default()
+        renderer = self._renderers.get(path)
+        if renderer is None:
+            renderer = compile_template(path.read_text(encoding="utf-8"), filename=str(path))
+            self._renderers[path] = renderer
+        try:
+            return renderer(context, default)
+        except KeyError as error:
+            available = ", ".join(f"${key}" for key in sorted(context)) + ", $default"
+            raise TemplateError(
+                f"В шаблоне {path} неизвестная переменная ${error.args[0]}. Доступны: {available}"
+            ) from None
+
+
+registry = TemplateRegistry()
+
+
+def variant_values(values: dict[str, Any], variants: Iterable[str]) -> list[str]:
+    """Значения параметров-вариантов: use_async даёт async/sync, basic и None пропускаются."""
+    result: list[str] = []
+    for parameter in variants:
+        value = values.get(parameter)
+        if parameter == "use_async":
+            result.append("async" if value else "sync")
+        elif value not in (None, "basic"):
+            result.append(str(value))
+    return result
+
+
+def template_context(**values: Any) -> dict[str, Any]:
+    """Переменные шаблона: переданные значения и производные имена."""
+    context = dict(values)
+    name = context.get("name")
+    if isinstance(name, str):
+        context.setdefault("snake_name", camel_to_snake(name))
+    if "use_async" in context:
+        use_async = context["use_async"]
+        context.setdefault("adef", "async def" if use_async else "def")
+        context.setdefault("aw", "await " if use_async else "")
+        context.setdefault("session_class", "AsyncSession" if use_async else "Session")
+    return context
+
+
+def register_template(name: str, *, variants: tuple[str, ...] = ()) -> Callable[[F], F]:
+    """Зарегистрировать функцию render_* как встроенный шаблон name.
+
+    variants — параметры функции, значения которых выбирают вариант файла
+    переопределения (use_async даёт async/sync, остальные — своё значение).
+    """
+
+    def decorator(render: F) -> F:
+        signature = inspect.signature(render)
+        registry.register(name, variants)
+
+        @functools.wraps(render)
+        def wrapper(*args: Any, **kwargs: Any) -> str:
+            if not registry.is_overridden(name):
+                return render(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = bound.arguments
+            return registry.render(
+                name,
+                lambda: render(*args, **kwargs),
+                template_context(**values),
+                variant_values(values, variants),
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+__all__ = [
+    "TEMPLATE_SUFFIX",
+    "TemplateError",
+    "TemplateRegistry",
+    "cache_dir",
+    "compile_template",
+    "register_template",
+    "registry",
+    "template_context",
+    "template_dirs",
+    "template_hash",
+    "variant_values",
+]
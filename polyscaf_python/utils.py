@@ -1,18 +1,43 @@
+import re
 from pathlib import Path
-from typing import Any, Optional, cast
+from typing import Any, Iterable, Optional, cast
 import typer
-import inflect
 
 from .settings import BASE_DIR
 
 AUTO_SECTION_START = "# polyscaf: auto-managed imports (start)"
 AUTO_SECTION_END = "# polyscaf: auto-managed imports (end)"
 
-_inflect_engine = inflect.engine()
+# Строка ленивого экспорта в __init__.py: "Alias": ("module", "symbol"),
+_LAZY_EXPORT_LINE = re.compile(r'^"(\w+)": \("(\w+)", "(\w+)"\),$')
+
+_LAZY_EXPORTS_TEMPLATE = (
+    "from importlib import import_module\n\n"
+    "_EXPORTS: dict[str, tuple[str, str]] = {{\n"
+    "{entries}"
+    "}}\n\n\n"
+    "def __getattr__(name: str):\n"
+    "    # Модуль импортируется при первом обращении к имени, а не при импорте пакета\n"
+    "    try:\n"
+    "        module_name, symbol = _EXPORTS[name]\n"
+    "    except KeyError:\n"
+    "        raise AttributeError(f\"module {{__name__!r}} has no attribute {{name!r}}\") from None\n"
+    "    value = getattr(import_module(f\".{{module_name}}\", __name__), symbol)\n"
+    "    globals()[name] = value\n"
+    "    return value\n\n\n"
+)
+
+_inflect_engine: Optional[Any] = None
 
 
 def pluralize(name: str) -> str:
     """Вернуть множественную форму имени с помощью inflect."""
+    global _inflect_engine
+    if _inflect_engine is None:
+        # inflect тяжёлый при импорте, поэтому создаём движок при первом вызове
+        import inflect
+
+        _inflect_engine = inflect.engine()
     return _inflect_engine.plural(cast(Any, name))
 
 
@@ -28,7 +53,7 @@ def create_folder_with_init(path: Path, *, is_database: bool = False) -> None:
     if not init_path.exists():
         content = ""
         if is_database:
-            content += "from .database import SessionLocal, engine, Base\n\n"
+            content += "from .database import SessionLocal, engine, Base, get_db\n\n"
         content += f"{AUTO_SECTION_START}\n{AUTO_SECTION_END}\n"
         init_path.write_text(content)
 
@@ -48,6 +73,32 @@ def check_file_exists(file_path: Path) -> None:
         raise typer.Exit()
 
 
+def write_generated_file(file_path: Path, content: str) -> None:
+    """Записать сгенерированный файл и запомнить его хэш в .polyscaf.lock."""
+    from .lock import record_generated_file
+
+    file_path.write_text(content)
+    record_generated_file(BASE_DIR, file_path, content)
+
+
+def is_async_project(base_dir: Optional[Path] = None) -> bool:
+    """Определить, использует ли проект асинхронный слой БД.
+
+    Новые проекты по умолчанию асинхронные, поэтому при отсутствии
+    database/database.py возвращается True.
+    """
+    database_file = (base_dir or BASE_DIR) / "database" / "database.py"
+    if not database_file.exists():
+        return True
+    return "create_async_engine" in database_file.read_text()
+
+
+def has_read_replicas(base_dir: Optional[Path] = None) -> bool:
+    """Определить, создан ли проект с репликами для чтения (make-project --read-replicas)."""
+    database_file = (base_dir or BASE_DIR) / "database" / "database.py"
+    return database_file.exists() and "def get_read_db" in database_file.read_text()
+
+
 def camel_to_snake(name: str) -> str:
     """Преобразовать CamelCase в snake_case."""
     snake_case: list[str] = []
@@ -66,6 +117,21 @@ def update_init_exports(
     alias: Optional[str] = None,
 ) -> None:
     """Добавить экспорт модуля в __init__.py и синхронизировать __all__."""
+    update_init_exports_many(directory, [(module_name, symbol_name, alias)])
+
+
+def update_init_exports_many(
+    directory: Path,
+    exports: Iterable[tuple[str, str, Optional[str]]],
+    *,
+    lazy: Optional[bool] = None,
+) -> None:
+    """Добавить несколько экспортов в __init__.py за одну перезапись файла.
+
+    lazy=True переводит управляемый блок в ленивый формат: модули
+    импортируются через __getattr__ пакета при первом обращении к имени.
+    По умолчанию сохраняется текущий формат файла.
+    """
     ensure_directory(directory)
     init_path = directory / "__init__.py"
     if not init_path.exists():
@@ -91,11 +157,19 @@ def update_init_exports(
         start_index + len(AUTO_SECTION_START) : end_index
     ]
 
+    if lazy is None:
+        lazy = "_EXPORTS" in managed_segment
+
     entries: dict[str, tuple[str, str, Optional[str]]] = {}
     for raw_line in managed_segment.splitlines():
         line = raw_line.strip()
         if not line or line.startswith("__all__"):
             continue
+        lazy_match = _LAZY_EXPORT_LINE.match(line)
+        if lazy_match:
+            key, module, symbol = lazy_match.groups()
+            entries[key] = (module, symbol, key if key != symbol else None)
+            continue
         if line.startswith("from ."):
             parts = line.replace(",", " ").split()
             if len(parts) >= 4 and parts[2] == "import":
@@ -109,18 +183,25 @@ def update_init_exports(
                 key = (import_alias or symbol).strip()
                 entries[key] = (module, symbol.strip(), import_alias)
 
-    key_name = alias or symbol_name
-    entries[key_name] = (module_name, symbol_name, alias)
+    for module_name, symbol_name, alias in exports:
+        entries[alias or symbol_name] = (module_name, symbol_name, alias)
 
     managed_lines: list[str] = []
-    if entries:
+    if lazy:
+        lazy_entries = "".join(
+            f'    "{key}": ("{entries[key][0]}", "{entries[key][1]}"),\n' for key in sorted(entries)
+        )
+        managed_lines.extend(_LAZY_EXPORTS_TEMPLATE.format(entries=lazy_entries).splitlines())
+    else:
         for key in sorted(entries):
             module, symbol, import_alias = entries[key]
             if import_alias:
                 managed_lines.append(f"from .{module} import {symbol} as {import_alias}")
             else:
                 managed_lines.append(f"from .{module} import {symbol}")
-        managed_lines.append("")
+        if entries:
+            managed_lines.append("")
+    if entries:
         managed_lines.append("__all__ = [")
         for key in sorted(entries):
             managed_lines.append(f'    "{key}",')
@@ -136,7 +217,9 @@ def update_init_exports(
     )
     if not new_content.endswith("\n"):
         new_content += "\n"
-    init_path.write_text(new_content)
+    # Не трогаем файл без изменений, чтобы не сбивать mtime для --reload и кэшей
+    if new_content != existing_content:
+        init_path.write_text(new_content)
 
 
 __all__ = [
@@ -146,7 +229,11 @@ __all__ = [
     "create_folder_with_init",
     "create_git_ignore",
     "ensure_directory",
+    "has_read_replicas",
+    "is_async_project",
     "update_init_exports",
+    "update_init_exports_many",
+    "write_generated_file",
     "pluralize",
     "AUTO_SECTION_START",
     "AUTO_SECTION_END",
@@ -0,0 +1,56 @@
+"""Бюджет холодного старта CLI: модули команд и inflect не импортируются заранее."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from polyscaf_python.commands import COMMANDS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые не должны загружаться, пока команда не вызвана
+LAZY_MODULES = {
+    "inflect",
+    "polyscaf_python.templates",
+    *(f"polyscaf_python.commands.{module}" for module, _, _ in COMMANDS.values()),
+}
+
+PRINT_MODULES = "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+
+
+def imported_modules(code: str) -> set[str]:
+    """Модули, загруженные в чистом процессе после выполнения code."""
+    result = subprocess.run(
+        [sys.executable, "-c", code + PRINT_MODULES],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+CLI_HELP = (
+    "import sys\n"
+    "import main\n"
+    "sys.argv = ['polyscaf', '--help']\n"
+    "try:\n"
+    "    main.main()\n"
+    "except SystemExit:\n"
+    "    pass"
+)
+
+
+@pytest.mark.parametrize("code", ["import main", CLI_HELP], ids=["import", "help"])
+def test_cold_start_skips_command_modules(code):
+    assert not LAZY_MODULES & imported_modules(code)
+
+
+def test_command_imports_only_its_module():
+    modules = imported_modules("from polyscaf_python.commands import load_command\nload_command('make-util')")
+    assert "polyscaf_python.commands.util" in modules
+    # Шаблоны нужны самой команде, остальные модули команд — нет
+    assert not (LAZY_MODULES - {"polyscaf_python.commands.util", "polyscaf_python.templates"}) & modules
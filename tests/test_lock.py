@@ -0,0 +1,130 @@
+"""Lock-файл: статусы файлов, чтение повреждённого lock и пакетная запись."""
+
+import json
+import os
+
+import pytest
+
+from polyscaf_python import lock
+from polyscaf_python.lock import (
+    DRIFT,
+    LOCK_NAME,
+    NEW,
+    UNCHANGED,
+    UNMANAGED,
+    UPDATE,
+    LockFile,
+    content_hash,
+    lock_batch,
+    record_generated_file,
+)
+
+
+def generated(root, name: str, content: str):
+    """Записать файл так, как это делает генератор, и учесть его в lock."""
+    path = root / name
+    path.write_text(content)
+    record_generated_file(root, path, content)
+    return path
+
+
+def test_status_of_missing_file_is_new(tmp_path):
+    assert LockFile.load(tmp_path).status(tmp_path / "model.py", "x = 1\n") == NEW
+
+
+def test_status_of_identical_file_is_unchanged(tmp_path):
+    path = generated(tmp_path, "model.py", "x = 1\n")
+    assert LockFile.load(tmp_path).status(path, "x = 1\n") == UNCHANGED
+
+
+def test_status_of_untouched_generated_file_is_update(tmp_path):
+    path = generated(tmp_path, "model.py", "x = 1\n")
+    assert LockFile.load(tmp_path).status(path, "x = 2\n") == UPDATE
+
+
+def test_status_of_hand_edited_file_is_drift(tmp_path):
+    path = generated(tmp_path, "model.py", "x = 1\n")
+    path.write_text("x = 1  # правка пользователя\n")
+    lock_file = LockFile.load(tmp_path)
+    assert lock_file.status(path, "x = 2\n") == DRIFT
+    assert lock_file.drifted() == [path]
+
+
+def test_status_of_file_unknown_to_lock_is_unmanaged(tmp_path):
+    path = tmp_path / "model.py"
+    path.write_text("x = 1\n")
+    assert LockFile.load(tmp_path).status(path, "x = 2\n") == UNMANAGED
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "{не json",
+        "[]",
+        json.dumps({"version": 0, "files": {"model.py": content_hash("x = 1\n")}}),
+    ],
+    ids=["corrupt", "not-object", "old-version"],
+)
+def test_unreadable_lock_is_empty(tmp_path, text):
+    (tmp_path / LOCK_NAME).write_text(text)
+    path = tmp_path / "model.py"
+    path.write_text("x = 1\n")
+    lock_file = LockFile.load(tmp_path)
+    assert lock_file.hashes == {}
+    assert lock_file.status(path, "x = 2\n") == UNMANAGED
+
+
+def test_save_skips_unchanged_lock(tmp_path):
+    generated(tmp_path, "model.py", "x = 1\n")
+    lock_path = tmp_path / LOCK_NAME
+    os.utime(lock_path, ns=(0, 0))
+
+    lock_file = LockFile.load(tmp_path)
+    lock_file.record(tmp_path / "model.py", "x = 1\n")
+    lock_file.save()
+    assert lock_path.stat().st_mtime_ns == 0
+
+    lock_file.record(tmp_path / "model.py", "x = 2\n")
+    lock_file.save()
+    assert lock_path.stat().st_mtime_ns != 0
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    """Считать вызовы LockFile.save."""
+    calls = []
+    original = LockFile.save
+
+    def save(self):
+        calls.append(self.root)
+        original(self)
+
+    monkeypatch.setattr(LockFile, "save", save)
+    return calls
+
+
+def test_lock_batch_saves_once(tmp_path, saves):
+    with lock_batch():
+        for index in range(5):
+            generated(tmp_path, f"model_{index}.py", f"x = {index}\n")
+        with lock_batch():
+            generated(tmp_path, "nested.py", "y = 1\n")
+        assert saves == []
+    assert saves == [tmp_path]
+    assert len(LockFile.load(tmp_path).hashes) == 6
+    assert lock._batch is None
+
+
+def test_lock_batch_saves_on_error(tmp_path, saves):
+    with pytest.raises(RuntimeError):
+        with lock_batch():
+            generated(tmp_path, "model.py", "x = 1\n")
+            raise RuntimeError("сбой команды")
+    assert saves == [tmp_path]
+    assert LockFile.load(tmp_path).hashes == {"model.py": content_hash("x = 1\n")}
+    assert lock._batch is None
+
+
+def test_record_without_batch_saves_immediately(tmp_path, saves):
+    generated(tmp_path, "model.py", "x = 1\n")
+    assert saves == [tmp_path]
@@ -0,0 +1,60 @@
+"""Модель: описание полей переживает render_model и чтение обратно через model_fields."""
+
+import pytest
+
+from polyscaf_python.commands.model import model_fields, parse_field, render_model
+
+FIELDS = [
+    "title:str(120) index",
+    "email:str(255) unique",
+    "score:int null default=0",
+    "price:decimal(10,2)",
+    "author:fk(Author) null lazy=selectin ondelete=cascade",
+    "owner:fk(User) unique lazy=joined back=posts",
+    "tags:many(Tag) lazy=selectin",
+]
+
+
+def write_model(root, content: str) -> None:
+    models = root / "models"
+    models.mkdir(exist_ok=True)
+    (models / "post_model.py").write_text(content)
+
+
+@pytest.mark.parametrize("use_async", [True, False], ids=["async", "sync"])
+def test_fields_round_trip(tmp_path, use_async):
+    content = render_model("Post", FIELDS, ["owner_id,created_at"], use_async=use_async)
+    write_model(tmp_path, content)
+
+    fields = model_fields("Post", tmp_path)
+    assert [parse_field(spec) for spec in fields] == [parse_field(spec) for spec in FIELDS]
+    assert render_model("Post", fields, ["owner_id,created_at"], use_async=use_async) == content
+
+
+def test_default_lazy_round_trips_to_same_model(tmp_path):
+    content = render_model("Post", ["author:fk(Author)", "tags:many(Tag)"])
+    write_model(tmp_path, content)
+    assert render_model("Post", model_fields("Post", tmp_path)) == content
+
+
+def test_missing_model_has_no_fields(tmp_path):
+    assert model_fields("Post", tmp_path) is None
+
+
+def fk_column(content: str) -> str:
+    return next(line for line in content.splitlines() if line.strip().startswith("user_id:"))
+
+
+def test_foreign_key_is_indexed():
+    assert "index=True" in fk_column(render_model("Order", ["user:fk(User)", "total:int"]))
+
+
+def test_composite_index_covers_foreign_key():
+    content = render_model("Order", ["user:fk(User)", "total:int"], ["user_id,total"])
+    assert 'Index("ix_orders_user_id_total", "user_id", "total")' in content
+    assert "index=True" not in fk_column(content)
+
+
+def test_composite_index_not_starting_with_foreign_key():
+    content = render_model("Order", ["user:fk(User)", "total:int"], ["total,user_id"])
+    assert "index=True" in fk_column(content)
@@ -0,0 +1,78 @@
+"""Манифест: построение плана, повторное применение без записи и ручные правки."""
+
+import pytest
+
+from polyscaf_python.lock import DRIFT, NEW, UNCHANGED
+from polyscaf_python.plan import apply_plan, build_plan, find_manifest, load_manifest
+
+MANIFEST = '''
+[project]
+name = "Shop"
+database = "postgres"
+
+[entities.Customer]
+
+[entities.Order]
+fields = ["total:decimal(10,2)", "customer:fk(Customer)"]
+artifacts = ["model", "schema", "service"]
+'''
+
+
+def counts(result) -> dict[str, int]:
+    return {status: len(paths) for status, paths in result.items()}
+
+
+def mtimes(paths) -> dict:
+    return {path: path.stat().st_mtime_ns for path in paths}
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    path = tmp_path / "polyscaf.toml"
+    path.write_text(MANIFEST)
+    assert find_manifest(tmp_path) == path
+    return load_manifest(path)
+
+
+def test_reapply_writes_nothing(tmp_path, manifest):
+    plan = build_plan(manifest, tmp_path)
+    assert tmp_path / "models" / "order_model.py" in plan.files
+    assert tmp_path / "routes" / "order_route.py" not in plan.files
+
+    first = apply_plan(plan)
+    assert counts(first) == {NEW: len(plan.files)}
+    before = mtimes(plan.files)
+
+    second = apply_plan(build_plan(manifest, tmp_path))
+    assert counts(second) == {UNCHANGED: len(plan.files)}
+    assert mtimes(plan.files) == before
+
+
+def test_hand_edit_is_kept_and_reported(tmp_path, manifest):
+    apply_plan(build_plan(manifest, tmp_path))
+    edited = tmp_path / "models" / "order_model.py"
+    text = edited.read_text() + "\n# правка пользователя\n"
+    edited.write_text(text)
+
+    plan = build_plan(manifest, tmp_path)
+    result = apply_plan(plan)
+    assert result[DRIFT] == [edited]
+    assert counts(result) == {DRIFT: 1, UNCHANGED: len(plan.files) - 1}
+    assert edited.read_text() == text
+
+
+@pytest.mark.parametrize(
+    "manifest, message",
+    [
+        ({"entities": {"Order": {"artifacts": ["model", "widget"]}}}, "widget"),
+        ({"entities": {"Order": {"artifacts": "model"}}}, "artifacts"),
+        ({"entities": "Order"}, "entities"),
+        ({"entities": {"Order": ["model"]}}, "Order"),
+        ({"project": ["Shop"]}, "project"),
+        ({"project": {"name": "Shop", "database": "sqlite"}}, "mysql или postgres"),
+    ],
+    ids=["unknown-artifact", "artifacts-not-list", "entities-string", "spec-not-table", "project-list", "database"],
+)
+def test_bad_manifest_raises(tmp_path, manifest, message):
+    with pytest.raises(ValueError, match=message):
+        build_plan(manifest, tmp_path)
@@ -0,0 +1,104 @@
+"""Шаблоны: компиляция подстановок, кэш байткода и выбор варианта."""
+
+import marshal
+import types
+
+import pytest
+
+from polyscaf_python import templates
+from polyscaf_python.templates import (
+    TemplateError,
+    TemplateRegistry,
+    _variant_names,
+    compile_template,
+    template_hash,
+)
+
+
+@pytest.fixture(autouse=True)
+def template_cache(tmp_path, monkeypatch):
+    """Отдельный кэш на диске и пустой кэш в памяти для каждого теста."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("POLYSCAF_TEMPLATE_CACHE", str(cache))
+    monkeypatch.setattr(templates, "_compiled", {})
+    return cache
+
+
+def render(source: str, default: str = "", **context) -> str:
+    return compile_template(source)(context, lambda: default)
+
+
+def test_substitution():
+    source = "class ${name}Service:  # $snake_name стоит $$5\n"
+    assert render(source, name="Book", snake_name="book") == "class BookService:  # book стоит $5\n"
+
+
+def test_default_inserts_builtin_template():
+    assert render("$default# дополнение\n", default="x = 1\n") == "x = 1\n# дополнение\n"
+
+
+def test_empty_template():
+    assert render("") == ""
+
+
+@pytest.mark.parametrize("source, line", [("$ name", 1), ("a\nb\nc ${name\n", 3)])
+def test_bad_placeholder_reports_line(source, line):
+    with pytest.raises(TemplateError, match=f"строке {line}"):
+        compile_template(source, filename="route.tmpl")
+
+
+def test_compiled_code_is_cached_on_disk(template_cache):
+    render("$name", name="Book")
+    cached = template_cache / f"{template_hash('$name')}.bin"
+    assert isinstance(marshal.loads(cached.read_bytes()), types.CodeType)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"\x00not marshal", marshal.dumps(42), marshal.dumps("raise RuntimeError('кэш выполнен')")],
+    ids=["corrupt", "int", "source-string"],
+)
+def test_bad_cache_entry_is_rebuilt(template_cache, payload):
+    cached = template_cache / f"{template_hash('$name')}.bin"
+    cached.parent.mkdir(parents=True)
+    cached.write_bytes(payload)
+    assert render("$name", name="Book") == "Book"
+    assert isinstance(marshal.loads(cached.read_bytes()), types.CodeType)
+
+
+def test_variant_names_from_most_specific():
+    assert _variant_names("route", ["stream", "async"]) == [
+        "route.stream.async.tmpl",
+        "route.stream.tmpl",
+        "route.async.tmpl",
+        "route.tmpl",
+    ]
+    assert _variant_names("model", ["", "sync"]) == ["model.sync.tmpl", "model.tmpl"]
+
+
+def test_registry_prefers_specific_variant_over_directory_priority(tmp_path):
+    project, user = tmp_path / "project", tmp_path / "user"
+    project.mkdir()
+    user.mkdir()
+    (project / "route.tmpl").write_text("project")
+    (user / "route.stream.tmpl").write_text("user stream")
+    (user / "route.stream.async.tmpl").write_text("user stream async")
+    registry = TemplateRegistry([project, user])
+
+    assert registry.find("route", ["stream", "async"]) == user / "route.stream.async.tmpl"
+    assert registry.find("route", ["stream", "sync"]) == user / "route.stream.tmpl"
+    assert registry.find("route", ["sync"]) == project / "route.tmpl"
+    assert registry.find("model", ["sync"]) is None
+
+
+def test_registry_renders_override_with_default(tmp_path):
+    (tmp_path / "util.tmpl").write_text("# $name\n$default")
+    registry = TemplateRegistry([tmp_path])
+    assert registry.render("util", lambda: "pass\n", {"name": "Clock"}) == "# Clock\npass\n"
+    assert registry.render("schema", lambda: "builtin\n", {}) == "builtin\n"
+
+
+def test_registry_reports_unknown_variable(tmp_path):
+    (tmp_path / "util.tmpl").write_text("$missing")
+    with pytest.raises(TemplateError, match=r"\$missing"):
+        TemplateRegistry([tmp_path]).render("util", lambda: "", {"name": "Clock"})